@@ -0,0 +1,131 @@
+"""
+Benchmark for the Denodo VQL parser on a large synthetic export.
+
+    python benchmarks/bench_denodo_parser.py --statements 20000
+    python benchmarks/bench_denodo_parser.py --statements 20000 --baseline HEAD~1
+
+With --baseline, the parser_denodo.py of that git revision is timed on the same file and the
+speed-up is reported, together with how far the two graphs differ.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.parsers import parser_denodo  # noqa: E402
+
+
+def generate_vql(statements: int, seed: int = 0) -> str:
+    """Builds a Denodo-like export: base tables, derived views with CTEs, interfaces and comments."""
+    rng = random.Random(seed)
+    databases = [f"db_{i}" for i in range(8)]
+    created: List[str] = []
+    chunks = ["# REQUIRES-PROPERTIES-FILE # Do not remove this comment!\nCREATE OR REPLACE FOLDER '/derived';\n"]
+
+    for i in range(statements):
+        db = rng.choice(databases)
+        kind = rng.random()
+        if kind < 0.25 or len(created) < 10:
+            name = f"t_base_{i}"
+            chunks.append(
+                f"CREATE OR REPLACE TABLE {db}.{name} I18N us_pst ( # base view {i}\n"
+                f"    id:int, amount:decimal, note:text\n)\n"
+                f"    DATA_LOAD_QUERY = 'SELECT id, amount FROM {rng.choice(databases)}.raw_{i % 500}'\n"
+                f"    DESCRIPTION = 'Loaded nightly -- not a comment; source>>src_{i % 300}<<source';\n"
+            )
+        elif kind < 0.9:
+            name = f"v_derived_{i}"
+            a, b, c = (rng.choice(created) for _ in range(3))
+            chunks.append(
+                f"CREATE OR REPLACE VIEW {db}.{name} /* derived view {i} */ FOLDER = '/derived/{db}' AS\n"
+                f"WITH recent_{i} AS (SELECT * FROM {a} WHERE note <> 'FROM nowhere'),\n"
+                f"     joined_{i} AS (SELECT r.id FROM recent_{i} r JOIN {b} x ON x.id = r.id)\n"
+                f"SELECT j.id -- trailing comment\n"
+                f"FROM joined_{i} j\n"
+                f"LEFT JOIN {c} c ON c.id = j.id\n"
+                f"WHERE j.id IN (SELECT id FROM {a})\n"
+                f"CONTEXT ('formatted' = 'yes')\n"
+                f"DESCRIPTION = 'It''s derived; see source>>{a}<<source';\n"
+            )
+        else:
+            name = f"iv_interface_{i}"
+            chunks.append(
+                f"CREATE OR REPLACE INTERFACE VIEW {db}.{name} (\n    id:int\n)\n"
+                f"SET IMPLEMENTATION {rng.choice(created)}\n"
+                f"FOLDER = '/interfaces';\n"
+            )
+        created.append(f"{db}.{name}" if rng.random() < 0.7 else name)
+    return "".join(chunks)
+
+
+def load_baseline(revision: str) -> ModuleType:
+    """Imports parser_denodo.py as it was at a git revision, next to the current package."""
+    source = subprocess.run(
+        ["git", "show", f"{revision}:src/parsers/parser_denodo.py"],
+        cwd=REPO_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    spec = importlib.util.spec_from_loader("src.parsers._baseline_parser_denodo", loader=None)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    module.__file__ = f"<{revision}>/parser_denodo.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    return module
+
+
+def best_of(repeat: int, fn: Callable[[], Tuple]) -> Tuple[float, Tuple]:
+    best, result = float("inf"), ()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--statements", type=int, default=20000, help="Number of CREATE statements")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser; the best is reported")
+    parser.add_argument("--baseline", help="Git revision whose parser_denodo.py to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vql_path = Path(tmp) / "synthetic.vql"
+        vql_path.write_text(generate_vql(args.statements), encoding="utf-8")
+        size_mb = vql_path.stat().st_size / 1e6
+        os.chdir(tmp)  # parse_dump writes json_structure/ into the working directory
+
+        current_time, current = best_of(args.repeat, lambda: parser_denodo.parse_dump(str(vql_path)))
+        print(f"input: {args.statements} statements, {size_mb:.1f} MB")
+        print(f"current:  {current_time:8.3f} s  ({size_mb / current_time:6.2f} MB/s)")
+
+        if args.baseline:
+            baseline_module = load_baseline(args.baseline)
+            baseline_time, baseline = best_of(
+                args.repeat, lambda: baseline_module.parse_dump(str(vql_path))
+            )
+            print(f"baseline: {baseline_time:8.3f} s  ({size_mb / baseline_time:6.2f} MB/s)  [{args.baseline}]")
+            print(f"speed-up: {baseline_time / current_time:.1f}x")
+            edges_now, edges_before = set(current[0]), set(baseline[0])
+            nodes_now, nodes_before = set(current[1]), set(baseline[1])
+            print(
+                f"graph vs baseline: +{len(edges_now - edges_before)}/-{len(edges_before - edges_now)} edges, "
+                f"+{len(nodes_now - nodes_before)}/-{len(nodes_before - nodes_now)} nodes"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Throughput benchmark for the MySQL dump parser on a large synthetic mysqldump file.
+
+    python benchmarks/bench_mysql_parser.py --tables 200 --rows 20000
+
+The dump mimics mysqldump output: per table a CREATE TABLE with foreign keys, LOCK TABLES and
+extended INSERT lines of about 1 MB, plus views, triggers and procedures. Most of the bytes
+are INSERT payload, which the parser is expected to skip without tokenizing.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, TextIO, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from src.parsers import parser_mysql  # noqa: E402
+
+INSERT_LINE_BYTES = 1_000_000  # mysqldump's default net_buffer_length-sized extended INSERTs are similar
+
+
+def _insert_lines(out: TextIO, table: str, rows: int, rng: random.Random) -> None:
+    line: List[str] = []
+    size = 0
+    for row_id in range(1, rows + 1):
+        note = rng.choice(["plain", "it\\'s; quoted", "semi;colon", "back\\\\slash", "new\\nline"])
+        value = f"({row_id},{rng.randint(1, 1000)},'{note} {rng.random():.6f}',{rng.random() * 1000:.2f})"
+        line.append(value)
+        size += len(value) + 1
+        if size >= INSERT_LINE_BYTES or row_id == rows:
+            out.write(f"INSERT INTO `{table}` VALUES {','.join(line)};\n")
+            line, size = [], 0
+
+
+def generate_dump(path: Path, tables: int, rows: int, seed: int = 0) -> None:
+    """Writes a mysqldump-style file with DDL for every table and rows INSERTed per table."""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("-- MySQL dump 10.13  Distrib 8.0.36, for Linux (x86_64)\n--\n")
+        out.write("-- Host: localhost    Database: bench\n-- ------------------------------------------------------\n")
+        out.write("/*!40101 SET @OLD_CHARACTER_SET_CLIENT=@@CHARACTER_SET_CLIENT */;\n/*!40101 SET NAMES utf8mb4 */;\n\n")
+        for i in range(tables):
+            table = f"t_{i}"
+            parent = f"t_{rng.randrange(i)}" if i else None
+            out.write(f"--\n-- Table structure for table `{table}`\n--\n\nDROP TABLE IF EXISTS `{table}`;\n")
+            out.write(
+                f"CREATE TABLE `{table}` (\n  `id` int NOT NULL AUTO_INCREMENT,\n  `parent_id` int DEFAULT NULL,\n"
+                f"  `note` varchar(255) DEFAULT NULL COMMENT 'free text; may REFERENCE anything',\n"
+                f"  `amount` decimal(10,2) DEFAULT NULL,\n  PRIMARY KEY (`id`)"
+                + (
+                    f",\n  CONSTRAINT `fk_{table}` FOREIGN KEY (`parent_id`) REFERENCES `{parent}` (`id`)"
+                    if parent
+                    else ""
+                )
+                + "\n) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;\n\n"
+            )
+            out.write(f"LOCK TABLES `{table}` WRITE;\n/*!40000 ALTER TABLE `{table}` DISABLE KEYS */;\n")
+            _insert_lines(out, table, rows, rng)
+            out.write(f"/*!40000 ALTER TABLE `{table}` ENABLE KEYS */;\nUNLOCK TABLES;\n\n")
+            if i and i % 10 == 0:
+                a, b = f"t_{rng.randrange(i)}", f"t_{rng.randrange(i)}"
+                out.write(
+                    f"DELIMITER ;;\n/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER "
+                    f"`trg_{table}` AFTER INSERT ON `{table}` FOR EACH ROW BEGIN\n"
+                    f"  UPDATE `{a}` SET amount = amount + NEW.amount WHERE id = NEW.parent_id;\nEND */;;\nDELIMITER ;\n"
+                    f"DELIMITER ;;\nCREATE DEFINER=`root`@`localhost` PROCEDURE `p_{table}`()\nBEGIN\n"
+                    f"  INSERT INTO `{b}` (note) SELECT note FROM `{table}` JOIN `{a}` USING (id);\nEND ;;\n"
+                    f"DELIMITER ;\n"
+                    f"/*!50001 CREATE ALGORITHM=UNDEFINED */\n/*!50013 DEFINER=`root`@`localhost` SQL SECURITY DEFINER */\n"
+                    f"/*!50001 VIEW `v_{table}` AS select `x`.`id` AS `id` from (`{table}` `x` join `{a}` `y` "
+                    f"on((`x`.`parent_id` = `y`.`id`))) */;\n\n"
+                )
+
+
+def best_of(repeat: int, fn: Callable[[], Tuple]) -> Tuple[float, Tuple]:
+    best, result = float("inf"), ()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=200, help="Number of tables in the dump")
+    parser.add_argument("--rows", type=int, default=20000, help="Rows INSERTed per table")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs; the best is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_path = Path(tmp) / "synthetic_mysqldump.sql"
+        generate_dump(dump_path, args.tables, args.rows)
+        size_mb = dump_path.stat().st_size / 1e6
+        os.chdir(tmp)  # parse_dump writes json_structure/ into the working directory
+
+        elapsed, (edges, node_types, _) = best_of(args.repeat, lambda: parser_mysql.parse_dump(str(dump_path)))
+        print(f"input: {args.tables} tables x {args.rows} rows, {size_mb:.1f} MB")
+        print(f"parse: {elapsed:8.3f} s  ({size_mb / elapsed:8.1f} MB/s)  {len(node_types)} nodes, {len(edges)} edges")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,8 @@ from .generate_data_flow import (
     draw_complete_data_flow,
     parse_dump,
 )
-from . import path_utils
+from . import path_utils, reachability
+from .lineage_graph import LineageGraph
 import glob
 import itertools
 import threading
@@ -21,22 +22,10 @@ import sys, webbrowser
 import time
 from pathlib import Path
 from rapidfuzz import process
-from typing import List, Dict, Optional, Set, Tuple
+from typing import Any, List, Dict, Optional, Set, Tuple
 
 # Constants
-SQL_EXTENSIONS = [
-    ".sql",  # Standard SQL files
-    ".vql",  # Denodo VQL files
-    ".ddl",  # Data Definition Language
-    ".dml",  # Data Manipulation Language
-    ".hql",  # Hive Query Language
-    ".pls",  # PL/SQL files
-    ".plsql",  # PL/SQL files
-    ".proc",  # Stored Procedures
-    ".psql",  # PostgreSQL files
-    ".tsql",  # T-SQL files
-    ".view",  # View definitions
-]
+SQL_EXTENSIONS = path_utils.SQL_EXTENSIONS
 
 # Initialize colorama and constants
 init()
@@ -780,12 +769,13 @@ def get_user_choice(
     return options.index(answer) + 1 if answer != "← Go back" else None
 
 
-def select_focus_span() -> Optional[Dict[str, bool]]:
+def select_focus_span() -> Optional[Dict[str, Any]]:
     """
     Allows the user to select focus span options for ancestors and descendants.
 
     Returns:
-    Dict[str, bool]: A dictionary with the focus span options.
+    Dict[str, Any]: The focus span options: "Ancestors" and "Descendants" (bool) and
+    "Depth" (maximum number of hops, or None for no limit).
     """
     clear_screen()
     print(f"\nFocus Span Options {BACK_TOOLTIP}")
@@ -805,7 +795,19 @@ def select_focus_span() -> Optional[Dict[str, bool]]:
     if descendants_choice is None:  # User pressed 'b'
         return None
 
-    return {"Ancestors": ancestors_choice, "Descendants": descendants_choice}
+    depth_choice = questionary.text(
+        "Maximum number of hops from the focused nodes (empty for no limit):",
+        validate=lambda text: not text.strip() or text.strip().isdigit() or "Enter a whole number or leave empty",
+    ).ask()
+
+    if depth_choice is None:  # User pressed 'b'
+        return None
+
+    return {
+        "Ancestors": ancestors_choice,
+        "Descendants": descendants_choice,
+        "Depth": int(depth_choice) if depth_choice.strip() else None,
+    }
 
 
 def loading_animation():
@@ -848,6 +850,19 @@ def run_with_loading(func, *args, **kwargs):
     return result
 
 
+def attach_reachability_index(graph: LineageGraph, max_depth: Optional[int] = None) -> None:
+    """
+    Attaches the persisted closure index (see reachability.load_or_build) to the graph before a
+    focused diagram, when the 'reachability_index' setting is on. The index only answers queries
+    without a depth limit and costs a full build on first use, so it is opt-in, like the
+    --reachability-index flag of dataflow-command, and built at most once per graph.
+    """
+    if graph.reachability is not None or max_depth is not None:
+        return
+    if path_utils.read_settings().get("reachability_index", False):
+        graph.reachability = reachability.load_or_build(graph)
+
+
 def main():
     """
     Main function to run the Flow Diagram Creator CLI.
@@ -875,6 +890,7 @@ def main():
             f"{Fore.BLUE}Parsing{Style.RESET_ALL} {os.path.relpath(metadata_file, script_dir)}..."
         )
         edges, node_types, database_stats = run_with_loading(parse_dump, metadata_file)
+        graph = LineageGraph(edges, node_types.keys())  # Shared by every focused diagram of this file
 
         clear_screen()
         # Database selection loop
@@ -1017,6 +1033,7 @@ def main():
                 )
                 for node in updated_nodes:
                     print(f"- {node}")
+                attach_reachability_index(graph, choices.get("Depth"))
                 run_with_loading(
                     draw_focused_data_flow,
                     edges,
@@ -1027,6 +1044,8 @@ def main():
                     see_ancestors=choices.get("Ancestors"),
                     see_descendants=choices.get("Descendants"),
                     auto_open=auto_open,  # Convert to boolean
+                    graph=graph,
+                    max_depth=choices.get("Depth"),
                 )
 
             print(f"Flow diagram created {Fore.GREEN}successfully!{Style.RESET_ALL}")
@@ -1,12 +1,36 @@
 import argparse
+import glob
 import sys
 from pathlib import Path
-from . import path_utils  # Import the new utility module
+from . import path_utils, reachability  # Import the new utility module
 from .generate_data_flow import (
     draw_focused_data_flow,
+    draw_focused_data_flows,
     draw_complete_data_flow,
-    parse_dump,
+    parse_dumps,
+    read_focus_manifest,
 )
+from .lineage_graph import LineageGraph
+from .pyvis_mod import PRECOMPUTED_LAYOUT_MIN_NODES
+
+
+def _output_name(metadata: str) -> str:
+    """Names the output after the metadata file, or after the directory a directory or glob pattern starts in."""
+    path = Path(metadata)
+    while glob.has_magic(path.name) and path.parent != path:
+        path = path.parent
+    return path.stem or path.resolve().name
+
+
+def _non_negative_int(value: str) -> int:
+    """argparse type for hop counts: a whole number, 0 or more."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
 
 
 def main():
@@ -14,7 +38,15 @@ def main():
         description="Generate data flow diagrams from metadata files."
     )
     parser.add_argument(
-        "-m", "--metadata", required=True, help="Path to the metadata (SQL/VQL) file."
+        "-m",
+        "--metadata",
+        required=True,
+        help="Path to the metadata (SQL/VQL) file, or a directory or quoted glob pattern of files to merge into one graph.",
+    )
+    parser.add_argument(
+        "--dialect",
+        default=None,
+        help="Parser to use, e.g. postgresql, mysql, or the name of a plugin parser (default: detected from the file).",
     )
     parser.add_argument(
         "-t",
@@ -50,6 +82,12 @@ def main():
         default=None,
         help="List of node names to focus on (only for focused diagrams).",
     )
+    parser.add_argument(
+        "--focus-manifest",
+        default=None,
+        help="Batch mode: a JSON file or a file with one 'name: node1 node2 ...' line per focused diagram. "
+        "The metadata is parsed once and all diagrams are rendered in parallel with --jobs workers (implies --type focused).",
+    )
     parser.add_argument(
         "--no-ancestors",
         dest="see_ancestors",
@@ -64,6 +102,26 @@ def main():
         default=True,
         help="Do not include descendants in focused diagram.",
     )
+    parser.add_argument(
+        "--depth",
+        type=_non_negative_int,
+        default=None,
+        help="Only include ancestors and descendants up to this many hops from the focus nodes (default: no limit).",
+    )
+    parser.add_argument(
+        "--reachability-index",
+        action="store_true",
+        default=False,
+        help="Answer focused-diagram lineage queries from a transitive-closure index, stored next to the parse cache and reused while the graph is unchanged.",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=["auto", "browser", "precomputed"],
+        default="auto",
+        help="Where node positions are computed: 'browser' runs the vis.js hierarchical layout and physics, "
+        "'precomputed' bakes a layered layout computed in Python into the HTML so large diagrams open instantly, "
+        f"'auto' precomputes for {PRECOMPUTED_LAYOUT_MIN_NODES} nodes or more (default: auto).",
+    )
     parser.add_argument(
         "--auto-open",
         action="store_true",
@@ -76,10 +134,56 @@ def main():
         action="store_false",
         help="Do not automatically open the diagram in the browser.",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse the dump (PostgreSQL, Snowflake, SQL Server) or, for a directory or glob, the files (0 = one per CPU core, default: 1).",
+    )
+    parser.add_argument(
+        "--sqlfluff-fix",
+        choices=["never", "failed", "always"],
+        default="failed",
+        help="When to run the sqlfluff fix pass before parsing a statement (default: failed).",
+    )
+    parser.add_argument(
+        "--debug-cleaned-sql",
+        action="store_true",
+        default=False,
+        help=f"Write the cleaned SQL statements to {path_utils.DATA_FLOW_BASE_DIR / 'debug'} while parsing.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        dest="use_cache",
+        action="store_false",
+        default=True,
+        help="Do not read or write the parse cache; always parse the dump from scratch.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Denodo only: rescan only statements that changed since the last run of the same file.",
+    )
+    parser.add_argument(
+        "--column-lineage",
+        action="store_true",
+        help="PostgreSQL only: also write column-level lineage to json_structure/column_lineage.json.",
+    )
     args = parser.parse_args()
+    precomputed_layout = {"auto": None, "browser": False, "precomputed": True}[args.layout]
 
     # Parse metadata
-    edges, node_types, database_stats = parse_dump(args.metadata)
+    edges, node_types, database_stats = parse_dumps(
+        args.metadata,
+        args.dialect,
+        use_cache=args.use_cache,
+        jobs=args.jobs,
+        fix_policy=args.sqlfluff_fix,
+        debug_cleaned_sql=args.debug_cleaned_sql,
+        incremental=args.incremental,
+        column_lineage=args.column_lineage,
+    )
 
     # Optionally adjust node types based on main_db
     if args.main_db:
@@ -105,9 +209,9 @@ def main():
     # the potentially user-specified output folder exists.
     output_folder.mkdir(parents=True, exist_ok=True)
 
-    file_name = Path(args.metadata).stem
+    file_name = _output_name(args.metadata)
 
-    if args.type == "complete":
+    if args.type == "complete" and not args.focus_manifest:
         draw_complete_data_flow(
             edges,
             node_types,
@@ -115,13 +219,42 @@ def main():
             file_name,
             auto_open=args.auto_open,
             draw_edgeless=args.draw_edgeless,
+            precomputed_layout=precomputed_layout,
         )
         print(f"Complete flow diagram created successfully! Output: {output_folder}")
         print(f"Standard data directory: {path_utils.DATA_FLOW_BASE_DIR}")
+    elif args.focus_manifest:
+        focus_sets = read_focus_manifest(
+            args.focus_manifest,
+            see_ancestors=args.see_ancestors,
+            see_descendants=args.see_descendants,
+            max_depth=args.depth,
+        )
+        graph = LineageGraph(edges, node_types.keys())
+        if args.reachability_index:
+            graph.reachability = reachability.load_or_build(graph, use_cache=args.use_cache)
+        results = draw_focused_data_flows(
+            edges,
+            node_types,
+            focus_sets,
+            save_path=str(output_folder),
+            file_name=file_name,
+            jobs=args.jobs,
+            graph=graph,
+            precomputed_layout=precomputed_layout,
+        )
+        failed = [name for name, path in results.items() if path is None]
+        print(f"{len(results) - len(failed)} of {len(results)} focused flow diagrams created successfully! Output: {output_folder}")
+        if failed:
+            print(f"Not created (focus nodes not found or write failed): {', '.join(failed)}")
+        print(f"Standard data directory: {path_utils.DATA_FLOW_BASE_DIR}")
     else:
         if not args.focus_nodes:
             print("Error: --focus-nodes is required for focused diagram.")
             sys.exit(1)
+        graph = LineageGraph(edges, node_types.keys())
+        if args.reachability_index:
+            graph.reachability = reachability.load_or_build(graph, use_cache=args.use_cache)
         draw_focused_data_flow(
             edges,
             node_types,
@@ -131,6 +264,9 @@ def main():
             auto_open=args.auto_open,
             see_ancestors=args.see_ancestors,
             see_descendants=args.see_descendants,
+            max_depth=args.depth,
+            graph=graph,
+            precomputed_layout=precomputed_layout,
         )
         print(f"Focused flow diagram created successfully! Output: {output_folder}")
         print(f"Standard data directory: {path_utils.DATA_FLOW_BASE_DIR}")
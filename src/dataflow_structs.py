@@ -1,4 +1,5 @@
-from typing import TypedDict, Optional
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, TypedDict
 
 class InvalidSQLError(Exception):
     pass
@@ -13,3 +14,128 @@ class NodeInfo(TypedDict):
     database: str
     full_name: str
     definition: Optional[str]
+
+class DefinitionRef(TypedDict):
+    path: str  # Absolute path of the parsed file
+    start: int  # Byte offset of the first byte of the definition
+    end: int  # Byte offset just past its last byte
+
+class LazyNodeInfo(NodeInfo, total=False):
+    definition_refs: List[DefinitionRef]  # Where the definition is, when it was not loaded
+
+
+def load_definition(node_info: Mapping[str, Any]) -> Optional[str]:
+    """
+    Returns the definition of a node. Parsers may leave "definition" empty and keep only
+    "definition_refs", byte ranges of the parsed file, for large definitions; those ranges are
+    read here, when the definition is needed. Returns None if the file is no longer readable.
+    """
+    refs = node_info.get("definition_refs")
+    if node_info.get("definition") or not refs:
+        return node_info.get("definition")
+    parts = []
+    try:
+        for ref in refs:
+            with open(ref["path"], "rb") as f:
+                f.seek(ref["start"])
+                parts.append(f.read(ref["end"] - ref["start"]).decode("utf-8", errors="replace").strip())
+    except OSError:
+        return None
+    return "\n\n-- Additional DDL --\n".join(parts)
+
+
+class ColumnLineage:
+    """
+    Column-level lineage as a compact graph. Column names ("schema.table.column") are interned to
+    integer IDs, and edges are kept as two parallel arrays of IDs (source -> derived column), so
+    a schema with hundreds of thousands of columns costs a few bytes per edge plus one string
+    per column. A "*" column stands for all columns of a relation when a query selects *.
+    """
+
+    def __init__(self) -> None:
+        self.columns: List[str] = []  # ID -> column name
+        self._ids: Dict[str, int] = {}
+        self.sources = array("I")
+        self.targets = array("I")
+        self._edge_set: Set[Tuple[int, int]] = set()
+        self._adjacency: Optional[Tuple[Dict[int, List[int]], Dict[int, List[int]]]] = None
+
+    def intern(self, column: str) -> int:
+        column_id = self._ids.get(column)
+        if column_id is None:
+            column_id = self._ids[column] = len(self.columns)
+            self.columns.append(column)
+        return column_id
+
+    def add_edge(self, source: str, target: str) -> None:
+        edge = (self.intern(source), self.intern(target))
+        if edge[0] != edge[1] and edge not in self._edge_set:
+            self._edge_set.add(edge)
+            self.sources.append(edge[0])
+            self.targets.append(edge[1])
+            self._adjacency = None
+
+    def merge(self, other: "ColumnLineage") -> None:
+        """Adds the edges of another lineage (e.g. from a parallel batch), re-interning its IDs."""
+        for source, target in zip(other.sources, other.targets):
+            self.add_edge(other.columns[source], other.columns[target])
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """Yields (source column, derived column) name pairs."""
+        for source, target in zip(self.sources, self.targets):
+            yield self.columns[source], self.columns[target]
+
+    def _neighbours(self) -> Tuple[Dict[int, List[int]], Dict[int, List[int]]]:
+        if self._adjacency is None:
+            upstream: Dict[int, List[int]] = {}
+            downstream: Dict[int, List[int]] = {}
+            for source, target in zip(self.sources, self.targets):
+                upstream.setdefault(target, []).append(source)
+                downstream.setdefault(source, []).append(target)
+            self._adjacency = (upstream, downstream)
+        return self._adjacency
+
+    def _closure(self, column: str, adjacency: Dict[int, List[int]]) -> Set[str]:
+        # "relation.*" edges carry every column of the relation, under the same column name.
+        seen: Set[str] = set()
+        stack = [column]
+        while stack:
+            name = stack.pop()
+            relation, _, column_name = name.rpartition(".")
+            starts = [(name, None)] if column_name == "*" else [(name, None), (f"{relation}.*", column_name)]
+            for start, star_column in starts:
+                start_id = self._ids.get(start)
+                if start_id is None:
+                    continue
+                for neighbour_id in adjacency.get(start_id, ()):
+                    neighbour = self.columns[neighbour_id]
+                    if star_column is not None and neighbour.endswith(".*"):
+                        neighbour = neighbour[:-1] + star_column
+                    if neighbour not in seen:
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        seen.discard(column)
+        return seen
+
+    def upstream(self, column: str) -> Set[str]:
+        """All columns the given column is derived from, directly or transitively."""
+        return self._closure(column, self._neighbours()[0])
+
+    def downstream(self, column: str) -> Set[str]:
+        """All columns derived from the given column, directly or transitively: its impact."""
+        return self._closure(column, self._neighbours()[1])
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Only the interned names and edge arrays are pickled (e.g. back from a worker process).
+        return {"columns": self.columns, "sources": self.sources, "targets": self.targets}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.columns = state["columns"]
+        self._ids = {column: column_id for column_id, column in enumerate(self.columns)}
+        self.sources = state["sources"]
+        self.targets = state["targets"]
+        self._edge_set = set(zip(self.sources, self.targets))
+        self._adjacency = None
@@ -1,33 +1,284 @@
+import glob
+import inspect
+import json
 import os
+import re
+import shlex
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-import networkx as nx
-from typing import List, Tuple, Dict, TypedDict, Union, Set, Any, Optional, cast  # noqa: F401
+from typing import List, Tuple, Dict, TypedDict, Union, Set, Any, Optional, Iterable, cast  # noqa: F401
 
-from . import pyvis_mod
-from .dataflow_structs import NodeInfo
-from .parser_register import guess_database_type, _PARSER_REGISTRY, DatabaseType
+from . import exceptions, parse_cache, path_utils, pyvis_mod
+from .dataflow_structs import ColumnLineage, NodeInfo, InvalidSQLError
+from .lineage_graph import LineageGraph
+from .parsers.parser_utils import compute_stats, write_column_lineage, write_json_structure
+from .parser_register import guess_database_type, _PARSER_REGISTRY, DatabaseType, ParserKey
 
 
-def parse_dump(
+def _supported_options(parse_fn: Any, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Keeps only the options that the parser's parse_dump accepts as keyword arguments."""
+    parameters = inspect.signature(parse_fn).parameters
+    return {key: value for key, value in options.items() if key in parameters}
+
+
+def _parse_dump(
     file_path: Union[str, os.PathLike],
-    database_type: Optional[DatabaseType] = None,
+    database_type: Optional[ParserKey] = None,
+    use_cache: bool = True,
+    lineage: Optional[ColumnLineage] = None,
+    **parser_options: Any,
 ) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
     """
     Detect the dump type if not provided, then dispatch to the correct parser.
+    database_type is a DatabaseType or a dialect name, which may name a plugin parser; the
+    parser module is only imported here, on dispatch.
+    Extra keyword arguments (e.g. jobs=4) are forwarded to parsers that support them
+    and silently ignored by the others.
+
+    Results of file inputs are cached on disk keyed on the file content hash, database type,
+    parser version and options (see parse_cache), plus the input path for parsers whose results
+    point into the parsed file (EMITS_DEFINITION_REFS); pass use_cache=False to always parse from
+    scratch. SQL given as a string, and runs with options that write extra files (see
+    parse_cache.SIDE_EFFECT_OPTIONS), are always parsed.
+
+    If a ColumnLineage is given and the parser supports column lineage (PostgreSQL), the same
+    parse adds to it; such runs bypass the cache, which only holds table-level results.
     """
     if database_type is None:
         database_type = guess_database_type(file_path)
-    if database_type not in _PARSER_REGISTRY:
+    else:
+        database_type = _PARSER_REGISTRY.normalize(database_type)
+    if database_type is None or database_type not in _PARSER_REGISTRY:
         raise ValueError(f"Unsupported or unrecognized database type: {database_type}")
     parser = _PARSER_REGISTRY[database_type]
-    result = parser.parse_dump(file_path)
-    if not (isinstance(result, tuple) and len(result) == 3):
-        raise TypeError("Parser returned an invalid result. Expected a tuple of (edges, node_types, node_counts).")
+    options = _supported_options(parser.parse_dump, parser_options)
+    lineage_option = _supported_options(parser.parse_dump, {"lineage": lineage}) if lineage is not None else {}
+    if lineage is not None and not lineage_option:
+        print(f"Warning: Column lineage is not supported for {database_type}; only table lineage is extracted.")
+
+    key = None
+    result = None
+    cacheable = (
+        os.path.isfile(file_path)
+        and not lineage_option
+        and not any(options.get(name) for name in parse_cache.SIDE_EFFECT_OPTIONS)
+    )
+    if use_cache and cacheable:
+        key_options = dict(options)
+        if getattr(parser, "EMITS_DEFINITION_REFS", False):
+            key_options["input_path"] = os.path.abspath(file_path)
+        key = parse_cache.cache_key(
+            file_path, getattr(database_type, "name", str(database_type)), parse_cache.parser_version(parser), key_options
+        )
+        result = parse_cache.load(key)
+
+    if result is None:
+        result = parser.parse_dump(file_path, **options, **lineage_option)
+        if not (isinstance(result, tuple) and len(result) == 3):
+            raise TypeError("Parser returned an invalid result. Expected a tuple of (edges, node_types, node_counts).")
+        if key is not None:
+            parse_cache.store(key, result)
     return cast(Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]], result)
 
 
+def parse_dump(
+    file_path: Union[str, os.PathLike],
+    database_type: Optional[ParserKey] = None,
+    use_cache: bool = True,
+    column_lineage: bool = False,
+    **parser_options: Any,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses one dump (see _parse_dump for dialect detection, parser options and caching) and
+    writes the result to json_structure/ (see parser_utils.write_json_structure), whether it
+    was parsed or loaded from the cache.
+
+    With column_lineage=True, column-level lineage is collected from the same parse and written
+    to json_structure/column_lineage.json (see parser_postgres.parse_column_lineage).
+    """
+    lineage = ColumnLineage() if column_lineage else None
+    edges, node_types, stats = _parse_dump(file_path, database_type, use_cache, lineage, **parser_options)
+    write_json_structure(edges, node_types)
+    if lineage is not None:
+        write_column_lineage(lineage)
+    return edges, node_types, stats
+
+
+# Errors that make a single file of a multi-file ingestion be skipped instead of failing the run.
+_SKIPPABLE_FILE_ERRORS = (InvalidSQLError, exceptions.InvalidSQLError, exceptions.InvalidVQLFileError)
+
+
+def expand_metadata_paths(
+    sources: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]],
+) -> List[str]:
+    """
+    Expands files, directories and glob patterns into a sorted list of unique file paths.
+    Directories are searched recursively for files with one of path_utils.SQL_EXTENSIONS;
+    glob patterns (``**`` matches across directories) keep every file they match.
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    extensions = tuple(path_utils.SQL_EXTENSIONS)
+    found: Set[str] = set()
+    for source in sources:
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                found.update(os.path.join(root, name) for name in files if name.lower().endswith(extensions))
+        elif glob.has_magic(source):
+            found.update(path for path in glob.glob(source, recursive=True) if os.path.isfile(path))
+        else:
+            found.add(source)
+    return sorted(os.path.abspath(path) for path in found)
+
+
+def _parse_file(
+    file_path: str, database_type: ParserKey, use_cache: bool, column_lineage: bool, parser_options: Dict[str, Any]
+) -> Optional[Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Optional[ColumnLineage]]]:
+    """
+    _parse_dump for one file of a multi-file ingestion, returning (edges, node_types, column
+    lineage or None); None (after a warning) if the file has nothing to parse.
+    """
+    lineage = ColumnLineage() if column_lineage else None
+    try:
+        edges, node_types, _ = _parse_dump(file_path, database_type, use_cache, lineage, **parser_options)
+    except _SKIPPABLE_FILE_ERRORS as e:
+        print(f"Warning: Skipping {file_path}: {e}")
+        return None
+    return edges, node_types, lineage
+
+
+def _merge_node(node_types: Dict[str, NodeInfo], key: str, info: NodeInfo) -> None:
+    """
+    Merges a node seen in another file. A defining file wins over files that only reference the
+    object (which give it the default "table" type and no definition); definitions from several
+    files, e.g. CREATE TABLE in one and ALTER TABLE in another, are appended in file order.
+    """
+    existing = node_types.get(key)
+    if existing is None:
+        node_types[key] = info
+    elif info["definition"] or info.get("definition_refs"):
+        if not existing["definition"] and not existing.get("definition_refs"):
+            node_types[key] = info
+        elif existing["definition"] and info["definition"]:
+            existing["definition"] = f"{existing['definition']}\n\n-- Additional DDL --\n{info['definition']}"
+
+
+def _resolve_cross_file_references(
+    edges: List[Tuple[str, str]], node_types: Dict[str, NodeInfo]
+) -> List[Tuple[str, str]]:
+    """
+    Points references that no file defined at the one object that was defined under a more
+    qualified key, e.g. an unqualified "orders" in one file at "sales.orders" from another.
+    References that match no or several defined objects are left as they are.
+    """
+    defined_by_suffix: Dict[str, List[str]] = {}
+    for key, info in node_types.items():
+        if info["definition"] or info.get("definition_refs"):
+            parts = key.split(".")
+            for i in range(1, len(parts)):
+                defined_by_suffix.setdefault(".".join(parts[i:]), []).append(key)
+
+    renames = {}
+    for key, info in node_types.items():
+        candidates = defined_by_suffix.get(key, [])
+        if not info["definition"] and not info.get("definition_refs") and len(candidates) == 1:
+            renames[key] = candidates[0]
+    for key in renames:
+        del node_types[key]
+
+    resolved: Dict[Tuple[str, str], None] = {}
+    for source, target in edges:
+        edge = (renames.get(source, source), renames.get(target, target))
+        if edge[0] != edge[1]:
+            resolved[edge] = None
+    return list(resolved)
+
+
+def parse_dumps(
+    sources: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]],
+    database_type: Optional[ParserKey] = None,
+    use_cache: bool = True,
+    jobs: int = 1,
+    column_lineage: bool = False,
+    **parser_options: Any,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses many dumps (files, directories and glob patterns, see expand_metadata_paths) into one
+    merged (edges, node_types, stats) result. A single file is handed to parse_dump unchanged.
+
+    Without database_type each file's dialect is detected on its own; files that cannot be
+    detected use the dialect detected for most of the others. With jobs > 1 (or jobs <= 0 for one
+    worker per CPU core) files are parsed by a process pool, each with a single parser process;
+    every file goes through the parse cache. Files that cannot be parsed are skipped with a
+    warning.
+
+    Results are merged in path order (see _merge_node), then references left undefined in
+    every file are resolved against objects other files defined under a qualified name (see
+    _resolve_cross_file_references). Stats are recounted over the merged nodes, and only the
+    merged result is written to json_structure/. With column_lineage=True the column lineage
+    of all files is merged and written as well (see parse_dump).
+    """
+    paths = expand_metadata_paths(sources)
+    if not paths:
+        raise ValueError(f"No SQL files found in {sources}.")
+    if len(paths) == 1:
+        return parse_dump(
+            paths[0], database_type, use_cache=use_cache, column_lineage=column_lineage, jobs=jobs, **parser_options
+        )
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    if database_type is None:
+        guesses: List[Optional[ParserKey]] = [guess_database_type(path) for path in paths]
+        detected = Counter(guess for guess in guesses if guess is not None)
+        if not detected:
+            raise ValueError("Could not detect the SQL dialect of any of the files; pass database_type.")
+        fallback = detected.most_common(1)[0][0]
+        file_types = [guess or fallback for guess in guesses]
+    else:
+        file_types = [database_type] * len(paths)
+
+    arguments = [(path, dbt, use_cache, column_lineage, parser_options) for path, dbt in zip(paths, file_types)]
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_parse_file, *zip(*arguments), chunksize=max(1, len(paths) // (jobs * 4))))
+    else:
+        results = [_parse_file(*args) for args in arguments]
+
+    edges: List[Tuple[str, str]] = []
+    node_types: Dict[str, NodeInfo] = {}
+    lineage = ColumnLineage() if column_lineage else None
+    for result in results:
+        if result is None:
+            continue
+        file_edges, file_node_types, file_lineage = result
+        edges.extend(file_edges)
+        if lineage is not None and file_lineage is not None:
+            lineage.merge(file_lineage)
+        for key, info in file_node_types.items():
+            _merge_node(node_types, key, info)
+    if not node_types:
+        raise InvalidSQLError(f"None of the {len(paths)} files contained relevant DDL statements.")
+
+    edges = _resolve_cross_file_references(edges, node_types)
+    node_types = dict(sorted(node_types.items()))
+    write_json_structure(edges, node_types)
+    if lineage is not None:
+        write_column_lineage(lineage)
+    return edges, node_types, compute_stats(node_types)
+
+
 def draw_complete_data_flow(
-    edges, node_types, save_path="", file_name="", draw_edgeless=False, auto_open=False
+    edges,
+    node_types,
+    save_path="",
+    file_name="",
+    draw_edgeless=False,
+    auto_open=False,
+    precomputed_layout: Optional[bool] = None,
 ) -> None:
     print(f"Generating complete data flow{' for ' + file_name if file_name else ''}...")
     pyvis_mod.draw_pyvis_html(
@@ -37,28 +288,131 @@ def draw_complete_data_flow(
         auto_open=auto_open,
         file_name=file_name,
         draw_edgeless=draw_edgeless,
+        precomputed_layout=precomputed_layout,
     )
 
 
-def draw_focused_data_flow(
-    edges,
+class FocusSet(TypedDict):
+    """One focused diagram of a batch: the output name and the focus span around its nodes."""
+
+    name: str
+    focus_nodes: List[str]
+    see_ancestors: bool
+    see_descendants: bool
+    max_depth: Optional[int]
+
+
+# A "#" that starts a word outside quotes begins a comment; quoted names are skipped over whole.
+_MANIFEST_COMMENT_RE = re.compile(r"""(?P<quoted>"[^"]*"|'[^']*')|(?:^|(?<=\s))#""")
+
+
+def _strip_manifest_comment(line: str) -> str:
+    for match in _MANIFEST_COMMENT_RE.finditer(line):
+        if match.group("quoted") is None:
+            return line[:match.start()]
+    return line
+
+
+def _check_focus_set_names(names: Iterable[str], context: str = "") -> None:
+    """
+    Raises ValueError naming the first focus set whose name is a duplicate or is not a plain
+    file name; set names become output file names, so they cannot contain path separators.
+    """
+    seen: Set[str] = set()
+    for name in names:
+        if "/" in name or "\\" in name or name in (".", ".."):
+            raise ValueError(f"{context}focus set {name!r}: the name cannot contain path separators or be '.' or '..'.")
+        if name in seen:
+            raise ValueError(f"{context}focus set {name!r}: duplicate name.")
+        seen.add(name)
+
+
+def read_focus_manifest(
+    manifest_path: Union[str, os.PathLike],
+    see_ancestors: bool = True,
+    see_descendants: bool = True,
+    max_depth: Optional[int] = None,
+) -> List[FocusSet]:
+    """
+    Reads the focus sets of a batch of focused diagrams. A ".json" manifest holds either an
+    object mapping output names to node lists, or a list of objects with "name" and
+    "focus_nodes" and optionally "ancestors", "descendants" (true or false) and "depth" (a
+    non-negative integer). Any other file has one diagram per line, "name: node1 node2 ...",
+    with blank lines and "#" comments ignored; node names containing spaces or "#" can be
+    quoted. Set names must be unique and free of path separators, as they name the output
+    files. The arguments are the span of the sets that do not set their own.
+
+    Raises:
+        ValueError: if the manifest is malformed, repeats or misnames a focus set, or defines
+            no focus set.
+    """
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    entries: List[Dict[str, Any]] = []
+    if os.fspath(manifest_path).lower().endswith(".json"):
+        def _unique_keys(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+            for key, count in Counter(key for key, _ in pairs).items():
+                if count > 1:
+                    raise ValueError(f"{manifest_path}: duplicate key {key!r}.")
+            return dict(pairs)
+
+        data = json.loads(content, object_pairs_hook=_unique_keys)
+        if isinstance(data, dict):
+            entries = [{"name": name, "focus_nodes": nodes} for name, nodes in data.items()]
+        elif isinstance(data, list) and all(isinstance(entry, dict) for entry in data):
+            entries = data
+        else:
+            raise ValueError(f"{manifest_path}: expected an object or a list of objects.")
+    else:
+        for number, line in enumerate(content.splitlines(), start=1):
+            line = _strip_manifest_comment(line).strip()
+            if not line:
+                continue
+            set_name, separator, set_nodes = line.partition(":")
+            if not separator:
+                raise ValueError(f"{manifest_path}:{number}: expected 'name: node1 node2 ...'.")
+            try:
+                focus_nodes = shlex.split(set_nodes)
+            except ValueError as e:
+                raise ValueError(f"{manifest_path}:{number}: {e}.") from e
+            entries.append({"name": set_name.strip(), "focus_nodes": focus_nodes})
+
+    focus_sets: List[FocusSet] = []
+    for entry in entries:
+        name, nodes = entry.get("name"), entry.get("focus_nodes")
+        if not name or not isinstance(nodes, list) or not nodes:
+            raise ValueError(f"{manifest_path}: focus set {entry!r} needs a name and focus nodes.")
+        ancestors = entry.get("ancestors", see_ancestors)
+        descendants = entry.get("descendants", see_descendants)
+        depth = entry.get("depth", max_depth)
+        if not isinstance(ancestors, bool) or not isinstance(descendants, bool):
+            raise ValueError(f"{manifest_path}: focus set {name!r}: \"ancestors\" and \"descendants\" must be true or false.")
+        if depth is not None and (not isinstance(depth, int) or isinstance(depth, bool) or depth < 0):
+            raise ValueError(f"{manifest_path}: focus set {name!r}: \"depth\" must be a non-negative integer.")
+        focus_sets.append({
+            "name": str(name),
+            "focus_nodes": [str(node) for node in nodes],
+            "see_ancestors": ancestors,
+            "see_descendants": descendants,
+            "max_depth": depth,
+        })
+    if not focus_sets:
+        raise ValueError(f"{manifest_path}: no focus sets found.")
+    _check_focus_set_names((focus_set["name"] for focus_set in focus_sets), f"{manifest_path}: ")
+    return focus_sets
+
+
+def _focused_subgraph(
+    graph: LineageGraph,
     node_types,
-    focus_nodes,
-    save_path="",
-    file_name="",
-    auto_open=False,
-    see_ancestors=True,
-    see_descendants=True,
-) -> Union[None, str]:
-    print(f"Generating focused data flow{' for ' + file_name if file_name else ''}...")
-    print(f"Focus nodes: {focus_nodes}")
-    G: nx.DiGraph = nx.DiGraph()
-    G.add_edges_from(edges)
-    valid_nodes_set = set(node_types.keys())
-    nodes_in_edges = set(u for u, v in edges) | set(v for u, v in edges)
-    G.add_nodes_from(nodes_in_edges)
-    G.add_nodes_from(valid_nodes_set)
-    existing_focus_nodes = [node for node in focus_nodes if node in G]
+    focus_nodes: List[str],
+    see_ancestors: bool,
+    see_descendants: bool,
+    max_depth: Optional[int],
+) -> Optional[Tuple[LineageGraph, Dict[str, Dict[str, str]], List[str]]]:
+    """The focused subgraph, its node types and the focus nodes found; None if none was found."""
+    existing_focus_nodes = [node for node in focus_nodes if node in graph]
 
     if not existing_focus_nodes:
         print(f"Warning: Focus nodes {focus_nodes} not found.")
@@ -68,24 +422,15 @@ def draw_focused_data_flow(
             f"Warning: Missing focus nodes: {set(focus_nodes) - set(existing_focus_nodes)}"
         )
 
+    # One multi-source traversal per direction covers all focus nodes.
     subgraph_nodes = set(existing_focus_nodes)
-    for node in existing_focus_nodes:
-        if see_ancestors:
-            try:
-                subgraph_nodes.update(nx.ancestors(G, node))
-            except nx.NetworkXError:
-                print(f"Error finding ancestors for '{node}'.")
-        if see_descendants:
-            try:
-                subgraph_nodes.update(nx.descendants(G, node))
-            except nx.NetworkXError:
-                print(f"Error finding descendants for '{node}'.")
+    if see_ancestors:
+        subgraph_nodes.update(graph.ancestors_of(existing_focus_nodes, max_depth))
+    if see_descendants:
+        subgraph_nodes.update(graph.descendants_of(existing_focus_nodes, max_depth))
 
     # Create focused subgraph
-    focused_subgraph = G.subgraph(subgraph_nodes).copy()
-    if not focused_subgraph.nodes():
-        print("Warning: Focused subgraph empty.")
-        return None
+    focused_subgraph = graph.subgraph(subgraph_nodes)
 
     # Prepare node types for focused view
     subgraph_node_types = {
@@ -94,16 +439,128 @@ def draw_focused_data_flow(
             "database": node_types.get(node, {"database": ""})["database"],
             "full_name": node_types.get(node, {"full_name": node})["full_name"],
         }
-        for node in focused_subgraph.nodes()
+        for node in focused_subgraph.names
     }
+    return focused_subgraph, subgraph_node_types, existing_focus_nodes
+
+
+def draw_focused_data_flow(
+    edges,
+    node_types,
+    focus_nodes,
+    save_path="",
+    file_name="",
+    auto_open=False,
+    see_ancestors=True,
+    see_descendants=True,
+    graph: Optional[LineageGraph] = None,
+    max_depth: Optional[int] = None,
+    precomputed_layout: Optional[bool] = None,
+) -> Union[None, str]:
+    """
+    Draws the focus nodes with their ancestors and/or descendants, at most max_depth edges away
+    (no limit if None). graph is the LineageGraph of edges and node_types; pass it when drawing
+    several focused views of one parse so it is only built once. precomputed_layout is passed
+    on to pyvis_mod.draw_pyvis_html.
+    """
+    print(f"Generating focused data flow{' for ' + file_name if file_name else ''}...")
+    print(f"Focus nodes: {focus_nodes}")
+    if graph is None:
+        graph = LineageGraph(edges, node_types.keys())
+    focused = _focused_subgraph(graph, node_types, focus_nodes, see_ancestors, see_descendants, max_depth)
+    if focused is None:
+        return None
+    focused_subgraph, subgraph_node_types, existing_focus_nodes = focused
 
     # Use the draw_pyvis_html function
     return pyvis_mod.draw_pyvis_html(
-        list(focused_subgraph.edges()),
+        focused_subgraph.edges(),
         subgraph_node_types,
         save_path=save_path,
         file_name=file_name,
         auto_open=auto_open,
         focus_nodes=existing_focus_nodes,
         is_focused_view=True,
+        graph=focused_subgraph,
+        precomputed_layout=precomputed_layout,
+    )
+
+
+def _render_focused(
+    focused_subgraph: LineageGraph,
+    subgraph_node_types: Dict[str, Dict[str, str]],
+    focus_nodes: List[str],
+    save_path: str,
+    file_name: str,
+    precomputed_layout: Optional[bool] = None,
+) -> Optional[str]:
+    """
+    Renders one focused subgraph of a batch and returns the HTML path (None on failure).
+    Module-level so process pools can pickle it; only the path travels back, not the HTML.
+    """
+    html = pyvis_mod.draw_pyvis_html(
+        focused_subgraph.edges(),
+        subgraph_node_types,
+        save_path=save_path,
+        file_name=file_name,
+        focus_nodes=focus_nodes,
+        is_focused_view=True,
+        graph=focused_subgraph,
+        precomputed_layout=precomputed_layout,
     )
+    if html is None:
+        return None
+    return str(Path(pyvis_mod.html_output_path(save_path, file_name, is_focused_view=True)).resolve())
+
+
+def draw_focused_data_flows(
+    edges,
+    node_types,
+    focus_sets: List[FocusSet],
+    save_path="",
+    file_name="",
+    jobs: int = 1,
+    graph: Optional[LineageGraph] = None,
+    precomputed_layout: Optional[bool] = None,
+) -> Dict[str, Optional[str]]:
+    """
+    Draws one focused diagram per focus set from a single parse. The subgraphs are all cut from
+    one shared LineageGraph (built from edges and node_types unless graph is given), then
+    rendered by a process pool with jobs workers (jobs <= 0: one per CPU core). Each diagram is
+    named after file_name and the set's name, and none is opened in the browser.
+    precomputed_layout is passed on to pyvis_mod.draw_pyvis_html.
+
+    Returns the HTML path of each focus set by name; None for sets whose nodes were not found
+    or whose file could not be written.
+
+    Raises:
+        ValueError: if two focus sets share a name or a name contains a path separator.
+    """
+    _check_focus_set_names(focus_set["name"] for focus_set in focus_sets)
+    if graph is None:
+        graph = LineageGraph(edges, node_types.keys())
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    results: Dict[str, Optional[str]] = {}
+    renders = []
+    for focus_set in focus_sets:
+        name = focus_set["name"]
+        focused = _focused_subgraph(
+            graph, node_types, focus_set["focus_nodes"],
+            focus_set["see_ancestors"], focus_set["see_descendants"], focus_set["max_depth"],
+        )
+        results[name] = None
+        if focused is not None:
+            output_name = f"{file_name}_{name}" if file_name else name
+            renders.append((name, *focused, save_path, output_name, precomputed_layout))
+
+    print(f"Generating {len(renders)} focused data flows{' for ' + file_name if file_name else ''}...")
+    if jobs > 1 and len(renders) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            paths = list(executor.map(_render_focused, *zip(*(render[1:] for render in renders))))
+    else:
+        paths = [_render_focused(*render[1:]) for render in renders]
+    for render, path in zip(renders, paths):
+        results[render[0]] = path
+    return results
@@ -0,0 +1,234 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+import numpy as np
+
+if TYPE_CHECKING:
+    from .reachability import ReachabilityIndex
+
+
+def csr(sources: np.ndarray, targets: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Compressed sparse row adjacency: the neighbours of node i are indices[indptr[i]:indptr[i + 1]]."""
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=indptr[1:])
+    return indptr, targets[order]
+
+
+def neighbours(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> np.ndarray:
+    """All neighbours of the frontier nodes in one gather, without a Python loop over nodes."""
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return np.empty(0, dtype=indices.dtype)
+    # Position of each gathered neighbour: its row start plus its offset within the row.
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    found: np.ndarray = indices[np.repeat(starts, counts) + offsets]
+    return found
+
+
+def strongly_connected_components(indptr: np.ndarray, indices: np.ndarray, node_count: int) -> Tuple[np.ndarray, int]:
+    """
+    Tarjan's algorithm without recursion, so deep lineage chains cannot overflow the stack.
+    Components are numbered in reverse topological order: an edge between two components
+    always goes from the higher to the lower number.
+    """
+    starts: List[int] = indptr.tolist()
+    targets: List[int] = indices.tolist()
+    order = [-1] * node_count
+    low = [0] * node_count
+    on_stack = [False] * node_count
+    component = [-1] * node_count
+    stack: List[int] = []
+    counter = component_count = 0
+    for root in range(node_count):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, starts[root])]
+        while work:
+            node, pos = work[-1]
+            if pos < starts[node + 1]:
+                work[-1] = (node, pos + 1)
+                neighbour = targets[pos]
+                if order[neighbour] == -1:
+                    order[neighbour] = low[neighbour] = counter
+                    counter += 1
+                    stack.append(neighbour)
+                    on_stack[neighbour] = True
+                    work.append((neighbour, starts[neighbour]))
+                elif on_stack[neighbour]:
+                    low[node] = min(low[node], order[neighbour])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == order[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component[member] = component_count
+                    if member == node:
+                        break
+                component_count += 1
+    return np.array(component, dtype=np.int64), component_count
+
+
+class LineageGraph:
+    """
+    Directed lineage graph (source -> dependent) built once from a parse result. Node names are
+    interned to integer IDs in first-seen order (edges first, then the extra nodes) and the
+    edges are stored as CSR adjacency arrays in both directions, so a graph with hundreds of
+    thousands of edges takes a few megabytes instead of networkx's dict-of-dicts. Degrees are
+    NumPy arrays indexed by node ID; ancestor and descendant queries expand a whole BFS frontier
+    per step. Use to_networkx() where a networkx graph is really needed.
+
+    If a ReachabilityIndex is assigned to reachability (see reachability.load_or_build), the
+    ancestor and descendant queries without a depth limit are answered from it instead.
+    """
+
+    reachability: Optional["ReachabilityIndex"] = None
+
+    def __init__(self, edges: Iterable[Tuple[str, str]], nodes: Iterable[str] = ()) -> None:
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        sources: List[int] = []
+        targets: List[int] = []
+        for source, target in edges:
+            sources.append(self._intern(source))
+            targets.append(self._intern(target))
+        for node in nodes:
+            self._intern(node)
+        self._set_edges(np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64))
+
+    def _intern(self, name: str) -> int:
+        node_id = self.index.get(name)
+        if node_id is None:
+            node_id = self.index[name] = len(self.names)
+            self.names.append(name)
+        return node_id
+
+    def _set_edges(self, sources: np.ndarray, targets: np.ndarray) -> None:
+        node_count = len(self.names)
+        # Duplicate edges are dropped, keeping the first occurrence and the input order.
+        _, first = np.unique(sources * max(node_count, 1) + targets, return_index=True)
+        keep = np.sort(first)
+        self.sources, self.targets = sources[keep], targets[keep]
+        self._out_indptr, self._out_indices = csr(self.sources, self.targets, node_count)
+        self._in_indptr, self._in_indices = csr(self.targets, self.sources, node_count)
+
+    @classmethod
+    def _from_arrays(cls, names: List[str], sources: np.ndarray, targets: np.ndarray) -> "LineageGraph":
+        graph = cls.__new__(cls)
+        graph.names = names
+        graph.index = {name: node_id for node_id, name in enumerate(names)}
+        graph._set_edges(sources, targets)
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def nodes(self) -> List[str]:
+        return list(self.names)
+
+    def edges(self) -> List[Tuple[str, str]]:
+        names = self.names
+        return [(names[source], names[target]) for source, target in zip(self.sources.tolist(), self.targets.tolist())]
+
+    def number_of_edges(self) -> int:
+        return len(self.sources)
+
+    def ids(self, names: Iterable[str]) -> np.ndarray:
+        """IDs of the given node names; names not in the graph are skipped."""
+        return np.array([self.index[name] for name in names if name in self.index], dtype=np.int64)
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self._in_indptr)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self._out_indptr)
+
+    def components(self) -> Tuple[np.ndarray, int]:
+        """Strongly connected component of each node and the component count (see strongly_connected_components)."""
+        return strongly_connected_components(self._out_indptr, self._out_indices, len(self.names))
+
+    def degree(self) -> np.ndarray:
+        degree: np.ndarray = self.in_degree() + self.out_degree()
+        return degree
+
+    def _reachable(
+        self, start: np.ndarray, indptr: np.ndarray, indices: np.ndarray, max_depth: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Boolean mask of the nodes reachable from any start node in 1..max_depth steps (no limit
+        if None). All start nodes share one BFS and one visited mask, so overlapping regions are
+        only traversed once.
+        """
+        reached = np.zeros(len(self.names), dtype=bool)
+        frontier = np.unique(start)
+        depth = 0
+        while frontier.size and (max_depth is None or depth < max_depth):
+            found = neighbours(indptr, indices, frontier)
+            frontier = np.unique(found[~reached[found]])
+            reached[frontier] = True
+            depth += 1
+        return reached
+
+    def _closure(self, node: str, indptr: np.ndarray, indices: np.ndarray) -> Set[str]:
+        node_id = self.index[node]
+        reached = self._reachable(np.array([node_id], dtype=np.int64), indptr, indices)
+        reached[node_id] = False
+        return {self.names[i] for i in np.flatnonzero(reached).tolist()}
+
+    def ancestors(self, node: str) -> Set[str]:
+        """All nodes with a path to node, like nx.ancestors. Raises KeyError for an unknown node."""
+        if self.reachability is not None:
+            return self.reachability.ancestors(node)
+        return self._closure(node, self._in_indptr, self._in_indices)
+
+    def descendants(self, node: str) -> Set[str]:
+        """All nodes reachable from node, like nx.descendants. Raises KeyError for an unknown node."""
+        if self.reachability is not None:
+            return self.reachability.descendants(node)
+        return self._closure(node, self._out_indptr, self._out_indices)
+
+    def ancestors_of(self, nodes: Iterable[str], max_depth: Optional[int] = None) -> Set[str]:
+        """
+        Union of the ancestors of all given nodes, at most max_depth edges upstream, in one
+        multi-source BFS. Unknown nodes are skipped; a given node is only part of the result
+        if it is an ancestor of another (or itself, through a cycle).
+        """
+        if self.reachability is not None and max_depth is None:
+            return self.reachability.ancestors_of(nodes)
+        reached = self._reachable(self.ids(nodes), self._in_indptr, self._in_indices, max_depth)
+        return {self.names[i] for i in np.flatnonzero(reached).tolist()}
+
+    def descendants_of(self, nodes: Iterable[str], max_depth: Optional[int] = None) -> Set[str]:
+        """Union of the descendants of all given nodes, at most max_depth edges downstream (see ancestors_of)."""
+        if self.reachability is not None and max_depth is None:
+            return self.reachability.descendants_of(nodes)
+        reached = self._reachable(self.ids(nodes), self._out_indptr, self._out_indices, max_depth)
+        return {self.names[i] for i in np.flatnonzero(reached).tolist()}
+
+    def subgraph(self, nodes: Iterable[str]) -> "LineageGraph":
+        """The subgraph induced by nodes, keeping this graph's node and edge order."""
+        mask = np.zeros(len(self.names), dtype=bool)
+        mask[self.ids(nodes)] = True
+        new_ids = np.cumsum(mask) - 1
+        kept = mask[self.sources] & mask[self.targets]
+        names = [name for name, keep in zip(self.names, mask.tolist()) if keep]
+        return LineageGraph._from_arrays(names, new_ids[self.sources[kept]], new_ids[self.targets[kept]])
+
+    def to_networkx(self) -> nx.DiGraph:
+        graph: nx.DiGraph = nx.DiGraph()
+        graph.add_nodes_from(self.names)
+        graph.add_edges_from(self.edges())
+        return graph
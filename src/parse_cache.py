@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import pickle
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
+
+from . import path_utils
+from .parsers import parser_utils
+
+# Parse results are stored one file per key, least recently used entries are evicted first.
+CACHE_DIR = path_utils.DATA_FLOW_BASE_DIR / "cache" / "parse"
+# One small entry per input file, named by the hash of its absolute path, maps (size, mtime) to the
+# content digest so cache hits do not re-hash big dumps.
+STAT_DIR_NAME = "stat"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+PICKLE_PROTOCOL = 5
+# Cache entries: parse results, and the reachability indexes stored next to them (see reachability).
+ENTRY_PATTERNS = ("*.pkl", "*.reach.npz")
+# Parser options that only change how a dump is read, never the parse result.
+RESULT_NEUTRAL_OPTIONS = {"jobs", "incremental"}
+# Parser options that write files besides the result; a cache hit could not reproduce them, so they bypass the cache.
+SIDE_EFFECT_OPTIONS = {"debug_cleaned_sql"}
+
+ParseResult = Tuple[List[Tuple[str, str]], Dict[str, Any], Dict[str, int]]
+
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def _stat_key(file_path: Union[str, os.PathLike]) -> Tuple[str, int, int]:
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+
+
+def _stat_entry_path(abs_path: str) -> Path:
+    return CACHE_DIR / STAT_DIR_NAME / f"{hashlib.sha256(abs_path.encode('utf-8')).hexdigest()}.json"
+
+
+def _read_stat_entry(stat_key: Tuple[str, int, int]) -> Optional[str]:
+    abs_path, size, mtime_ns = stat_key
+    try:
+        with open(_stat_entry_path(abs_path), "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or [entry.get("size"), entry.get("mtime_ns")] != [size, mtime_ns]:
+        return None
+    digest = entry.get("digest")
+    return digest if isinstance(digest, str) else None
+
+
+def _write_stat_entry(stat_key: Tuple[str, int, int], digest: str) -> None:
+    abs_path, size, mtime_ns = stat_key
+    entry_path = _stat_entry_path(abs_path)
+    try:
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_name(f"{entry_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"size": size, "mtime_ns": mtime_ns, "digest": digest}, f)
+        os.replace(tmp_path, entry_path)
+    except OSError:
+        pass
+
+
+def file_digest(file_path: Union[str, os.PathLike]) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    Digests are remembered per (path, size, mtime), in memory and in a per-file entry on disk,
+    so an unchanged file is only hashed once and concurrent runs never rewrite each other's entries.
+    """
+    stat_key = _stat_key(file_path)
+    if stat_key in _digest_memo:
+        return _digest_memo[stat_key]
+
+    digest = _read_stat_entry(stat_key)
+    if digest is None:
+        with open(file_path, "rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        _write_stat_entry(stat_key, digest)
+    _digest_memo[stat_key] = digest
+    return digest
+
+
+def parser_version(parser: Any) -> str:
+    """
+    Identifies the parser implementation: package version, the module's PARSER_VERSION (if any)
+    and a hash of the module source and of the shared parsers.parser_utils source (statement
+    splitter, input reading), so editing either invalidates the parser's cached results.
+    """
+    try:
+        package_version = metadata.version("data-flow-generator")
+    except metadata.PackageNotFoundError:
+        package_version = "dev"
+    source_hash = hashlib.sha256()
+    for source_file in (getattr(parser, "__file__", None), parser_utils.__file__):
+        if source_file:
+            try:
+                with open(source_file, "rb") as f:
+                    source_hash.update(f.read())
+            except OSError:
+                pass
+    return f"{package_version}+{getattr(parser, 'PARSER_VERSION', '0')}+{source_hash.hexdigest()[:12]}"
+
+
+def cache_key(
+    file_path: Union[str, os.PathLike],
+    database_type_name: str,
+    version: str,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Builds the cache key from the file content hash, database type, parser version and options."""
+    relevant_options = {
+        k: v for k, v in sorted((options or {}).items()) if k not in RESULT_NEUTRAL_OPTIONS
+    }
+    key_material = "\0".join(
+        (file_digest(file_path), database_type_name, version, repr(relevant_options))
+    )
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.pkl"
+
+
+def load(key: str) -> Optional[ParseResult]:
+    """Returns the cached (edges, node_types, stats) for key, or None on a miss."""
+    entry = _entry_path(key)
+    try:
+        with open(entry, "rb") as f:
+            result = pickle.load(f)
+        os.utime(entry)  # Mark as recently used for LRU eviction.
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return cast(ParseResult, result)
+
+
+def max_cache_bytes() -> int:
+    """Cache size limit, overridable with the 'parse_cache_max_bytes' setting."""
+    return int(path_utils.read_settings().get("parse_cache_max_bytes", DEFAULT_MAX_BYTES))
+
+
+def evict(max_bytes: int) -> None:
+    """Deletes least recently used entries until the cache fits within max_bytes."""
+    entries = []
+    for entry in (entry for pattern in ENTRY_PATTERNS for entry in CACHE_DIR.glob(pattern)):
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            entry.unlink()
+            total -= size
+        except OSError:
+            continue
+
+
+def store(key: str, result: ParseResult, max_bytes: Optional[int] = None) -> None:
+    """Stores a parse result under key, then evicts old entries beyond the size limit."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = CACHE_DIR / f"{key}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=PICKLE_PROTOCOL)
+        os.replace(tmp_path, _entry_path(key))
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Warning: Could not write parse cache entry: {e}")
+        return
+    evict(max_cache_bytes() if max_bytes is None else max_bytes)
+
+
+def clear() -> None:
+    """Removes all cached parse results and reachability indexes."""
+    for entry in (entry for pattern in ENTRY_PATTERNS for entry in CACHE_DIR.glob(pattern)):
+        try:
+            entry.unlink()
+        except OSError:
+            continue
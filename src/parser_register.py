@@ -1,18 +1,16 @@
 from enum import Enum, auto
+from functools import lru_cache
+from importlib import import_module, metadata
+from itertools import islice
+import json
+import logging
 import os
 import re
-from typing import Optional, Union
-from sqlfluff.core import Linter
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union, cast
 
-from .parsers import (
-    parser_denodo,
-    parser_mysql,
-    parser_postgres,
-    parser_sqlserver,
-    parser_oracle,
-    parser_sqlite,
-    parser_snowflake,
-)
+from . import parse_cache, path_utils
+from .parsers.parser_utils import StatementSplitter
 
 
 class DatabaseType(Enum):
@@ -27,19 +25,92 @@ class DatabaseType(Enum):
     # …add more as needed
 
 
-# Each entry should point to a module with a `parse_dump(file_path)` function.
-_PARSER_REGISTRY = {
-    DatabaseType.MYSQL: parser_mysql,
-    DatabaseType.POSTGRESQL: parser_postgres,
-    DatabaseType.ANSI: parser_postgres,
-    DatabaseType.SNOWFLAKE: parser_snowflake,
-    DatabaseType.SQLSERVER: parser_sqlserver,
-    DatabaseType.ORACLE: parser_oracle,
-    DatabaseType.DENODO: parser_denodo,
-    DatabaseType.SQLITE: parser_sqlite,
+ParserKey = Union[DatabaseType, str]  # A DatabaseType, or the name of a plugin dialect
+
+# Entry point group through which installed packages register parsers. The entry point name is
+# a dialect name (a DatabaseType name replaces the built-in parser, any other name adds a new
+# dialect) and its value is the module path, e.g. `teradata = "my_pkg.parser_teradata"`.
+ENTRY_POINT_GROUP = "data_flow_generator.parsers"
+
+# Each entry should point to a module with a `parse_dump(file_path)` function. Module paths are
+# relative to this package and are only imported when their dialect is dispatched.
+_BUILTIN_PARSERS: Dict[ParserKey, str] = {
+    DatabaseType.MYSQL: ".parsers.parser_mysql",
+    DatabaseType.POSTGRESQL: ".parsers.parser_postgres",
+    DatabaseType.ANSI: ".parsers.parser_ansi",
+    DatabaseType.SNOWFLAKE: ".parsers.parser_snowflake",
+    DatabaseType.SQLSERVER: ".parsers.parser_sqlserver",
+    DatabaseType.ORACLE: ".parsers.parser_oracle",
+    DatabaseType.DENODO: ".parsers.parser_denodo",
+    DatabaseType.SQLITE: ".parsers.parser_sqlite",
 }
 
 
+class ParserRegistry(Mapping[ParserKey, ModuleType]):
+    """
+    Maps dialects to parser modules, importing each module the first time it is looked up.
+    Keys are DatabaseType members, or plain names for dialects added by plugins; a name that
+    matches a DatabaseType member (in any case) means that member. Entry points of
+    ENTRY_POINT_GROUP are discovered on first use, without importing the modules they name.
+    """
+
+    def __init__(self, builtins: Mapping[ParserKey, str]) -> None:
+        self._paths: Dict[ParserKey, str] = dict(builtins)
+        self._modules: Dict[ParserKey, ModuleType] = {}
+        self._entry_points_loaded = False
+
+    @staticmethod
+    def normalize(key: ParserKey) -> ParserKey:
+        """The DatabaseType member a dialect name stands for, else the key unchanged."""
+        if isinstance(key, str) and key.upper() in DatabaseType.__members__:
+            return DatabaseType[key.upper()]
+        return key
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            self._paths[self.normalize(entry_point.name)] = entry_point.value
+
+    def register(self, key: ParserKey, module_path: str) -> None:
+        """Registers (or replaces) the parser module of a dialect; the module is imported on first lookup."""
+        self._load_entry_points()
+        key = self.normalize(key)
+        self._paths[key] = module_path
+        self._modules.pop(key, None)
+
+    def __getitem__(self, key: ParserKey) -> ModuleType:
+        key = self.normalize(key)
+        if key not in self._modules:
+            self._load_entry_points()
+            module_path = self._paths[key]
+            self._modules[key] = import_module(module_path, __package__ if module_path.startswith(".") else None)
+        return self._modules[key]
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, (DatabaseType, str)):
+            return False
+        self._load_entry_points()
+        return self.normalize(key) in self._paths
+
+    def __iter__(self) -> Iterator[ParserKey]:
+        self._load_entry_points()
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        self._load_entry_points()
+        return len(self._paths)
+
+
+_PARSER_REGISTRY = ParserRegistry(_BUILTIN_PARSERS)
+
+
+def register_parser(key: ParserKey, module_path: str) -> None:
+    """Registers a parser module (path of a module with a `parse_dump` function) for a dialect."""
+    _PARSER_REGISTRY.register(key, module_path)
+
+
 EXTENSION_MAP = {
     ".sql": None,  # ambiguous
     ".psql": DatabaseType.POSTGRESQL,
@@ -47,6 +118,9 @@ EXTENSION_MAP = {
     ".vql": DatabaseType.DENODO,
     ".ora": DatabaseType.ORACLE,
     ".bcp": DatabaseType.SQLSERVER,
+    ".sqlite": DatabaseType.SQLITE,
+    ".sqlite3": DatabaseType.SQLITE,
+    ".db3": DatabaseType.SQLITE,
     # …etc.
 }
 
@@ -56,36 +130,56 @@ HEADER_KEYWORDS = {
     DatabaseType.SQLSERVER: re.compile(r"-- Microsoft SQL Server", re.IGNORECASE),
     DatabaseType.ORACLE: re.compile(r"/\* Oracle SQL dump \*/", re.IGNORECASE),
     DatabaseType.DENODO: re.compile(r"<VQL>", re.IGNORECASE),
+    DatabaseType.SQLITE: re.compile(r"\ASQLite format 3\x00"),  # Database file, not a text dump
 }
 
 KEYWORD_COUNTS = {
-    DatabaseType.MYSQL: [r"ENGINE\s*=", r"AUTO_INCREMENT"],
-    DatabaseType.POSTGRESQL: [r"SERIAL", r"OWNER TO", r"SET search_path"],
-    DatabaseType.SQLSERVER: [r"\bGO\b", r"IDENTITY\s*\(", r"MERGE\s+INTO"],
-    DatabaseType.ORACLE: [r"\bSEQUENCE\b", r"SPOOL\s+", r"VARCHAR2"],
+    DatabaseType.MYSQL: [r"ENGINE\s*=", r"AUTO_INCREMENT", r"`\w+`", r"/\*!\d{5}"],
+    DatabaseType.POSTGRESQL: [r"SERIAL", r"OWNER TO", r"SET search_path", r"::[a-z_]+\b"],
+    DatabaseType.SQLSERVER: [
+        r"\bGO\b", r"IDENTITY\s*\(", r"MERGE\s+INTO", r"\[dbo\]", r"\bNVARCHAR\b", r"/\*{6}\s+Object:",
+    ],
+    DatabaseType.ORACLE: [r"\bSEQUENCE\b", r"SPOOL\s+", r"VARCHAR2", r"\bNVL\s*\("],
+    DatabaseType.SNOWFLAKE: [
+        r"VARCHAR\(16777216\)", r"\bTIMESTAMP_NTZ\b", r"\bSECURE\s+VIEW\b", r"\bDYNAMIC\s+TABLE\b",
+        r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:STREAM|TASK|STAGE)\b",
+    ],
+    DatabaseType.SQLITE: [
+        r"\bAUTOINCREMENT\b", r"\bWITHOUT\s+ROWID\b", r"PRAGMA\s+foreign_keys", r"\bsqlite_sequence\b",
+    ],
     # Denodo you've already captured via .vql extension or header
 }
+# One alternation per dialect, so scoring is a single findall per dialect.
+_KEYWORD_RES = {
+    dbt: re.compile("|".join(f"(?:{regex})" for regex in regex_list), re.IGNORECASE)
+    for dbt, regex_list in KEYWORD_COUNTS.items()
+}
 
+# Dialect names, identical for sqlglot and sqlfluff, of the candidates tried by _guess_by_parsing.
+_PARSE_DIALECTS = {
+    DatabaseType.MYSQL: "mysql",
+    DatabaseType.POSTGRESQL: "postgres",
+    DatabaseType.SQLSERVER: "tsql",
+    DatabaseType.ORACLE: "oracle",
+}
+GUESS_STATEMENTS = 20  # Statements of the file head that are parsed per candidate dialect
+# Bump when detection rules change, to invalidate cached guesses.
+DETECTION_VERSION = "1"
+GUESS_CACHE_FILE = path_utils.DATA_FLOW_BASE_DIR / "cache" / "dialect_guesses.json"
+GUESS_CACHE_MAX_ENTRIES = 1000  # Oldest guesses are dropped beyond this
 
-def _guess_by_parsing(sql_text: str) -> Optional[DatabaseType]:
-    # Try each dialect and count parse errors
-    errors_per_dialect = {}
-    for dbt in [
-        DatabaseType.MYSQL,
-        DatabaseType.POSTGRESQL,
-        DatabaseType.SQLSERVER,
-        DatabaseType.ORACLE,
-    ]:
-        dialect = {
-            DatabaseType.MYSQL: "mysql",
-            DatabaseType.POSTGRESQL: "postgres",
-            DatabaseType.SQLSERVER: "tsql",
-            DatabaseType.ORACLE: "oracle",
-        }[dbt]
-        linter = Linter(dialect=dialect)
-        result = linter.lint_string(sql_text)
-        errors_per_dialect[dbt] = len(result.get_violations())
 
+def _head_statements(sql_text: str, limit: int = GUESS_STATEMENTS) -> List[str]:
+    """The first complete statements of a file head; the trailing cut-off one only if there is no other."""
+    splitter = StatementSplitter()
+    statements = splitter.feed(sql_text)
+    if not statements:
+        trailing = splitter.flush()
+        statements = [trailing] if trailing else []
+    return statements[:limit]
+
+
+def _pick_unique_best(errors_per_dialect: Dict[DatabaseType, int]) -> Optional[DatabaseType]:
     best_dbt, best_errs = min(errors_per_dialect.items(), key=lambda kv: kv[1])
     # Only pick if clearly better
     if best_errs < min(e for dbt, e in errors_per_dialect.items() if dbt != best_dbt):
@@ -93,6 +187,93 @@ def _guess_by_parsing(sql_text: str) -> Optional[DatabaseType]:
     return None
 
 
+def _sqlglot_failures(statement: str, dialect: str) -> int:
+    """1 if sqlglot cannot parse the statement in this dialect (or only as an opaque Command), else 0."""
+    import sqlglot
+    from sqlglot import exp
+    from sqlglot.errors import SqlglotError
+
+    try:
+        expressions = sqlglot.parse(statement, read=dialect)
+    except SqlglotError:
+        return 1
+    return int(any(e is None or isinstance(e, exp.Command) for e in expressions))
+
+
+@lru_cache(maxsize=None)
+def _linter(dialect: str) -> Any:
+    """sqlfluff Linter for a dialect, imported and built on first use, then reused."""
+    from sqlfluff.core import Linter
+
+    return Linter(dialect=dialect)
+
+
+def _guess_by_parsing(sql_text: str) -> Optional[DatabaseType]:
+    """
+    Ranks the candidate dialects by how many of the first statements fail to parse.
+    sqlglot decides most cases quickly; sqlfluff linting, which is much slower, only runs on a tie.
+    """
+    statements = _head_statements(sql_text)
+    if not statements:
+        return None
+
+    sqlglot_logger = logging.getLogger("sqlglot")
+    previous_level = sqlglot_logger.level
+    sqlglot_logger.setLevel(logging.ERROR)  # Unsupported syntax is expected here; do not warn about it.
+    try:
+        errors_per_dialect = {
+            dbt: sum(_sqlglot_failures(statement, dialect) for statement in statements)
+            for dbt, dialect in _PARSE_DIALECTS.items()
+        }
+    finally:
+        sqlglot_logger.setLevel(previous_level)
+    best = _pick_unique_best(errors_per_dialect)
+    if best is not None:
+        return best
+
+    # Try each dialect with sqlfluff and count lint violations
+    head_sql = ";\n".join(statements)
+    errors_per_dialect = {
+        dbt: len(_linter(dialect).lint_string(head_sql).get_violations())
+        for dbt, dialect in _PARSE_DIALECTS.items()
+    }
+    return _pick_unique_best(errors_per_dialect)
+
+
+def _read_guess_cache() -> Dict[str, str]:
+    try:
+        with open(GUESS_CACHE_FILE, "r", encoding="utf-8") as f:
+            return cast(Dict[str, str], json.load(f))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_guess_cache(cache: Dict[str, str]) -> None:
+    try:
+        GUESS_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = GUESS_CACHE_FILE.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, GUESS_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def _cached_guess_by_parsing(file_path: Union[str, os.PathLike], head: str) -> Optional[DatabaseType]:
+    """_guess_by_parsing, remembered per file content hash across runs."""
+    try:
+        key = f"{DETECTION_VERSION}:{parse_cache.file_digest(file_path)}"
+    except OSError:
+        return _guess_by_parsing(head)
+    cache = _read_guess_cache()
+    if key in cache:
+        return DatabaseType[cache[key]] if cache[key] in DatabaseType.__members__ else None
+    guess = _guess_by_parsing(head)
+    cache[key] = guess.name if guess else ""
+    _write_guess_cache(dict(islice(cache.items(), max(0, len(cache) - GUESS_CACHE_MAX_ENTRIES), None)))
+    return guess
+
+
 def guess_database_type(file_path: Union[str, os.PathLike]) -> Optional[DatabaseType]:
     # 1) By extension
     ext = os.path.splitext(file_path)[1].lower()
@@ -110,14 +291,10 @@ def guess_database_type(file_path: Union[str, os.PathLike]) -> Optional[Database
             return dbt
 
     # 4) Keyword‐frequency scoring
-    scores = {dbt: 0 for dbt in KEYWORD_COUNTS}
-    for dbt, regex_list in KEYWORD_COUNTS.items():
-        for regex in regex_list:
-            matches = re.findall(regex, head, flags=re.IGNORECASE)
-            scores[dbt] += len(matches)
+    scores = {dbt: len(regex.findall(head)) for dbt, regex in _KEYWORD_RES.items()}
     best, best_score = max(scores.items(), key=lambda kv: kv[1])
     if best_score >= 2:  # threshold: at least 2 hits
         return best
 
     # 5) Fallback to SQL‐dialect parser ranking
-    return _guess_by_parsing(head)
+    return _cached_guess_by_parsing(file_path, head)
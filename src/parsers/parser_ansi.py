@@ -0,0 +1,133 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from ..dataflow_structs import NodeInfo, InvalidSQLError
+from .parser_utils import GraphContext, StatementSplitter, compute_stats, open_input
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+# Only statements that can add nodes or edges are handed to sqlglot; everything else (data,
+# grants, SET ...) is dropped after a prefix check.
+_DDL_START_RE = re.compile(r"(?:CREATE|ALTER)\s", re.IGNORECASE)
+
+
+class ParseContext(GraphContext[NodeInfo]):
+    """Graph under construction for one parse_dump call. Node keys are "schema.name", or "name" without a schema."""
+
+    def add_node(self, table: exp.Table, node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node for a table reference and returns its key. A defining statement (node_type
+        given) sets the type and appends its definition; a bare reference only creates a table
+        node if the object was not seen yet.
+        """
+        schema = ".".join(part for part in (table.catalog, table.db) if part)
+        key = self.upsert_node(f"{schema}.{table.name}" if schema else table.name, schema, node_type)
+        if definition:
+            self.append_definition(key, definition)
+        return key
+
+
+def _add_query_edges(ctx: ParseContext, key: str, query: exp.Query) -> None:
+    """Adds source -> key edges for the tables a query reads, with its CTEs as "cte_view" nodes."""
+    cte_keys = {cte.alias_or_name: ctx.add_cte(cte.alias_or_name, cte.sql()) for cte in query.find_all(exp.CTE)}
+    for table in query.find_all(exp.Table):
+        if not table.name:
+            continue
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        enclosing = table.find_ancestor(exp.CTE)
+        target = cte_keys[enclosing.alias_or_name] if enclosing else key
+        source = None if table.db else cte_keys.get(table.name)
+        ctx.add_edge(source or ctx.add_node(table), target)
+
+
+def _add_foreign_keys(ctx: ParseContext, key: str, statement: exp.Expression) -> None:
+    """Foreign keys point from the referencing table to the referenced one, like the Postgres parser."""
+    for reference in statement.find_all(exp.Reference):
+        if isinstance(reference.this, exp.Table):
+            ctx.add_edge(key, ctx.add_node(reference.this))
+        elif isinstance(reference.this, exp.Schema) and isinstance(reference.this.this, exp.Table):
+            ctx.add_edge(key, ctx.add_node(reference.this.this))
+
+
+def _process_statement(ctx: ParseContext, statement: str) -> bool:
+    """Parses one statement dialect-neutrally and adds its nodes and edges. Returns True for relevant DDL."""
+    try:
+        expressions = sqlglot.parse(statement)
+    except SqlglotError:
+        return False
+    found_ddl = False
+    for expression in expressions:
+        if not isinstance(expression, (exp.Create, exp.Alter)):
+            continue
+        target = expression.this
+        if isinstance(target, exp.Schema):  # CREATE TABLE t (columns ...)
+            target = target.this
+        if not isinstance(target, exp.Table):
+            continue
+        definition = expression.sql()
+        if isinstance(expression, exp.Alter):
+            key = ctx.add_node(target, None, definition)
+        else:
+            kind = (expression.args.get("kind") or "TABLE").upper()
+            if kind not in ("TABLE", "VIEW"):
+                continue
+            materialized = any(isinstance(p, exp.MaterializedProperty) for p in expression.find_all(exp.Property))
+            node_type = "table" if kind == "TABLE" else "materialized_view" if materialized else "view"
+            key = ctx.add_node(target, node_type, definition)
+            query = expression.expression
+            if isinstance(query, exp.Query):  # View or CREATE TABLE ... AS SELECT
+                _add_query_edges(ctx, key, query)
+        _add_foreign_keys(ctx, key, expression)
+        found_ddl = True
+    return found_ddl
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses a plain ANSI SQL DDL file (or string) into (edges, node_types, stats).
+
+    The input is read one line at a time and split on ";" outside quotes and comments. Each
+    CREATE or ALTER statement is parsed with sqlglot's dialect-neutral parser; there is no
+    cleaning pass, no dialect-specific handling and no sqlfluff fix, and statements sqlglot
+    cannot parse are skipped. Memory is bounded by the largest statement.
+
+    Extracted:
+      - CREATE TABLE (type "table") with REFERENCES edges (local -> referenced), also from ALTER TABLE;
+      - CREATE [MATERIALIZED] VIEW and CREATE TABLE ... AS SELECT: source -> created object,
+        CTEs as "cte_view" nodes.
+
+    Raises:
+        InvalidSQLError: if no supported DDL statement was found.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    ctx = ParseContext()
+    splitter = StatementSplitter(dollar_quotes=False)
+    found_ddl = False
+
+    def _handle(statement: str) -> None:
+        nonlocal found_ddl
+        statement = statement[_LEADING_COMMENTS_RE.match(statement).end():]  # type: ignore[union-attr]
+        if _DDL_START_RE.match(statement):
+            found_ddl = _process_statement(ctx, statement) or found_ddl
+
+    with open_input(file_path_or_sql_string) as source:
+        for line in source:
+            for statement in splitter.feed(line):
+                _handle(statement)
+        trailing = splitter.flush()
+        if trailing:
+            _handle(trailing)
+
+    if not found_ddl:
+        raise InvalidSQLError("Invalid SQL or no relevant DDL statements found.")
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
@@ -1,90 +1,106 @@
-import json
+import hashlib
 import os
+import pickle
 import re
-from typing import List, Tuple, Dict, TypedDict, Union, Set, Any, Optional  # noqa: F401
+import sys
+from pathlib import Path
+from typing import List, Tuple, Dict, NamedTuple, TypedDict, Union, Set, Any, Optional  # noqa: F401
 
+from .. import path_utils
 from ..dataflow_structs import NodeInfo
 from ..dataflow_structs import SQL_PATTERNS
 from ..exceptions import InvalidSQLError
+from ..parse_cache import parser_version
+from .parser_utils import MappedInput, split_statements
 import sqlparse  # type: ignore
 
+_SQL_PATTERN_BYTES_RES = [re.compile(pattern.encode(), re.I) for pattern in SQL_PATTERNS]
+
+
+PARSER_VERSION = "4"  # Bump when parse results change, to invalidate the parse cache
+
+# Statement scans kept between runs for incremental parsing, one file per input path.
+INCREMENTAL_STATE_DIR = path_utils.DATA_FLOW_BASE_DIR / "cache" / "denodo_incremental"
+
+# Whitespace and comments that may separate a keyword from the name it introduces.
+_GAP = r"(?:\s|--[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z))+"
+_STRING = r"'[^']*(?:''[^']*)*'?"  # '...' with '' escapes; an unterminated string runs to the end
+_COMMENT = r"--[^\n]*|\#[^\n]*|/\*.*?(?:\*/|\Z)"
+
+# Single-pass VQL scanner. At every position the leftmost alternative wins, so keywords inside
+# string literals, quoted identifiers and comments are consumed as part of those and never seen.
+# Everything else (plain words, punctuation) is skipped by the regex engine without a Python call.
+_VQL_SCAN_RE = re.compile(
+    rf"""
+    (?P<string>{_STRING})
+    | (?P<comment>{_COMMENT})
+    | (?P<quoted>"[^"]*"?)
+    | \b(?:
+        SET{_GAP}IMPLEMENTATION{_GAP}(?P<implementation>[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)*)
+        | DESCRIPTION\s*=\s*'(?P<description>[^']*(?:''[^']*)*)'?
+        | (?:FROM(?:{_GAP}FLATTEN(?={_GAP}['A-Za-z0-9_]))?|JOIN|INTO|IMPLEMENTATION){_GAP}
+          (?!(?:SELECT|WITH|VALUES|LATERAL|UNNEST|TABLE)\b)
+          (?P<quote>')?(?P<reference>(?:[A-Za-z0-9_]+\.)?[A-Za-z0-9_]+)\b(?(quote)')
+    )
+    """,
+    re.VERBOSE | re.DOTALL | re.IGNORECASE,
+)
+_COMMENT_OR_STRING_RE = re.compile(rf"({_STRING})|{_COMMENT}", re.DOTALL)
+_DESCRIPTION_SOURCE_RE = re.compile(r"source>>(.*?)<<source", re.DOTALL | re.IGNORECASE)
 
 
-# Global variable declarations with updated type annotations
-database_stats: Dict[str, int] = {}
-node_types: Dict[str, "NodeInfo"] = {}
-edges: List[Tuple[str, str]] = []
-# Updated type annotation to support boolean values
-db_objects: Dict[str, Dict[str, Dict[str, Union[str, bool]]]] = {}
+def strip_vql_comments(vql_script: str) -> str:
+    """Removes --, # and /* */ comments outside string literals in a single pass."""
+    if "--" not in vql_script and "#" not in vql_script and "/*" not in vql_script:
+        return vql_script
+    return _COMMENT_OR_STRING_RE.sub(lambda m: m.group(1) or "", vql_script)
 
 
-# Restore find_script_dependencies closer to original, ensure context passing works
-def find_script_dependencies(
-    vql_script: str,
-    node_types: Dict[str, NodeInfo],  # Pass for context
-    db_objects: Dict[
-        str, Dict[str, Dict[str, Union[str, bool]]]
-    ],  # Updated type annotation
-) -> List[str]:
-    """Finds potential dependencies (tables/views) in FROM/JOIN clauses."""
-    dependencies: Set[str] = set()  # noqa: F841
-    statement = vql_script  # Process as single block
+def _description_sources(description: str) -> List[str]:
+    """Finds source>>name<<source markers in a DESCRIPTION value."""
+    sources = (s.strip().replace("'", "") for s in _DESCRIPTION_SOURCE_RE.findall(description))
+    return [source for source in sources if source]
 
-    comment_pattern = r"(--.*?$|/\*.*?\*/)"
-    statement_no_comments = re.sub(
-        comment_pattern, "", statement, flags=re.DOTALL | re.MULTILINE | re.IGNORECASE
-    )
 
-    # --- Description source extraction (Keep existing logic) ---
-    description_pattern = re.compile(
-        r"DESCRIPTION\s?=\s?'((?:[^']|'')*)'",
-        re.DOTALL | re.MULTILINE | re.IGNORECASE,
-    )
-    vql_descriptions = re.findall(description_pattern, statement_no_comments)
-    desc_sources_found: Set[str] = set()
-    for desc in vql_descriptions:
-        description_sources_pattern = re.compile(
-            r"source>>(.*?)<<source", re.DOTALL | re.MULTILINE | re.IGNORECASE
-        )
-        desc_sources = [
-            source.strip().replace("'", "")
-            for source in re.findall(description_sources_pattern, desc)
-        ]
-        desc_sources_found.update(ds for ds in desc_sources if ds)
-
-    statement_no_descriptions = re.sub(description_pattern, "", statement_no_comments)
-    # --- End Description source extraction ---
-
-    normalized_stmt = re.sub(r"\s+", " ", statement_no_descriptions).strip()
-
-    # Use the tried-and-tested comprehensive pattern for table references
-    table_pattern = re.compile(
-        r"""
-        \b(?:FROM(?:\s+FLATTEN)?|JOIN|INTO|IMPLEMENTATION)\s+ # Support FROM FLATTEN
-        (?:')?                    # Optional opening quote
-        (?!\s*SELECT\b|\s*WITH\b|\s*VALUES\b|\s*LATERAL\b|\s*UNNEST\b|\s*TABLE\b|\() # Negative lookahead
-        \s*
-        ((?:[a-zA-Z0-9_]+\.)?     # Optional database prefix
-         [a-zA-Z0-9_]+            # Table/view name
-        )
-        (?:')?                    # Optional closing quote
-        # Removed alias capture as it might interfere, rely on context post-match
-        # (?:\s+(?:AS\s+)? [a-zA-Z0-9_]+)?
-        \b # Use word boundary
-        """,
-        re.VERBOSE | re.IGNORECASE,
-    )
+class ScriptReferences(NamedTuple):
+    """Object references found in a VQL script, before database resolution."""
 
-    found_tables = set()
-    for match in table_pattern.finditer(normalized_stmt):
-        table_ref = match.group(1).strip()
-        # Original Skip SQL keywords check - reinstate if needed, be careful
-        # if table_ref.upper() not in ('SELECT', 'WITH', 'VALUES', 'LATERAL', 'UNNEST'):
-        if table_ref:  # Basic check for non-empty match
-            found_tables.add(table_ref)
+    tables: List[str]  # FROM/JOIN/INTO/IMPLEMENTATION targets, in order of appearance
+    implementations: List[str]  # SET IMPLEMENTATION targets
+    description_sources: List[str]  # source>>...<<source markers inside DESCRIPTION = '...'
 
-    # --- Resolve Dependencies ---
-    final_dependencies = set()
+
+def scan_script_references(vql_script: str) -> ScriptReferences:
+    """
+    Finds potential dependencies (tables/views) in FROM/JOIN clauses without resolving databases.
+    Comments, string literals and DESCRIPTION values are recognised by the scanner itself, so the
+    script is read exactly once; this is the expensive, context-free half of find_script_dependencies.
+    """
+    found_tables: Dict[str, None] = {}  # Ordered set, keeps output deterministic
+    implementations: List[str] = []
+    desc_sources_found: Dict[str, None] = {}
+
+    for match in _VQL_SCAN_RE.finditer(vql_script):
+        reference, implementation, description = match.group("reference", "implementation", "description")
+        if reference:
+            found_tables[reference] = None
+        elif implementation:
+            # SET IMPLEMENTATION db.view also reads from db.view.
+            found_tables[".".join(implementation.split(".")[:2])] = None
+            implementations.append(implementation)
+        elif description is not None:
+            desc_sources_found.update(dict.fromkeys(_description_sources(description)))
+
+    return ScriptReferences(list(found_tables), implementations, list(desc_sources_found))
+
+
+def resolve_references(
+    references: ScriptReferences,
+    node_types: Dict[str, NodeInfo],
+    db_objects: Dict[str, Dict[str, Dict[str, Union[str, bool]]]],
+) -> List[str]:
+    """Qualifies unqualified references with their database, using the objects seen so far."""
+    final_dependencies: Dict[str, None] = {}  # Ordered set
 
     def resolve_database(base_name: str) -> str:
         """Find the correct database for an object."""
@@ -109,123 +125,430 @@ def find_script_dependencies(
                 return matching_deps[0]
         return ""
 
-    for table_ref in found_tables:
+    for table_ref in references.tables:
         parts = table_ref.split(".")
         base_name = parts[-1]
         if len(parts) > 1:
-            final_dependencies.add(table_ref)
+            final_dependencies[table_ref] = None
         else:
             db = resolve_database(base_name)
             full_name = f"{db}.{base_name}" if db else base_name
-            final_dependencies.add(full_name)
+            final_dependencies[full_name] = None
 
-    # SET IMPLEMENTATION dependencies
-    imp_pattern = re.compile(
-        r"SET\s+IMPLEMENTATION\s+([a-zA-Z0-9_\.]+)", re.IGNORECASE | re.MULTILINE
-    )
-    final_dependencies.update(
-        m.strip() for m in imp_pattern.findall(statement_no_descriptions) if m.strip()
+    final_dependencies.update(dict.fromkeys(references.implementations))
+    final_dependencies.update(dict.fromkeys(references.description_sources))  # Add description sources
+
+    return list(dep for dep in final_dependencies if dep)
+
+
+# Restore find_script_dependencies closer to original, ensure context passing works
+def find_script_dependencies(
+    vql_script: str,
+    node_types: Dict[str, NodeInfo],  # Pass for context
+    db_objects: Dict[
+        str, Dict[str, Dict[str, Union[str, bool]]]
+    ],  # Updated type annotation
+) -> List[str]:
+    """Finds potential dependencies (tables/views) in FROM/JOIN clauses."""
+    return resolve_references(scan_script_references(vql_script), node_types, db_objects)
+
+
+class ParseContext:
+    """
+    Graph state of a single parse_dump call. Keeping it per call, instead of in module globals,
+    makes parse_dump reentrant, so several dumps can be parsed in one process or concurrently.
+    """
+
+    def __init__(self) -> None:
+        self.node_types: Dict[str, NodeInfo] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self._edge_set: Set[Tuple[str, str]] = set()
+        # database -> object name -> {"full_name", "type", "is_dependency"}
+        self.db_objects: Dict[str, Dict[str, Dict[str, Union[str, bool]]]] = {}
+
+    def add_edge(self, source: str, target: str) -> None:
+        """Adds a source -> target edge once, ignoring self references."""
+        edge = (source, target)
+        if source != target and edge not in self._edge_set:
+            self._edge_set.add(edge)
+            self.edges.append(edge)
+
+    def add_node(self, full_name: str, node_type: str, is_dependency: bool = False, definition: Optional[str] = None) -> str:
+        """Adds or updates node information, ensuring CTE type priority."""
+        if not full_name:
+            return ""
+        parts = full_name.split(".")
+        base_name = parts[-1]
+
+        # Determine database and effective name based on type
+        is_new_type_cte = node_type == "cte_view"
+        database = "" if is_new_type_cte else (parts[0] if len(parts) > 1 else "")
+        effective_full_name = base_name if is_new_type_cte else full_name
+
+        # Update db_objects (Only track non-CTE objects with a database)
+        if database and not is_new_type_cte:
+            self.db_objects.setdefault(database, {})
+            self.db_objects[database].setdefault(base_name, {})
+            if (
+                not self.db_objects[database][base_name].get("is_dependency", True)
+                or not is_dependency
+            ):
+                self.db_objects[database][base_name].update(
+                    {
+                        "full_name": effective_full_name,
+                        "type": node_type,
+                        "is_dependency": is_dependency,
+                    }
+                )
+
+        # Add/update node_types
+        if base_name not in self.node_types:
+            # New node - Add it directly
+            # Initialize with all required keys for NodeInfo, definition can be None
+            node_info_dict: NodeInfo = {
+                "type": node_type,
+                "database": database,
+                "full_name": effective_full_name,
+                "definition": None,
+            }
+            if definition and not is_dependency:
+                node_info_dict["definition"] = definition
+            self.node_types[base_name] = node_info_dict
+        else:
+            # Existing node - Check before updating
+            existing_info = self.node_types[base_name]
+            current_type = existing_info["type"]
+
+            # *** RULE 1: If the existing type is already 'cte_view', NEVER change it. ***
+            if current_type == "cte_view":
+                pass  # Do nothing, CTE type is final
+            # *** RULE 2: If the new type is 'cte_view', ALWAYS update to it. ***
+            elif is_new_type_cte:
+                existing_info["type"] = "cte_view"
+                existing_info["database"] = ""  # Reset database
+                existing_info["full_name"] = base_name  # Reset full name
+            # *** RULE 3: Neither current nor new is CTE, apply view/table priority. ***
+            else:
+                type_priority = {"unknown": 0, "table": 1, "view": 2}
+                new_prio = type_priority.get(node_type, 0)
+                curr_prio = type_priority.get(current_type, 0)
+
+                # Update only if new type is same or better priority
+                if new_prio >= curr_prio:
+                    existing_info["type"] = node_type
+                    # Update database only if we found one and didn't have one before
+                    if not existing_info["database"] and database:
+                        existing_info["database"] = database
+                        if (
+                            existing_info["full_name"] == base_name
+                        ):  # Update full_name if it was just base
+                            existing_info["full_name"] = effective_full_name
+            # Only set definition if not a dependency and not already set
+            if definition and not is_dependency and not existing_info.get("definition"):
+                existing_info["definition"] = definition
+
+        return base_name
+
+
+    def guess_type(self, name: str) -> str:
+        """Guesses node type based on name conventions or content."""
+        # Check known types FIRST
+        if name in self.node_types:
+            return self.node_types[name]["type"]
+        # Conventions
+        if name.startswith(("v_", "iv_", "rv_", "bv_", "wv_", "u_")):
+            return "view"
+        if name.startswith(("t_", "it_", "ft_", "i_")):
+            return "table"
+        # Fallback
+        return "view" if "view" in name.lower() else "table"
+
+
+# Statement-level patterns, compiled once per process.
+_CREATE_RE = re.compile(r"^\s*CREATE", re.IGNORECASE)
+_CREATE_VIEW_RE = re.compile(
+    r"CREATE(?: OR REPLACE)?(?:\s+INTERFACE)?\s+VIEW\s+([a-zA-Z0-9_\.]+)", re.IGNORECASE
+)
+_CREATE_TABLE_RE = re.compile(
+    r"CREATE(?: OR REPLACE)?(?:\s+\w+)?\s+TABLE\s+([a-zA-Z0-9_\.]+)", re.IGNORECASE
+)
+_SET_IMPLEMENTATION_RE = re.compile(r"SET\s+IMPLEMENTATION\s+([a-zA-Z0-9_\.]+)", re.IGNORECASE)
+_AS_RE = re.compile(r"\bAS\b", re.IGNORECASE)
+# Denodo prefixes some clauses with SQL, e.g. "SQL UNION ALL"
+_SQL_PREFIX_RE = re.compile(
+    r"\bSQL\s+(SELECT|FROM|WHERE|JOIN|UNION|ALL|GROUP|ORDER|BY|HAVING|AS)\b", re.IGNORECASE
+)
+_DATA_LOAD_QUERY_RE = re.compile(r"DATA_LOAD_QUERY\s?=\s?'([^']*(?:''[^']*)*)'", re.IGNORECASE)
+_DESCRIPTION_RE = re.compile(r"DESCRIPTION\s?=\s?'([^']*(?:''[^']*)*)'", re.IGNORECASE)
+_WITH_RE = re.compile(r"\s*WITH\b", re.IGNORECASE)
+_CTE_HEADER_RE = re.compile(r"([a-zA-Z0-9_]+)\s+AS\s*\(", re.IGNORECASE)
+_PAREN_RE = re.compile(r"[()]")
+_CTE_NEXT_MARKER_RE = re.compile(
+    r"\s*,|\s*\bSELECT\b|\s*\bINSERT\b|\s*\bUPDATE\b|\s*\bDELETE\b", re.IGNORECASE
+)
+
+
+class StatementScan(NamedTuple):
+    """Everything parse_dump extracts from one CREATE statement that does not depend on other statements."""
+
+    target_full_name: str
+    target_type: str
+    definition: str
+    implementation_name: Optional[str]
+    cte_references: List[Tuple[str, ScriptReferences]]  # (cte_name, references in its body)
+    main_references: Optional[ScriptReferences]
+    description_sources: List[str]
+
+
+def scan_statement(raw_stmt: str) -> Optional[StatementScan]:
+    """
+    Extracts the target object, CTEs and raw references of one statement.
+    Returns None for statements that do not create a view or table.
+    """
+    if not _CREATE_RE.match(raw_stmt):
+        return None
+
+    clean_stmt = strip_vql_comments(raw_stmt).strip()
+    if not clean_stmt:
+        return None
+
+    view_match = _CREATE_VIEW_RE.search(clean_stmt)
+    table_match = None if view_match else _CREATE_TABLE_RE.search(clean_stmt)
+
+    # Fix for line 294 - Add proper null check
+    if view_match:
+        target_full_name = view_match.group(1)
+        target_type = "view"
+    elif table_match:
+        target_full_name = table_match.group(1)
+        target_type = "table"
+    else:
+        return None
+
+    # Always check for SET IMPLEMENTATION for any view
+    implementation_name = None
+    if target_type == "view":
+        imp_match = _SET_IMPLEMENTATION_RE.search(clean_stmt)
+        if imp_match:
+            implementation_name = imp_match.group(1).strip() or None
+
+    scan = StatementScan(
+        target_full_name=target_full_name,
+        target_type=target_type,
+        definition=clean_stmt,
+        implementation_name=implementation_name,
+        cte_references=[],
+        main_references=None,
+        description_sources=[],
     )
 
-    final_dependencies.update(desc_sources_found)  # Add description sources
+    # --- Extract Definition Part ---
+    definition_part = None
+    as_match = _AS_RE.search(clean_stmt)
+    if as_match:
+        definition_part = clean_stmt[as_match.end() :].strip()
+
+        # Pre-process Denodo-specific prefixes like "SQL UNION ALL"
+        definition_part = _SQL_PREFIX_RE.sub(r"\1", definition_part)
+    elif target_type == "table":
+        load_query_match = _DATA_LOAD_QUERY_RE.search(clean_stmt)
+        if load_query_match:
+            definition_part = load_query_match.group(1).replace("''", "'")
+    if not definition_part:
+        return scan
+    # --- End Extract Definition Part ---
+
+    # === START: Focused CTE Handling ===
+    ctes_info: Dict[str, str] = {}  # Dict {cte_name: cte_body}, in definition order
+    main_query_part = definition_part  # Default: assume no CTEs
+    last_cte_end = 0  # Track end of CTE block
+
+    # Robust CTE parsing using parenthesis balancing
+    with_match = _WITH_RE.match(definition_part)
+    if with_match:
+        current_pos = with_match.end()
+        while current_pos < len(definition_part):
+            # Find the next 'cte_name AS (' - start search from current_pos
+            cte_header_match = _CTE_HEADER_RE.search(definition_part, current_pos)
+            if not cte_header_match:
+                break  # No more CTEs
+
+            cte_name = cte_header_match.group(1)
+            # Calculate absolute index for parenthesis start
+            paren_start_index = cte_header_match.end()
+            open_paren_count = 1
+            cte_body_end = -1
+
+            # Find matching closing parenthesis for this CTE body
+            for paren in _PAREN_RE.finditer(definition_part, paren_start_index):
+                if paren.group() == "(":
+                    open_paren_count += 1
+                else:
+                    open_paren_count -= 1
+                    if open_paren_count == 0:
+                        cte_body_end = paren.start()
+                        break
+            else:
+                print(
+                    f"Warning: Could not find matching ')' for CTE '{cte_name}' in statement for '{target_full_name}'."
+                )
+                break  # Stop processing CTEs
 
-    return list(dep for dep in final_dependencies if dep)
+            cte_body = definition_part[paren_start_index:cte_body_end].strip()
+            ctes_info[cte_name] = cte_body
 
+            # Find next relevant position (comma or main query start)
+            search_after_cte_body_pos = cte_body_end + 1
+            next_marker_match = _CTE_NEXT_MARKER_RE.search(
+                definition_part, search_after_cte_body_pos
+            )
 
-def add_node(full_name: str, node_type: str, is_dependency: bool = False, definition: Optional[str] = None) -> str:
-    """Adds or updates node information, ensuring CTE type priority."""
-    if not full_name:
-        return ""
-    parts = full_name.split(".")
-    base_name = parts[-1]
-
-    # Determine database and effective name based on type
-    is_new_type_cte = node_type == "cte_view"
-    database = "" if is_new_type_cte else (parts[0] if len(parts) > 1 else "")
-    effective_full_name = base_name if is_new_type_cte else full_name
-
-    # Update db_objects (Only track non-CTE objects with a database)
-    if database and not is_new_type_cte:
-        db_objects.setdefault(database, {})
-        db_objects[database].setdefault(base_name, {})
-        if (
-            not db_objects[database][base_name].get("is_dependency", True)
-            or not is_dependency
-        ):
-            db_objects[database][base_name].update(
-                {
-                    "full_name": effective_full_name,
-                    "type": node_type,
-                    "is_dependency": is_dependency,
-                }
+            if next_marker_match and next_marker_match.group().strip() == ",":
+                # Move current_pos past the comma
+                current_pos = next_marker_match.end()
+            else:
+                # Assume end of CTE block, main query starts after this CTE's body
+                last_cte_end = search_after_cte_body_pos
+                break  # Exit CTE finding loop
+
+        # Determine main_query_part based on parsing results
+        if last_cte_end > 0:
+            main_query_part = definition_part[last_cte_end:].strip()
+        # Handle cases where WITH exists but parsing didn't find CTEs or end properly
+        elif not ctes_info:
+            main_query_part = definition_part[with_match.end() :].strip()
+        else:  # Parsing finished but didn't hit SELECT etc.
+            # This might mean the query ONLY contained CTEs? Unlikely but possible.
+            # Or the logic to find the end of the last CTE needs refinement.
+            # For now, assume main query starts after where we stopped searching.
+            main_query_part = definition_part[current_pos:].strip()
+    # === END: Focused CTE Handling ===
+
+    # --- Description Sources ---
+    description_sources = [
+        source for desc in _DESCRIPTION_RE.findall(clean_stmt) for source in _description_sources(desc)
+    ]
+
+    return scan._replace(
+        cte_references=[
+            (cte_name, scan_script_references(cte_body))
+            for cte_name, cte_body in ctes_info.items()
+        ],
+        main_references=scan_script_references(main_query_part) if main_query_part else None,
+        description_sources=description_sources,
+    )
+
+
+def _apply_scan(scan: StatementScan, ctx: ParseContext) -> None:
+    """Registers the nodes and edges of one scanned statement, resolving names against earlier ones."""
+    target_base_name = ctx.add_node(
+        scan.target_full_name, scan.target_type, is_dependency=False, definition=scan.definition
+    )
+    if not target_base_name:
+        return
+
+    if scan.implementation_name:
+        actual_dep_base = ctx.add_node(
+            scan.implementation_name, ctx.guess_type(scan.implementation_name), is_dependency=True
+        )
+        if actual_dep_base:
+            ctx.add_edge(actual_dep_base, target_base_name)
+
+    defined_cte_names = {cte_name for cte_name, _ in scan.cte_references}
+
+    # 1. Add CTE nodes first with the correct type
+    for cte_name, _ in scan.cte_references:
+        # Call add_node with 'cte_view'. The new logic ensures this type is prioritized.
+        ctx.add_node(cte_name, "cte_view")
+
+    # 2. Process dependencies *inside* each CTE body
+    for cte_name, cte_refs in scan.cte_references:
+        # Resolve against everything the earlier statements declared
+        for dep_full_name in resolve_references(cte_refs, ctx.node_types, ctx.db_objects):
+            dep_base_name = dep_full_name.split(".")[-1]
+            is_dep_a_cte = dep_base_name in defined_cte_names
+            # Get type using guess_type AFTER potentially adding the node
+            # Call add_node first to ensure the dependency node exists
+            actual_dep_base = ctx.add_node(
+                dep_full_name,
+                ctx.guess_type(dep_base_name) if not is_dep_a_cte else "cte_view",
+                is_dependency=True,
             )
+            if not actual_dep_base:
+                continue
+
+            # Create edge: dependency -> current CTE
+            ctx.add_edge(actual_dep_base, cte_name)
+
+    # 3. Process dependencies in the main query part
+    if scan.main_references is not None:
+        # Resolve against everything the earlier statements declared
+        for dep_full_name in resolve_references(scan.main_references, ctx.node_types, ctx.db_objects):
+            dep_base_name = dep_full_name.split(".")[-1]
+            is_dep_a_cte = dep_base_name in defined_cte_names
+
+            # If dependency is a CTE, source is just the name.
+            # If not, ensure the node exists and get its base name.
+            if is_dep_a_cte:
+                edge_source_base_name = dep_base_name  # Already added as cte_view
+            else:
+                # Ensure the base table/view dependency node exists
+                edge_source_base_name = ctx.add_node(
+                    dep_full_name, ctx.guess_type(dep_base_name), is_dependency=True
+                )
 
-    # Add/update node_types
-    if base_name not in node_types:
-        # New node - Add it directly
-        # Initialize with all required keys for NodeInfo, definition can be None
-        node_info_dict: NodeInfo = {
-            "type": node_type,
-            "database": database,
-            "full_name": effective_full_name,
-            "definition": None,
-        }
-        if definition and not is_dependency:
-            node_info_dict["definition"] = definition
-        node_types[base_name] = node_info_dict
-    else:
-        # Existing node - Check before updating
-        existing_info = node_types[base_name]
-        current_type = existing_info["type"]
-
-        # *** RULE 1: If the existing type is already 'cte_view', NEVER change it. ***
-        if current_type == "cte_view":
-            pass  # Do nothing, CTE type is final
-        # *** RULE 2: If the new type is 'cte_view', ALWAYS update to it. ***
-        elif is_new_type_cte:
-            existing_info["type"] = "cte_view"
-            existing_info["database"] = ""  # Reset database
-            existing_info["full_name"] = base_name  # Reset full name
-        # *** RULE 3: Neither current nor new is CTE, apply view/table priority. ***
-        else:
-            type_priority = {"unknown": 0, "table": 1, "view": 2}
-            new_prio = type_priority.get(node_type, 0)
-            curr_prio = type_priority.get(current_type, 0)
-
-            # Update only if new type is same or better priority
-            if new_prio >= curr_prio:
-                existing_info["type"] = node_type
-                # Update database only if we found one and didn't have one before
-                if not existing_info["database"] and database:
-                    existing_info["database"] = database
-                    if (
-                        existing_info["full_name"] == base_name
-                    ):  # Update full_name if it was just base
-                        existing_info["full_name"] = effective_full_name
-        # Only set definition if not a dependency and not already set
-        if definition and not is_dependency and not existing_info.get("definition"):
-            existing_info["definition"] = definition
-
-    return base_name
-
-
-def guess_type(name: str) -> str:
-    """Guesses node type based on name conventions or content."""
-    # Check known types FIRST
-    if name in node_types:
-        return node_types[name]["type"]
-    # Conventions
-    if name.startswith(("v_", "iv_", "rv_", "bv_", "wv_", "u_")):
-        return "view"
-    if name.startswith(("t_", "it_", "ft_", "i_")):
-        return "table"
-    # Fallback
-    return "view" if "view" in name.lower() else "table"
+            if not edge_source_base_name:
+                continue
+
+            # Create edge: dependency (or CTE) -> main target
+            ctx.add_edge(edge_source_base_name, target_base_name)
+
+    # --- Process Description Sources ---
+    for source_full in scan.description_sources:
+        if source_full:
+            dep_base = source_full.split(".")[-1]
+            if dep_base not in defined_cte_names:  # Check against CTEs
+                actual_dep_base = ctx.add_node(
+                    source_full, ctx.guess_type(dep_base), is_dependency=True
+                )
+                if actual_dep_base:
+                    ctx.add_edge(actual_dep_base, target_base_name)
+
+
+def _incremental_state_path(file_path: Union[str, os.PathLike]) -> Optional[Path]:
+    """Per-file location of the statement scans kept between incremental runs."""
+    if not isinstance(file_path, (str, os.PathLike)) or not os.path.isfile(file_path):
+        return None  # Raw VQL strings have no identity to track between runs.
+    path_hash = hashlib.sha256(os.path.abspath(file_path).encode("utf-8")).hexdigest()
+    return INCREMENTAL_STATE_DIR / f"{path_hash}.pkl"
+
+
+def _load_incremental_state(state_path: Path) -> Dict[str, Optional[StatementScan]]:
+    """Loads the previous run's scans, discarding them if they came from another parser version."""
+    try:
+        with open(state_path, "rb") as f:
+            version, scans = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError, ImportError):
+        return {}
+    return scans if version == parser_version(sys.modules[__name__]) else {}
+
+
+def _save_incremental_state(state_path: Path, scans: Dict[str, Optional[StatementScan]]) -> None:
+    """Stores the scans of the current statements; scans of deleted statements are dropped."""
+    try:
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((parser_version(sys.modules[__name__]), scans), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, state_path)
+    except OSError as e:
+        print(f"Warning: Could not save incremental parse state: {e}")
 
 
 # Fix for lines near 294 - Adding proper None check before accessing .group()
 def parse_dump(
     file_path: Union[str, os.PathLike],
+    incremental: bool = False,
 ) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
     """
     Parses a SQL/VQL input to extract object definitions, dependencies,
@@ -239,9 +562,12 @@ def parse_dump(
     Parameters:
         file_path (Union[str, os.PathLike]):
             Either a file path pointing to a SQL/VQL file, or a string containing SQL/VQL content.
-            The function attempts to open and read the file. In case of file I/O errors,
-            it treats the provided file_path as direct SQL/VQL content, unless it is an invalid type,
-            in which case a ValueError is raised.
+            An existing file is memory-mapped and split one line at a time, so it is never decoded as
+            a whole; any other string is treated as direct SQL/VQL content. Other types raise ValueError.
+        incremental (bool):
+            When True and file_path is a file, the per-statement scans of the previous run are reused and
+            only statements whose text changed are rescanned. The graph is always rebuilt from all scans in
+            file order, so the result is identical to a full parse.
 
     Returns:
         Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
@@ -263,7 +589,7 @@ def parse_dump(
             If the provided file_path is neither a valid file path nor a string containing SQL/VQL content.
 
     Detailed Description:
-        1. The function attempts to read the input content from a file. On failure, it checks if the input is a string.
+        1. The function maps the input file (see MappedInput), or wraps the input string.
         2. It validates the content by ensuring that it is non-empty and contains common SQL keywords; if not, an error is raised.
         3. The content is split into individual SQL statements which are then cleaned of comments.
         4. For each statement, the function searches for CREATE statements related to views or tables.
@@ -279,304 +605,57 @@ def parse_dump(
            sorts the node information, and returns the dependency edges, node definitions, and statistics.
 
     Note:
-        This function uses helper functions such as add_node and guess_type to manage node registration and determine
+        All graph state lives in a ParseContext created per call, so concurrent or back-to-back calls do not
+        share nodes. ParseContext.add_node and ParseContext.guess_type manage node registration and determine
         object types based on naming conventions or context. It also leverages regular expressions extensively for parsing.
     """
-    try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            content = file.read()
-    except (FileNotFoundError, OSError, TypeError):
-        if isinstance(file_path, str):
-            content = file_path
-        else:
-            raise ValueError("Invalid input: must be a file path or a string.")
-
-    if not content or not any(
-        re.search(pattern, content, re.I) for pattern in SQL_PATTERNS
-    ):
-        raise InvalidSQLError(
-            "Invalid SQL/VQL: No common SQL keywords found or content empty."
-        )
-
-    # Reset globals for each parse call if necessary (or manage scope differently)
-    # These might be better as instance variables if part of a class, or passed around more explicitly
-    global database_stats, node_types, edges, db_objects
-    database_stats = {}
-    node_types = {}
-    edges = []
-    db_objects = {}
-
-    raw_statements = [
-        s.strip()
-        for s in re.split(r";(?=(?:[^']*'[^']*')*[^']*$)", content)
-        if s.strip()
-    ]
-
-    for raw_stmt in raw_statements:
-        if not re.match(r"^\s*CREATE", raw_stmt, re.IGNORECASE):
-            continue
-
-        comment_pattern = r"(--.*?$|/\*.*?\*/|#.*?$)"
-        clean_stmt = re.sub(
-            comment_pattern,
-            "",
-            raw_stmt,
-            flags=re.DOTALL | re.MULTILINE | re.IGNORECASE,
-        ).strip()
-        if not clean_stmt:
-            continue
-
-        view_pattern = re.compile(
-            r"CREATE(?: OR REPLACE)?(?:\s+INTERFACE)?\s+VIEW\s+([a-zA-Z0-9_\.]+)",
-            re.IGNORECASE | re.DOTALL,
-        )
-        table_pattern = re.compile(
-            r"CREATE(?: OR REPLACE)?(?:\s+\w+)?\s+TABLE\s+([a-zA-Z0-9_\.]+)",
-            re.IGNORECASE | re.DOTALL,
-        )
-        view_match = view_pattern.search(clean_stmt)
-        table_match = table_pattern.search(clean_stmt)
-
-        if not (view_match or table_match):
-            continue
-
-        # Fix for line 294 - Add proper null check
-        target_full_name = ""
-        if view_match:
-            target_full_name = view_match.group(1)
-            target_type = "view"
-        elif table_match:
-            target_full_name = table_match.group(1)
-            target_type = "table"
-        else:
-            continue
-
-        target_base_name = add_node(target_full_name, target_type, is_dependency=False, definition=clean_stmt)
-        if not target_base_name:
-            continue
+    if isinstance(file_path, (str, os.PathLike)) and os.path.isfile(file_path):
+        source = MappedInput.open(file_path)
+    elif isinstance(file_path, str):
+        source = MappedInput.from_string(file_path)
+    else:
+        raise ValueError("Invalid input: must be a file path or a string.")
 
-        # Always check for SET IMPLEMENTATION for any view
-        if target_type == "view":
-            imp_pattern = re.compile(
-                r"SET\s+IMPLEMENTATION\s+([a-zA-Z0-9_\.]+)", re.IGNORECASE | re.MULTILINE
-            )
-            imp_match = imp_pattern.search(clean_stmt)
-            if imp_match:
-                implementation_name = imp_match.group(1).strip()
-                if implementation_name:
-                    actual_dep_base = add_node(
-                        implementation_name, guess_type(implementation_name), is_dependency=True
-                    )
-                    if actual_dep_base:
-                        edge = (actual_dep_base, target_base_name)
-                        if edge not in edges and actual_dep_base != target_base_name:
-                            edges.append(edge)
-
-        # --- Extract Definition Part ---
-        definition_part = None
-        as_match = re.search(r"\bAS\b", clean_stmt, re.IGNORECASE)
-        if as_match:
-            definition_part = clean_stmt[as_match.end() :].strip()
-
-            # Pre-process Denodo-specific prefixes like "SQL UNION ALL"
-            definition_part = re.sub(
-                r'\bSQL\s+(SELECT|FROM|WHERE|JOIN|UNION|ALL|GROUP|ORDER|BY|HAVING|AS)\b',
-                r'\1',
-                definition_part,
-                flags=re.IGNORECASE,
+    with source:
+        # The keyword check runs on the mapped bytes, so the file is never decoded as a whole.
+        if not len(source) or not any(source.search(pattern) for pattern in _SQL_PATTERN_BYTES_RES):
+            raise InvalidSQLError(
+                "Invalid SQL/VQL: No common SQL keywords found or content empty."
             )
-        elif target_type == "table":
-            query_pattern = re.compile(
-                r"DATA_LOAD_QUERY\s?=\s?'((?:[^']|'')*)'",
-                re.IGNORECASE | re.MULTILINE | re.DOTALL,
-            )
-            load_query_match = query_pattern.search(clean_stmt)
-            if load_query_match:
-                definition_part = load_query_match.group(1).replace("''", "'")
-        if not definition_part:
-            continue
-        # --- End Extract Definition Part ---
-
-        # === START: Focused CTE Handling ===
-        ctes_info = {}  # Dict {cte_name: cte_body}
-        main_query_part = definition_part  # Default: assume no CTEs
-        defined_cte_names = set()
-        last_cte_end = 0  # Track end of CTE block
-
-        # Robust CTE parsing using parenthesis balancing
-        with_match = re.match(r"\s*WITH\b", definition_part, re.IGNORECASE)
-        if with_match:
-            current_pos = with_match.end()
-            while current_pos < len(definition_part):
-                # Find the next 'cte_name AS (' - start search from current_pos
-                cte_header_match = re.search(
-                    r"([a-zA-Z0-9_]+)\s+AS\s*\(",
-                    definition_part[current_pos:],
-                    re.IGNORECASE,
-                )
-                if not cte_header_match:
-                    break  # No more CTEs
-
-                cte_name = cte_header_match.group(1)
-                # Calculate absolute index for parenthesis start
-                paren_start_index = current_pos + cte_header_match.end()
-                open_paren_count = 1
-                cte_body_end = -1
-
-                # Find matching closing parenthesis for this CTE body
-                for i in range(paren_start_index, len(definition_part)):
-                    char = definition_part[i]
-                    if char == "(":
-                        open_paren_count += 1
-                    elif char == ")":
-                        open_paren_count -= 1
-                        if open_paren_count == 0:
-                            cte_body_end = i
-                            break
-                else:
-                    print(
-                        f"Warning: Could not find matching ')' for CTE '{cte_name}' in statement for '{target_base_name}'."
-                    )
-                    break  # Stop processing CTEs
-
-                cte_body = definition_part[paren_start_index:cte_body_end].strip()
-                ctes_info[cte_name] = cte_body
-                defined_cte_names.add(cte_name)
-
-                # Find next relevant position (comma or main query start)
-                search_after_cte_body_pos = cte_body_end + 1
-                next_marker_match = re.search(
-                    r"\s*,|\s*\bSELECT\b|\s*\bINSERT\b|\s*\bUPDATE\b|\s*\bDELETE\b",
-                    definition_part[search_after_cte_body_pos:],
-                    re.IGNORECASE | re.DOTALL,
-                )
 
-                if next_marker_match and next_marker_match.group().strip() == ",":
-                    # Move current_pos past the comma
-                    current_pos = search_after_cte_body_pos + next_marker_match.end()
-                else:
-                    # Assume end of CTE block, main query starts after this CTE's body
-                    last_cte_end = search_after_cte_body_pos
-                    break  # Exit CTE finding loop
-
-            # Determine main_query_part based on parsing results
-            if last_cte_end > 0:
-                main_query_part = definition_part[last_cte_end:].strip()
-            # Handle cases where WITH exists but parsing didn't find CTEs or end properly
-            elif with_match and not defined_cte_names:
-                main_query_part = definition_part[with_match.end() :].strip()
-            elif (
-                with_match and last_cte_end == 0
-            ):  # Parsing finished but didn't hit SELECT etc.
-                # This might mean the query ONLY contained CTEs? Unlikely but possible.
-                # Or the logic to find the end of the last CTE needs refinement.
-                # For now, assume main query starts after where we stopped searching.
-                main_query_part = definition_part[current_pos:].strip()
-
-        # 1. Add CTE nodes first with the correct type
-        for cte_name in defined_cte_names:
-            # Call add_node with 'cte_view'. The new logic ensures this type is prioritized.
-            add_node(cte_name, "cte_view")
-
-        # 2. Process dependencies *inside* each CTE body
-        for cte_name, cte_body in ctes_info.items():
-            # Pass the GLOBAL node_types and db_objects for context
-            cte_deps_full = find_script_dependencies(cte_body, node_types, db_objects)
-            for dep_full_name in cte_deps_full:
-                dep_base_name = dep_full_name.split(".")[-1]
-                is_dep_a_cte = dep_base_name in defined_cte_names
-                # Get type using guess_type AFTER potentially adding the node
-                # Call add_node first to ensure the dependency node exists
-                actual_dep_base = add_node(
-                    dep_full_name,
-                    guess_type(dep_base_name) if not is_dep_a_cte else "cte_view",
-                    is_dependency=True,
-                )
-                if not actual_dep_base:
-                    continue
-
-                # Create edge: dependency -> current CTE
-                edge = (actual_dep_base, cte_name)
-                if edge not in edges and actual_dep_base != cte_name:
-                    edges.append(edge)
-
-        # 3. Process dependencies in the main query part
-        if main_query_part:
-            # Pass the GLOBAL node_types and db_objects for context
-            main_deps_full = find_script_dependencies(
-                main_query_part, node_types, db_objects
-            )
-            for dep_full_name in main_deps_full:
-                dep_base_name = dep_full_name.split(".")[-1]
-                is_dep_a_cte = dep_base_name in defined_cte_names
-
-                # If dependency is a CTE, source is just the name.
-                # If not, ensure the node exists and get its base name.
-                if is_dep_a_cte:
-                    edge_source_base_name = dep_base_name  # Already added as cte_view
-                else:
-                    # Ensure the base table/view dependency node exists
-                    edge_source_base_name = add_node(
-                        dep_full_name, guess_type(dep_base_name), is_dependency=True
-                    )
+        ctx = ParseContext()
 
-                if not edge_source_base_name:
-                    continue
+        # VQL has no dollar quoting, and '#' starts a comment (export headers use it).
+        raw_statements = split_statements(source, dollar_quotes=False, hash_comments=True)
 
-                # Create edge: dependency (or CTE) -> main target
-                edge = (edge_source_base_name, target_base_name)
-                if edge not in edges and edge_source_base_name != target_base_name:
-                    edges.append(edge)
+        state_path = _incremental_state_path(file_path) if incremental else None
+        previous_scans = _load_incremental_state(state_path) if state_path else {}
+        scans: Dict[str, Optional[StatementScan]] = {}
+        rescanned = statement_count = 0
 
-        # === END: Focused CTE Handling ===
+        for raw_stmt in raw_statements:
+            statement_count += 1
+            fingerprint = hashlib.sha256(raw_stmt.encode("utf-8")).hexdigest()
+            if fingerprint in scans:
+                scan = scans[fingerprint]
+            elif fingerprint in previous_scans:
+                scan = previous_scans[fingerprint]
+            else:
+                scan = scan_statement(raw_stmt)
+                rescanned += 1
+            scans[fingerprint] = scan
+            if scan is not None:
+                _apply_scan(scan, ctx)
 
-        # --- Process Description Sources (Remains the same) ---
-        description_pattern = re.compile(
-            r"DESCRIPTION\s?=\s?'((?:[^']|'')*)'",
-            re.DOTALL | re.MULTILINE | re.IGNORECASE,
-        )
-        # ... (rest of description source logic remains unchanged) ...
-        descriptions = re.findall(description_pattern, clean_stmt)
-        for desc in descriptions:
-            description_sources_pattern = re.compile(
-                r"source>>(.*?)<<source", re.DOTALL | re.MULTILINE | re.IGNORECASE
-            )
-            desc_sources = [
-                s.strip().replace("'", "")
-                for s in re.findall(description_sources_pattern, desc)
-            ]
-            for source_full in desc_sources:
-                if source_full:
-                    dep_base = source_full.split(".")[-1]
-                    if dep_base not in defined_cte_names:  # Check against CTEs
-                        actual_dep_base = add_node(
-                            source_full, guess_type(dep_base), is_dependency=True
-                        )
-                        if actual_dep_base:
-                            edge = (actual_dep_base, target_base_name)
-                            if (
-                                edge not in edges
-                                and actual_dep_base != target_base_name
-                            ):
-                                edges.append(edge)
+    if state_path:
+        print(f"Incremental parse: rescanned {rescanned} of {statement_count} statements.")
+        _save_incremental_state(state_path, scans)
 
     # --- Finalize and Calculate Stats ---
-    # Use the final GLOBAL node_types to calculate stats
     final_database_stats: Dict[str, int] = {}
-    for node_name, node_info in node_types.items():
+    for node_name, node_info in ctx.node_types.items():
         db = node_info.get("database")
         if db and node_info.get("type") != "cte_view":
             final_database_stats[db] = final_database_stats.get(db, 0) + 1
 
-    # Ensure json_structure directory exists before writing files
-    json_dir = "json_structure"
-    if not os.path.exists(json_dir):
-        os.makedirs(json_dir)
-    # Write edges and nodes to json dump
-    with open("json_structure/edges.json", "w", encoding="utf-8") as f:
-        json.dump(edges, f, indent=4)
-    with open("json_structure/node_types.json", "w", encoding="utf-8") as f:
-        json.dump(dict(sorted(node_types.items())), f, indent=4)
-
-    # Return the final GLOBAL edges and sorted node_types
-    return edges, dict(sorted(node_types.items())), final_database_stats
+    return ctx.edges, dict(sorted(ctx.node_types.items())), final_database_stats
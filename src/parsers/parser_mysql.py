@@ -0,0 +1,250 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from ..dataflow_structs import NodeInfo, InvalidSQLError
+from .parser_utils import GraphContext, StatementSplitter, compute_stats, open_input, scan_references
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+# Lines mysqldump emits for table data. At a statement boundary they are recognised in the mapped
+# bytes and skipped without being decoded, split or tokenized; they hold nearly all of the bytes
+# of a dump.
+_DATA_LINE_PREFIXES = (b"INSERT ", b"REPLACE ", b"LOCK TABLES ", b"UNLOCK TABLES", b"/*!40000 ALTER TABLE ")
+_HEADER_DATABASE_RE = re.compile(r"^--\s+Host:.*?\bDatabase:\s*(\S+)")
+
+_IDENT = r"(?:`(?:[^`]|``)+`|[A-Za-z0-9_$]+)"
+_NAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+_IDENT_RE = re.compile(_IDENT)
+
+_VERSIONED_COMMENT_RE = re.compile(r"/\*!\d*\s?(.*?)\*/", re.DOTALL)
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|(?:--|#)[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+_USE_RE = re.compile(rf"USE\s+(?P<db>{_IDENT})\s*\Z", re.IGNORECASE)
+_CREATE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:ALGORITHM\s*=\s*\w+\s+)?(?:DEFINER\s*=\s*\S+\s+)?"
+    r"(?:SQL\s+SECURITY\s+\w+\s+)?(?:TEMPORARY\s+)?(?:AGGREGATE\s+)?"
+    rf"(?P<kind>TABLE|VIEW|TRIGGER|PROCEDURE|FUNCTION)\s+(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>{_NAME})",
+    re.IGNORECASE,
+)
+_ALTER_TABLE_RE = re.compile(rf"ALTER\s+(?:ONLINE\s+)?(?:IGNORE\s+)?TABLE\s+(?P<name>{_NAME})", re.IGNORECASE)
+_KEYS_TOGGLE_RE = re.compile(r"\b(?:DIS|EN)ABLE\s+KEYS\b", re.IGNORECASE)
+_TRIGGER_EVENT_RE = re.compile(
+    rf"\s+(?:BEFORE|AFTER)\s+(?:INSERT|UPDATE|DELETE)\s+ON\s+(?P<table>{_NAME})\s+FOR\s+EACH\s+ROW\b",
+    re.IGNORECASE,
+)
+
+_STRING = r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\""
+_COMMENT = r"--[^\n]*|#[^\n]*|/\*.*?\*/"
+# Table references in CREATE/ALTER TABLE text; strings are matched first so COMMENT '...' is skipped.
+_REFERENCES_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bREFERENCES\s+(?P<ref>{_NAME})", re.IGNORECASE | re.DOTALL)
+# Reads and writes in routine and trigger bodies, in one pass. Strings, comments and the
+# FROM inside EXTRACT(... FROM x)-style calls are consumed without producing a reference.
+_BODY_SCAN_RE = re.compile(
+    rf"""
+      {_STRING}
+    | {_COMMENT}
+    | \b(?:EXTRACT|TRIM|SUBSTRING|SUBSTR|POSITION)\s*\((?:[^()]|\([^()]*\))*\)
+    | \b(?:INSERT\s+(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE)\s+)*(?:INTO\s+)?|REPLACE\s+(?:INTO\s+)?|DELETE\s+FROM\s+)
+        (?P<write>{_NAME})
+    | \bUPDATE\s+(?P<update>{_NAME})(?=\s+(?:(?!SET\b)\w+\s+)?SET\b)
+    | \b(?:FROM|JOIN)\s+(?P<read>{_NAME})
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_NOT_TABLES = {"dual", "new", "old"}
+
+
+def _split_name(name: str, default_db: Optional[str]) -> Tuple[Optional[str], str]:
+    """Splits a possibly backtick-quoted `db`.`name` reference into (database, name)."""
+    parts = [part[1:-1].replace("``", "`") if part.startswith("`") else part for part in _IDENT_RE.findall(name)]
+    if len(parts) == 1:
+        return default_db, parts[0]
+    return parts[-2], parts[-1]
+
+
+class ParseContext(GraphContext[NodeInfo]):
+    """Graph under construction for one parse_dump call. Node keys are "db.name", or "name" without a db."""
+
+    def __init__(self, database: Optional[str] = None) -> None:
+        super().__init__()
+        self.database = database  # Current database, from the dump header or the last USE
+
+    def add_node(self, name: str, node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node for a (possibly qualified) name and returns its key. A defining statement
+        (node_type given) sets the type and definition; a bare reference only creates a table node
+        if the object was not seen yet, so a view referenced before its CREATE VIEW ends up a view.
+        """
+        database, base_name = _split_name(name, self.database)
+        return self.add_qualified_node(database, base_name, node_type, definition)
+
+    def add_qualified_node(
+        self, database: Optional[str], name: str, node_type: Optional[str] = None, definition: Optional[str] = None
+    ) -> str:
+        key = f"{database}.{name}" if database else name
+        return self.upsert_node(key, database or "", node_type, definition)
+
+
+def _scan_body(body: str) -> Tuple[List[str], List[str]]:
+    """Returns the (read, written) table names referenced by a routine or trigger body, in order."""
+    reads: List[str] = []
+    writes: List[str] = []
+    for group, name in scan_references(_BODY_SCAN_RE, body):
+        (reads if group == "read" else writes).append(name)
+    return reads, writes
+
+
+def _add_body_edges(ctx: ParseContext, key: str, body: str) -> None:
+    reads, writes = _scan_body(body)
+    for name in reads:
+        if _split_name(name, None)[1].lower() not in _NOT_TABLES:
+            ctx.add_edge(ctx.add_node(name), key)
+    for name in writes:
+        ctx.add_edge(key, ctx.add_node(name))
+
+
+def _add_foreign_keys(ctx: ParseContext, key: str, statement: str) -> None:
+    """Foreign keys point from the referencing table to the referenced one, like the Postgres parser."""
+    for match in _REFERENCES_RE.finditer(statement):
+        if match.group("ref"):
+            ctx.add_edge(key, ctx.add_node(match.group("ref")))
+
+
+def _table_key(ctx: ParseContext, table: exp.Table) -> str:
+    return ctx.add_qualified_node(table.db or ctx.database, table.name)
+
+
+def _process_view(ctx: ParseContext, key: str, statement: str, body_start: int) -> None:
+    """Adds the dependencies of a view, parsing its query with sqlglot and falling back to a scan."""
+    try:
+        expression = sqlglot.parse_one(statement, read="mysql")
+    except SqlglotError:
+        expression = None
+    query = expression.expression if isinstance(expression, exp.Create) else None
+    if not isinstance(query, exp.Expression):
+        _add_body_edges(ctx, key, statement[body_start:])
+        return
+
+    cte_keys: Dict[str, str] = {}
+    for cte in query.find_all(exp.CTE):
+        cte_keys[cte.alias_or_name] = ctx.add_cte(cte.alias_or_name, cte.sql(dialect="mysql"))
+    for table in query.find_all(exp.Table):
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        enclosing = table.find_ancestor(exp.CTE)
+        target = cte_keys[enclosing.alias_or_name] if enclosing else key
+        source = None if table.db else cte_keys.get(table.name)
+        ctx.add_edge(source or _table_key(ctx, table), target)
+
+
+def _process_statement(ctx: ParseContext, statement: str) -> bool:
+    """Adds the nodes and edges of one statement. Returns True when it was a DDL statement of interest."""
+    statement = _VERSIONED_COMMENT_RE.sub(r"\1", statement)
+    statement = statement[_LEADING_COMMENTS_RE.match(statement).end():].strip()  # type: ignore[union-attr]
+
+    use = _USE_RE.match(statement)
+    if use:
+        ctx.database = _split_name(use.group("db"), None)[1]
+        return False
+
+    create = _CREATE_RE.match(statement)
+    if create:
+        kind = create.group("kind").lower()
+        name = create.group("name")
+        if kind == "table":
+            key = ctx.add_node(name, "table", statement)
+            _add_foreign_keys(ctx, key, statement)
+        elif kind == "view":
+            key = ctx.add_node(name, "view", statement)
+            _process_view(ctx, key, statement, create.end())
+        elif kind == "trigger":
+            event = _TRIGGER_EVENT_RE.match(statement, create.end())
+            if not event:
+                return False
+            table_key = ctx.add_node(event.group("table"))
+            # A trigger lives in the database of its table.
+            key = ctx.add_qualified_node(
+                ctx.node_types[table_key]["database"] or None, _split_name(name, None)[1], "trigger", statement
+            )
+            ctx.add_edge(table_key, key)
+            _add_body_edges(ctx, key, statement[event.end():])
+        else:
+            key = ctx.add_node(name, kind, statement)
+            _add_body_edges(ctx, key, statement[create.end():])
+        return True
+
+    alter = _ALTER_TABLE_RE.match(statement)
+    if alter and not _KEYS_TOGGLE_RE.search(statement):
+        key = ctx.add_node(alter.group("name"))
+        ctx.append_definition(key, statement)
+        _add_foreign_keys(ctx, key, statement)
+        return True
+    return False
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses a mysqldump file (or a string containing MySQL DDL) into (edges, node_types, stats).
+
+    The input is memory-mapped (see MappedInput) and read one line at a time, split on the
+    current DELIMITER, honouring quotes, backslash escapes, backticks and comments. mysqldump
+    writes every extended INSERT on a single line without raw newlines in its literals, so a data
+    line at a statement boundary that ends with the delimiter is dropped as a whole, checked in
+    the mapped bytes without being decoded; anything else goes through the splitter. Memory is
+    bounded by the longest kept line.
+
+    Extracted:
+      - CREATE TABLE (type "table") with FOREIGN KEY ... REFERENCES edges (local -> referenced),
+        also from ALTER TABLE;
+      - CREATE VIEW (type "view"), parsed with sqlglot: source -> view, CTEs as "cte_view" nodes;
+      - triggers (type "trigger"): table -> trigger, read tables -> trigger, trigger -> written tables;
+      - procedures and functions (types "procedure"/"function") with the same read/write edges.
+    Versioned comments (/*!50001 ... */) are unwrapped. Unqualified names resolve against the
+    database of the dump header ("-- Host: ... Database: x") or the last USE statement.
+
+    Raises:
+        InvalidSQLError: if no supported DDL statement was found.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    ctx = ParseContext()
+    delimiter = ";"
+    splitter = StatementSplitter(
+        dollar_quotes=False, hash_comments=True, backtick_quotes=True, backslash_escapes=True, delimiter=delimiter
+    )
+    found_ddl = False
+
+    with open_input(file_path_or_sql_string) as source:
+        for start, end in source.line_spans():
+            if splitter.at_statement_start:
+                if source.startswith(_DATA_LINE_PREFIXES, start) and source.line_endswith(
+                    delimiter.encode(), start, end
+                ):
+                    continue
+                line = source.text(start, end)
+                if line.startswith(("--", "#")):
+                    # Comment lines between statements are not part of any definition.
+                    header = _HEADER_DATABASE_RE.match(line)
+                    if header and ctx.database is None:
+                        ctx.database = header.group(1)
+                    continue
+                if line[:10].upper() == "DELIMITER ":
+                    delimiter = splitter.delimiter = line.split()[1]
+                    continue
+            else:
+                line = source.text(start, end)
+            for statement in splitter.feed(line):
+                found_ddl = _process_statement(ctx, statement) or found_ddl
+        trailing = splitter.flush()
+        if trailing:
+            found_ddl = _process_statement(ctx, trailing) or found_ddl
+
+    if not found_ddl:
+        raise InvalidSQLError("Invalid SQL or no relevant DDL statements found in the MySQL dump.")
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
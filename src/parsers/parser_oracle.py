@@ -0,0 +1,385 @@
+import os
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from sqlglot import exp
+
+from ..dataflow_structs import InvalidSQLError, LazyNodeInfo
+from .parser_utils import GraphContext, StatementSplitter, compute_stats, open_input, parse_quietly, scan_references
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+EMITS_DEFINITION_REFS = True  # Results point into the parsed file, so they are cached per input path
+
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$#]*)'
+_NAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+_LINK = r'(?:"[^"]+"|[A-Za-z_][A-Za-z0-9_$#]*(?:\.[A-Za-z_][A-Za-z0-9_$#]*)*)'
+_OBJECT = rf"{_NAME}(?:@{_LINK})?"  # A local object, or a remote one through a database link
+_IDENT_RE = re.compile(_IDENT)
+
+_STRING = r"'(?:[^']|'')*'"
+_COMMENT = r"--[^\n]*|/\*.*?\*/"
+
+# SQL*Plus: a "/" line runs the buffer and ends PL/SQL units; other commands are single lines.
+_SLASH_RE = re.compile(rb"[ \t]*/[ \t]*\r?\n?\Z")
+_SQLPLUS_RE = re.compile(
+    r"[ \t]*(?:(?:SET|SPOOL|PROMPT|REM|REMARK|WHENEVER|CONN|CONNECT|DEFINE|UNDEFINE|COL|COLUMN|TTITLE|BTITLE"
+    r"|BREAK|SHOW|EXIT|QUIT|EXEC|EXECUTE)\b|@)",
+    re.IGNORECASE,
+)
+# Units whose body contains semicolons, so only a "/" line ends them.
+_PLSQL_START_RE = re.compile(
+    r"[ \t]*(?:(?:DECLARE|BEGIN)\b|CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    r"(?:PACKAGE|PROCEDURE|FUNCTION|TRIGGER|TYPE|LIBRARY|JAVA)\b)",
+    re.IGNORECASE,
+)
+_PLSQL_HEADER_RE = re.compile(
+    r"\s*CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    rf"(?P<kind>PACKAGE(?:\s+BODY)?|PROCEDURE|FUNCTION|TRIGGER)\s+(?P<name>{_NAME})",
+    re.IGNORECASE,
+)
+_TRIGGER_TABLE_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bON\s+(?P<table>{_NAME})", re.IGNORECASE | re.DOTALL)
+
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+_CURRENT_SCHEMA_RE = re.compile(rf"ALTER\s+SESSION\s+SET\s+CURRENT_SCHEMA\s*=\s*(?P<schema>{_IDENT})", re.IGNORECASE)
+_CREATE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:NO\s+)?FORCE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    r"(?P<modifiers>(?:(?:SHARED|PUBLIC|MATERIALIZED|GLOBAL|PRIVATE|TEMPORARY)\s+)*)"
+    rf"(?P<kind>VIEW|TABLE|SYNONYM|DATABASE\s+LINK)\s+(?!LOG\s+ON\b)(?P<name>{_IDENT}(?:\s*\.\s*{_IDENT})*)",
+    re.IGNORECASE,
+)
+_ALTER_TABLE_RE = re.compile(rf"ALTER\s+TABLE\s+(?P<name>{_NAME})", re.IGNORECASE)
+_SYNONYM_TARGET_RE = re.compile(rf"\s+FOR\s+(?P<target>{_OBJECT})", re.IGNORECASE)
+_QUERY_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bAS\s*(?P<query>SELECT|WITH)\b", re.IGNORECASE | re.DOTALL)
+_REFERENCES_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bREFERENCES\s+(?P<ref>{_NAME})", re.IGNORECASE | re.DOTALL)
+_DB_LINK_USE_RE = re.compile(rf"{_STRING}|{_COMMENT}|{_NAME}@(?P<link>{_LINK})", re.IGNORECASE | re.DOTALL)
+_KEYWORDS = (
+    "WHERE|GROUP|ORDER|HAVING|CONNECT|START|UNION|MINUS|INTERSECT|EXCEPT|JOIN|INNER|LEFT|RIGHT|FULL|CROSS"
+    "|NATURAL|ON|USING|FOR|WHEN|THEN|SET|INTO|PARTITION|SAMPLE|AS|OFFSET|FETCH|MODEL|PIVOT|UNPIVOT"
+    "|RETURNING|LOG|VALUES|SELECT|BEGIN|END|LOOP|IS|AND|OR|WITH"
+)
+_ALIAS = rf"(?:\s+(?!(?:{_KEYWORDS})\b)[A-Za-z_][A-Za-z0-9_$#]*)?"
+# One item of a FROM list: an object and its alias, if any.
+_FROM_ITEM = rf"{_OBJECT}{_ALIAS}"
+_FROM_ITEM_RE = re.compile(rf"(?P<object>{_OBJECT}){_ALIAS}", re.IGNORECASE)
+# Reads and writes of one SQL statement or PL/SQL statement, in one pass. SELECT ... INTO assigns
+# variables, so only INSERT/MERGE INTO write; trigger headers (INSERT OR DELETE ON t) write nothing.
+_BODY_SCAN_RE = re.compile(
+    rf"""
+      {_STRING}
+    | {_COMMENT}
+    | \b(?:EXTRACT|TRIM)\s*\((?:[^()]|\([^()]*\))*\)
+    | \b(?:INSERT\s+(?:ALL\s+|FIRST\s+)?INTO|MERGE\s+INTO|DELETE\s+(?:FROM\s+)?(?!ON\b))\s*(?P<write>{_OBJECT})
+    | \bUPDATE\s+(?P<update>{_OBJECT})(?=\s+(?:(?!SET\b)\w+\s+)?SET\b)
+    | \b(?:FROM|JOIN)\s+(?P<read>{_FROM_ITEM}(?:\s*,\s*{_FROM_ITEM})*)
+    | \bUSING\s+(?P<using>{_OBJECT})(?=\s+(?:\w+\s+)?ON\b)
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_NOT_TABLES = {"DUAL", "TABLE", "LATERAL"}
+
+_NODE_TYPES = {
+    "VIEW": "view",
+    "MATERIALIZED VIEW": "materialized_view",
+    "TABLE": "table",
+    "SYNONYM": "synonym",
+    "DATABASE LINK": "db_link",
+    "PACKAGE": "package",
+    "PACKAGE BODY": "package",
+    "PROCEDURE": "procedure",
+    "FUNCTION": "function",
+    "TRIGGER": "trigger",
+}
+
+
+def _name_parts(name: str) -> List[str]:
+    """Splits a dotted name; unquoted identifiers are upper-cased, as Oracle resolves them."""
+    return [
+        part[1:-1].replace('""', '"') if part.startswith('"') else part.upper() for part in _IDENT_RE.findall(name)
+    ]
+
+
+def _link_name(link: str) -> str:
+    """Database link names are case-insensitive, even quoted."""
+    return link.replace('"', "").upper()
+
+
+class ParseContext(GraphContext[LazyNodeInfo]):
+    """
+    Graph under construction for one parse_dump call. Node keys are "SCHEMA.NAME" ("NAME" while no
+    schema is known), database links are keyed by their name and objects reached through a link
+    by "SCHEMA.NAME@LINK".
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.schema: Optional[str] = None  # From ALTER SESSION SET CURRENT_SCHEMA
+
+    def _add(self, key: str, database: str, node_type: Optional[str], definition: Optional[str]) -> str:
+        """Like upsert_node, but a definition is appended: Oracle DDL for one object can span statements."""
+        self.upsert_node(key, database, node_type)
+        if definition:
+            self.append_definition(key, definition)
+        return key
+
+    def add_node(self, parts: List[str], node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node for a resolved name and returns its key. A defining statement (node_type given)
+        sets the type and appends its definition; a bare reference only creates a table node.
+        """
+        schema = parts[-2] if len(parts) > 1 else self.schema
+        key = f"{schema}.{parts[-1]}" if schema else parts[-1]
+        return self._add(key, schema or "", node_type, definition)
+
+    def add_link(self, link: str, owner: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a database link node, owned by a schema or PUBLIC. A reference without the domain
+        (@SALES) resolves to a link defined with one (SALES.EXAMPLE.COM).
+        """
+        name = _link_name(link)
+        if definition is None and name not in self.node_types:
+            name = next((key for key, info in self.node_types.items()
+                         if info["type"] == "db_link" and key.startswith(name + ".")), name)
+        key = self._add(name, owner or "", "db_link", definition)
+        if owner is not None:
+            self.node_types[key]["database"] = owner
+        return key
+
+    def add_object(self, reference: str) -> str:
+        """Adds the node of a possibly remote (NAME@LINK) reference, with a link -> object edge."""
+        name, _, link = reference.partition("@")
+        parts = _name_parts(name)
+        if not link:
+            return self.add_node(parts)
+        link_key = self.add_link(link)
+        key = self._add(f"{'.'.join(parts)}@{link_key}", link_key, None, None)
+        self.add_edge(link_key, key)
+        return key
+
+    def add_definition_ref(self, key: str, path: str, start: int, end: int) -> None:
+        self.node_types[key].setdefault("definition_refs", []).append({"path": path, "start": start, "end": end})
+
+
+def _scan_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    """Adds read -> key -> written edges for the tables one statement references."""
+    for group, reference in scan_references(_BODY_SCAN_RE, sql):
+        if group in ("write", "update"):
+            ctx.add_edge(key, ctx.add_object(reference))
+            continue
+        if group == "read":
+            reads = [item.group("object") for item in _FROM_ITEM_RE.finditer(reference)]
+        else:
+            reads = [reference]
+        for read in reads:
+            if _name_parts(read.partition("@")[0])[-1] not in _NOT_TABLES:
+                ctx.add_edge(ctx.add_object(read), key)
+
+
+def _parse_query(sql: str) -> Optional[exp.Query]:
+    """Parses a query with sqlglot, quietly; None if it cannot be parsed as one."""
+    expressions = parse_quietly(sql, "oracle")
+    query = expressions[0] if len(expressions) == 1 else None
+    return query if isinstance(query, exp.Query) else None
+
+
+def _add_query_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    """
+    Adds source -> key edges for a view or CTAS query, with its CTEs as cte_view nodes. sqlglot
+    cannot read database link references, so queries with one are scanned instead.
+    """
+    has_link = any(match.group("link") for match in _DB_LINK_USE_RE.finditer(sql))
+    query = None if has_link else _parse_query(sql)
+    if query is None:
+        _scan_edges(ctx, key, sql)
+        return
+    cte_keys: Dict[str, str] = {}
+    for cte in query.find_all(exp.CTE):
+        name = ctx.add_cte(cte.alias_or_name.upper(), cte.sql(dialect="oracle"))
+        cte_keys[name] = name
+    for table in query.find_all(exp.Table):
+        parts = [
+            part.this if part.quoted else part.this.upper()
+            for part in (table.args.get("db"), table.this)
+            if isinstance(part, exp.Identifier)
+        ]
+        if not parts or (len(parts) == 1 and parts[0] in _NOT_TABLES):
+            continue
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        enclosing = table.find_ancestor(exp.CTE)
+        target = cte_keys[enclosing.alias_or_name.upper()] if enclosing else key
+        source = cte_keys.get(parts[0]) if len(parts) == 1 else None
+        ctx.add_edge(source or ctx.add_node(parts), target)
+
+
+def _process_statement(ctx: ParseContext, statement: str) -> bool:
+    """Adds the nodes and edges of one SQL statement. Returns True when it was DDL of interest."""
+    statement = statement[_LEADING_COMMENTS_RE.match(statement).end():]  # type: ignore[union-attr]
+    current_schema = _CURRENT_SCHEMA_RE.match(statement)
+    if current_schema:
+        ctx.schema = _name_parts(current_schema.group("schema"))[0]
+        return False
+
+    create = _CREATE_RE.match(statement)
+    if create:
+        modifiers = {word.upper() for word in create.group("modifiers").split()}
+        kind = " ".join(create.group("kind").upper().split())
+        rest = statement[create.end():]
+        if kind == "DATABASE LINK":
+            ctx.add_link(create.group("name"), "PUBLIC" if "PUBLIC" in modifiers else ctx.schema or "", statement)
+            return True
+        if kind == "SYNONYM":
+            parts = _name_parts(create.group("name"))
+            if "PUBLIC" in modifiers:
+                parts = ["PUBLIC", parts[-1]]
+            key = ctx.add_node(parts, "synonym", statement)
+            target = _SYNONYM_TARGET_RE.match(rest)
+            if target:
+                ctx.add_edge(ctx.add_object(target.group("target")), key)
+            return True
+
+        node_type = _NODE_TYPES["MATERIALIZED VIEW" if "MATERIALIZED" in modifiers else kind]
+        key = ctx.add_node(_name_parts(create.group("name")), node_type, statement)
+        if kind == "TABLE":
+            for ref in _REFERENCES_RE.finditer(rest):
+                if ref.group("ref"):
+                    ctx.add_edge(key, ctx.add_node(_name_parts(ref.group("ref"))))
+        query = next((match for match in _QUERY_RE.finditer(rest) if match.group("query")), None)
+        if query:
+            _add_query_edges(ctx, key, rest[query.start("query"):])
+        return True
+
+    alter = _ALTER_TABLE_RE.match(statement)
+    if alter:
+        key = ctx.add_node(_name_parts(alter.group("name")), None, statement)
+        # Foreign keys point from the referencing table to the referenced one, like the Postgres parser.
+        for ref in _REFERENCES_RE.finditer(statement, alter.end()):
+            if ref.group("ref"):
+                ctx.add_edge(key, ctx.add_node(_name_parts(ref.group("ref"))))
+        return True
+    return False
+
+
+class _PlsqlUnit:
+    """
+    A PL/SQL unit being read. Its statements are split and scanned one at a time and then dropped,
+    so only its byte range in the input is kept, however large the package body is.
+    """
+
+    def __init__(self, start: int) -> None:
+        self.start = start
+        self.key: Optional[str] = None  # None until the header is read, and for anonymous blocks
+        self._header_seen = False
+        self._splitter = StatementSplitter(dollar_quotes=False)
+
+    @property
+    def in_quote_or_comment(self) -> bool:
+        return self._splitter.in_quote_or_comment
+
+    def _process(self, ctx: ParseContext, statement: str) -> None:
+        if not self._header_seen:
+            self._header_seen = True
+            header = _PLSQL_HEADER_RE.match(statement)
+            if not header:
+                return  # Anonymous blocks, types, libraries and Java sources are not lineage nodes.
+            kind = " ".join(header.group("kind").upper().split())
+            self.key = ctx.add_node(_name_parts(header.group("name")), _NODE_TYPES[kind])
+            if kind == "TRIGGER":
+                for match in _TRIGGER_TABLE_RE.finditer(statement, header.end()):
+                    table = match.group("table")
+                    if table and table.upper() not in ("DATABASE", "SCHEMA"):
+                        ctx.add_edge(ctx.add_node(_name_parts(table)), self.key)
+                        break
+        if self.key is not None:
+            _scan_edges(ctx, self.key, statement)
+
+    def feed(self, ctx: ParseContext, line: str) -> None:
+        for statement in self._splitter.feed(line):
+            self._process(ctx, statement)
+
+    def finish(self, ctx: ParseContext) -> None:
+        trailing = self._splitter.flush()
+        if trailing:
+            self._process(ctx, trailing)
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+) -> Tuple[List[Tuple[str, str]], Dict[str, LazyNodeInfo], Dict[str, int]]:
+    """
+    Parses an Oracle DDL export, such as DBMS_METADATA.GET_DDL output or a SQL*Plus spool file
+    (or a string of Oracle DDL), into (edges, node_types, stats).
+
+    Lineage nodes and their types:
+      - views ("view") and materialized views ("materialized_view"): source -> view, parsed with
+        sqlglot's oracle dialect, CTEs as "cte_view";
+      - tables ("table"): foreign keys (local -> referenced), also from ALTER TABLE, CTAS sources;
+      - synonyms ("synonym"): target -> synonym, public synonyms in the PUBLIC schema;
+      - database links ("db_link"): link -> "SCHEMA.NAME@LINK" for every object used through it;
+      - packages, procedures, functions and triggers: tables read -> unit -> tables written.
+    Unqualified names resolve against ALTER SESSION SET CURRENT_SCHEMA.
+
+    The input is memory-mapped (see MappedInput) and read one line at a time. SQL statements end with ";" or a "/" line; PL/SQL units
+    (CREATE PACKAGE [BODY], PROCEDURE, FUNCTION, TRIGGER, TYPE, anonymous blocks) only end with a
+    "/" line, as in SQL*Plus. The statements of a unit are scanned one at a time, so memory is
+    bounded by the largest single statement. For a file input, units keep only their byte range
+    in "definition_refs"; load_definition reads the text when it is needed.
+
+    Raises:
+        InvalidSQLError: if no supported DDL statement was found.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    ctx = ParseContext()
+    splitter = StatementSplitter(dollar_quotes=False)
+    unit: Optional[_PlsqlUnit] = None
+    found_ddl = False
+    source = open_input(file_path_or_sql_string)
+
+    def _finish_unit(unit: _PlsqlUnit, end: int) -> None:
+        nonlocal found_ddl
+        unit.finish(ctx)
+        if unit.key is None:
+            return
+        found_ddl = True
+        if source.path:
+            ctx.add_definition_ref(unit.key, source.path, unit.start, end)
+        else:
+            ctx.append_definition(unit.key, source.text(unit.start, end).strip())
+
+    with source:
+        for line_start, line_end in source.line_spans():
+            is_slash = source.match(_SLASH_RE, line_start, line_end) is not None
+            line = source.text(line_start, line_end)
+
+            if unit is not None:
+                if not is_slash or unit.in_quote_or_comment:
+                    unit.feed(ctx, line)
+                    continue
+                _finish_unit(unit, line_start)
+                unit = None
+                continue
+
+            if splitter.at_statement_start:
+                if is_slash or _SQLPLUS_RE.match(line):
+                    continue
+                if _PLSQL_START_RE.match(line):
+                    unit = _PlsqlUnit(line_start)
+                    unit.feed(ctx, line)
+                    continue
+            elif is_slash and not splitter.in_quote_or_comment:
+                statement = splitter.flush()
+                if statement:
+                    found_ddl = _process_statement(ctx, statement) or found_ddl
+                continue
+            for statement in splitter.feed(line):
+                found_ddl = _process_statement(ctx, statement) or found_ddl
+
+        if unit is not None:  # A unit not terminated by "/" ends with the file.
+            _finish_unit(unit, len(source))
+        trailing = splitter.flush()
+        if trailing:
+            found_ddl = _process_statement(ctx, trailing) or found_ddl
+
+    if not found_ddl:
+        raise InvalidSQLError("Invalid SQL or no supported DDL statements found in the Oracle export.")
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
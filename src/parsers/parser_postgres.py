@@ -1,27 +1,42 @@
-import json
 import os
 import re
-from typing import Dict, List, Tuple, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Set, Tuple, Optional, Union
 
-# import sqlglot  (unused)
-import sqlfluff
 from sqlglot import parse, exp
 
 
-from ..dataflow_structs import NodeInfo as NodeInfo, InvalidSQLError
+from .. import path_utils
+from ..dataflow_structs import ColumnLineage, NodeInfo as NodeInfo, InvalidSQLError
+from .parser_utils import MappedInput, cached_sqlfluff_fix, compute_stats, open_input, split_statements, write_column_lineage
 
 
 class NodeInfoPG(NodeInfo, total=False):
     constraints: List[str]  # For potential future use, not heavily used in current code
     definition_parts: List[str]  # Internal list to accumulate DDL segments
 
+# Optional words between CREATE and the object kind, e.g. CREATE OR REPLACE TEMPORARY VIEW.
+_CREATE = r"CREATE\s+(?:OR\s+REPLACE\s+)?(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMP|TEMPORARY|UNLOGGED|RECURSIVE)\s+)?"
 SQL_PATTERNS = [
-    r"CREATE\s+TABLE", r"ALTER\s+TABLE", r"CREATE\s+VIEW",
-    r"CREATE\s+MATERIALIZED\s+VIEW", r"CREATE\s+FUNCTION",
-    r"CREATE\s+PROCEDURE", r"CREATE\s+TYPE", r"CREATE\s+DOMAIN",
-    r"CREATE\s+SEQUENCE",
+    rf"{_CREATE}TABLE", r"ALTER\s+TABLE", rf"{_CREATE}VIEW",
+    rf"{_CREATE}MATERIALIZED\s+VIEW", rf"{_CREATE}FUNCTION",
+    rf"{_CREATE}PROCEDURE", r"CREATE\s+TYPE", r"CREATE\s+DOMAIN",
+    rf"{_CREATE}SEQUENCE",
 ] # Basic patterns to check if content is SQL DDL
 
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+DEFAULT_BATCH_SIZE = 200  # Statements per work item in parallel mode
+
+# When to run the sqlfluff fix pre-pass over a statement before handing it to sqlglot.
+FIX_NEVER = "never"  # Never; statements sqlglot cannot parse raise InvalidSQLError.
+FIX_FAILED = "failed"  # Only retry statements that sqlglot failed to parse.
+FIX_ALWAYS = "always"  # Fix every statement first (slowest, previous behaviour).
+FIX_POLICIES = (FIX_NEVER, FIX_FAILED, FIX_ALWAYS)
+
 
 def _extract_schema(schema_expr: Optional[exp.Expression]) -> Optional[str]:
     """Extracts schema name from a schema expression node (Identifier)."""
@@ -30,11 +45,16 @@ def _extract_schema(schema_expr: Optional[exp.Expression]) -> Optional[str]:
     return None
 
 
-def format_sql(definition: str) -> str:
-    """Pretty-format SQL definition using sqlfluff if available, else sqlglot."""
+def format_sql(definition: str, fix_policy: str = FIX_FAILED) -> str:
+    """
+    Pretty-format SQL definition using sqlfluff if available, else sqlglot. With
+    fix_policy=FIX_NEVER sqlfluff is not run at all and the definition is only stripped.
+    """
+    if fix_policy == FIX_NEVER:
+        return definition.strip()
     try:
         # Use sqlfluff to lint and fix the SQL for formatting
-        formatted = sqlfluff.fix(definition, dialect='postgres')
+        formatted = cached_sqlfluff_fix(definition, dialect='postgres')
         if formatted and formatted.strip():
             return formatted.strip()
     except Exception:
@@ -51,12 +71,13 @@ def add_node(
     schema: Optional[str],
     definition: Optional[str], # SQL text of the statement being processed
     node_types: Dict[str, NodeInfoPG],
+    fix_policy: str = FIX_FAILED,
 ) -> str:
     """
     Adds or updates a node in the node_types dictionary.
     Nodes are keyed by their full name (e.g., "schema.name").
     This function accumulates definitions (e.g., from CREATE and subsequent ALTER statements).
-    Definitions are pretty-formatted.
+    Definitions are pretty-formatted (see format_sql for how fix_policy applies).
     Returns the full_name key of the node.
     """
     if not name: # Skip if name is somehow empty
@@ -81,7 +102,7 @@ def add_node(
 
     # Append the new DDL segment
     if definition:
-        formatted_part = format_sql(definition)
+        formatted_part = format_sql(definition, fix_policy)
         info["definition_parts"].append(formatted_part)
         info["definition"] = "\n\n-- Additional DDL --\n".join(info["definition_parts"])
 
@@ -140,108 +161,192 @@ def find_foreign_keys(statement_expr: Union[exp.Create, exp.Alter]) -> List[Tupl
     return fks
 
 
-def parse_dump(
-    file_path_or_sql_string: Union[str, os.PathLike],
-) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfoPG], Dict[str, int]]:
+# Output columns of a query in select-list order, each with the "relation.column" names it derives from.
+QueryColumns = List[Tuple[str, Set[str]]]
+
+
+def _relation_key(table_expr: exp.Table) -> str:
+    """Node key of a table reference, matching the full_name add_node gives it."""
+    schema = _extract_schema(table_expr.args.get("db") or table_expr.args.get("catalog"))
+    return f"{schema + '.' if schema else ''}{table_expr.name}"
+
+
+def _source_columns(
+    relation: Union[str, QueryColumns],
+    column: str,
+) -> Set[str]:
+    """Source columns of one column of a relation: a table (by key) or a derived table / CTE."""
+    if isinstance(relation, str):
+        return {f"{relation}.{column}"}
+    sources: Set[str] = set()
+    for name, name_sources in relation:
+        if name == column:
+            sources |= name_sources
+        elif name == "*":  # Unexpanded star over a table: the column comes from that table
+            sources |= {f"{source[:-1]}{column}" for source in name_sources}
+    return sources
+
+
+def query_columns(query: exp.Query, ctes: Optional[Dict[str, QueryColumns]] = None) -> QueryColumns:
     """
-    Parses a SQL dump file (or a string containing SQL) to extract schema information,
-    dependencies (e.g., for views), and foreign keys.
+    Resolves the output columns of a query to the table columns they derive from. CTEs and
+    derived tables are resolved through, so sources are always columns of named relations;
+    set operations (UNION, EXCEPT, INTERSECT) combine their branches by position. Unqualified
+    column names are only resolved when the query reads from a single relation, and a star over
+    a table whose columns are unknown stays a "*" column ("schema.table.*").
     """
-    try:
-        # Check if input is a file path and read it.
-        if isinstance(file_path_or_sql_string, (str, os.PathLike)) and os.path.exists(file_path_or_sql_string):
-             with open(file_path_or_sql_string, "r", encoding="utf-8") as f:
-                content = f.read()
-        # If not an existing path, assume it's an SQL string.
-        elif isinstance(file_path_or_sql_string, str):
-            content = file_path_or_sql_string
-        else:
-            raise ValueError("Invalid input: an existing file path or an SQL string is required.")
-    except Exception as e:
-        # Catch-all for file reading errors or other initial issues.
-        raise ValueError(f"Error reading input: {e}")
+    scope = dict(ctes or {})
+    for cte in getattr(query, "ctes", None) or []:
+        scope[cte.alias_or_name] = query_columns(cte.this, scope)
+
+    if isinstance(query, exp.Subquery):
+        return query_columns(query.this, scope)
+    if isinstance(query, exp.SetOperation):
+        left, right = query_columns(query.this, scope), query_columns(query.expression, scope)
+        return [(name, sources | right[i][1] if i < len(right) else sources) for i, (name, sources) in enumerate(left)]
+    if not isinstance(query, exp.Select):
+        return []
+
+    relations: Dict[str, Union[str, QueryColumns]] = {}
+    from_expr = query.args.get("from_") or query.args.get("from")
+    for source in [from_expr, *(query.args.get("joins") or [])]:
+        source = source.this if isinstance(source, (exp.From, exp.Join)) else None
+        if isinstance(source, exp.Table) and source.name:
+            cte_columns = None if source.db else scope.get(source.name)
+            relations[source.alias_or_name] = cte_columns if cte_columns is not None else _relation_key(source)
+        elif isinstance(source, exp.Subquery):
+            relations[source.alias_or_name] = query_columns(source.this, scope)
+
+    def _expand_star(relation: Union[str, QueryColumns]) -> QueryColumns:
+        return [("*", {f"{relation}.*"})] if isinstance(relation, str) else list(relation)
+
+    columns: QueryColumns = []
+    for projection in query.expressions:
+        if isinstance(projection, exp.Star):
+            for relation in relations.values():
+                columns.extend(_expand_star(relation))
+            continue
+        if isinstance(projection, exp.Column) and isinstance(projection.this, exp.Star):
+            if projection.table in relations:
+                columns.extend(_expand_star(relations[projection.table]))
+            continue
+        sources: Set[str] = set()
+        for column in projection.find_all(exp.Column):
+            if column.find_ancestor(exp.Select) is not query:
+                continue  # Scalar subqueries have their own scope
+            column_relation = relations.get(column.table) if column.table else (
+                next(iter(relations.values())) if len(relations) == 1 else None
+            )
+            if column_relation is not None:
+                sources |= _source_columns(column_relation, column.name)
+        columns.append((projection.alias_or_name, sources))
+    return columns
+
+
+def _add_column_lineage(lineage: ColumnLineage, node_key: str, query: exp.Query) -> None:
+    """Adds source column -> "node_key.column" edges for each output column of a view or CTAS query."""
+    for name, sources in query_columns(query):
+        for source in sources:
+            lineage.add_edge(source, f"{node_key}.{name}")
+
+
+# Regex to detect start of ignored DDL statements that might be multi-line
+_IGNORED_DDL_START_RE = re.compile(
+    r'^\s*(CREATE|ALTER)\s+(?:OR\s+REPLACE\s+)?(SCHEMA|INDEX|FUNCTION|TRIGGER|PROCEDURE|SEQUENCE)\b',
+    re.IGNORECASE
+)
+# Regex for other single-line ignored commands (e.g., \connect, SET var =, SELECT pg_catalog.setval)
+# pg_dump uses "SET name = value;"
+_OTHER_IGNORED_LINE_RE = re.compile(
+    r'^\s*(?:\\connect|\\set|SET\s+[a-zA-Z_][a-zA-Z0-9_]*\s*=|SELECT\s+pg_catalog\.setval)\b',
+    re.IGNORECASE
+)
+_COPY_START_RE = re.compile(r'^\s*COPY\s+.*\s+FROM\s+ST(?:DIN)?', re.IGNORECASE)
+_COPY_START_BYTES_RE = re.compile(_COPY_START_RE.pattern.encode(), re.IGNORECASE | re.MULTILINE)  # "^" at line starts
+_DOLLAR_BODY_END_RE = re.compile(r'\$\$\s*;$')  # Ends with '$$;' possibly with space
+_BLOCK_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_LINE_COMMENT_RE = re.compile(r'--.*?$', re.MULTILINE)
+_SQL_PATTERNS_RE = re.compile("|".join(SQL_PATTERNS), re.IGNORECASE)
+
+
+def _strip_comments_stream(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Removes all block and single-line comments, one line at a time.
+    A block comment spanning several lines joins the text before it with the text after it.
+    """
+    pending: Optional[str] = None  # Text preceding an unterminated /* ... */
+    for line in lines:
+        if pending is not None:
+            end = line.find('*/')
+            if end == -1:
+                continue  # Still inside the block comment
+            line = pending + line[end + 2:]
+            pending = None
+        line = _BLOCK_COMMENT_RE.sub('', line)
+        start = line.find('/*')
+        if start != -1:
+            pending = line[:start]
+            continue
+        yield _LINE_COMMENT_RE.sub('', line)
+    if pending is not None:
+        yield pending
+
 
+def _drop_copy_blocks(lines: Iterable[str]) -> Iterator[str]:
+    """Drops COPY ... FROM STDIN statements together with their data rows."""
+    in_copy_data_block = False
+    for line in lines:
+        if in_copy_data_block:
+            if line.lstrip().startswith('\\.'): # End of COPY data
+                in_copy_data_block = False
+            continue
+        if _COPY_START_RE.match(line):
+            in_copy_data_block = not line.rstrip().endswith('\\.')
+            continue
+        yield line
 
-    # Pre-processing: Comment out lines that are not DDL for tables/views or are problematic for parsing.
-    # Remove all comments (single-line and block)
-    def _remove_sql_comments(sql: str) -> str:
-        # Remove block comments
-        sql = re.sub(r'/\*.*?\*/', '', sql, flags=re.DOTALL)
-        # Remove single-line comments
-        sql = re.sub(r'--.*?$', '', sql, flags=re.MULTILINE)
-        return sql
 
-    content = _remove_sql_comments(content)
-    
-    lines = content.splitlines()
-    cleaned_lines: List[str] = []
-    in_copy_data_block: bool = False # Flag for being inside a COPY ... FROM STDIN data block.
+def _clean_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Pre-processing: Drops lines that are not DDL for tables/views or are problematic for parsing,
+    such as functions, triggers, sequences and SET commands. COPY blocks are removed
+    beforehand by _drop_copy_blocks.
+    """
     in_ignored_multiline_statement: bool = False # True if inside a multi-line statement to be ignored
     ignored_statement_type: Optional[str] = None # Stores type like "FUNCTION", "TRIGGER"
 
-    # Regex to detect start of ignored DDL statements that might be multi-line
-    ignored_ddl_start_regex = re.compile(
-        r'^\s*(CREATE|ALTER)\s+(?:OR\s+REPLACE\s+)?(SCHEMA|INDEX|FUNCTION|TRIGGER|PROCEDURE|SEQUENCE)\b',
-        re.IGNORECASE
-    )
-    # Regex for other single-line ignored commands (e.g., \connect, SET var =, SELECT pg_catalog.setval)
-    # pg_dump uses "SET name = value;"
-    other_ignored_line_regex = re.compile(
-        r'^\s*(?:\\connect|\\set|SET\s+[a-zA-Z_][a-zA-Z0-9_]*\s*=|SELECT\s+pg_catalog\.setval)\b',
-        re.IGNORECASE
-    )
-    
-    
     for line in lines:
         stripped_line = line.strip()
-        
-        # Handle COPY ... FROM STDIN data blocks
-        if in_copy_data_block:
-            cleaned_lines.append(f"--{line}") # Comment out lines within COPY data
-            if stripped_line == '\\.' or re.match(r'^\\\.', stripped_line): # End of COPY data
-                in_copy_data_block = False
-            continue
-        
-        # Detect start of COPY ... FROM STDIN statement
-        if re.match(r'^\s*COPY\s+.*\s+FROM\s+ST(?:DIN)?', stripped_line, re.IGNORECASE):
-            cleaned_lines.append(f"--{line}") # Comment out the COPY statement itself
-            if not stripped_line.endswith('\\.'): # If data is on subsequent lines
-                in_copy_data_block = True
-            continue
 
         # Handle lines within an ignored multi-line DDL statement
         if in_ignored_multiline_statement:
-            cleaned_lines.append(f"--{line}") # Comment out the line
-            
             terminated = False
             # Check for termination based on statement type
             if ignored_statement_type in ("FUNCTION", "PROCEDURE"):
                 # For functions/procedures, termination is typically '$$;'
-                if re.search(r'\$\$\s*;$', stripped_line): # Ends with '$$;' possibly with space
+                if _DOLLAR_BODY_END_RE.search(stripped_line):
                     terminated = True
             elif stripped_line.endswith(';'): # For other types (TRIGGER, SEQUENCE, etc.)
                 terminated = True
-            
+
             if terminated:
                 in_ignored_multiline_statement = False
                 ignored_statement_type = None
             continue
 
         # Detect start of an ignored DDL statement (CREATE/ALTER FUNCTION, TRIGGER, etc.)
-        match_ignored_ddl = ignored_ddl_start_regex.match(stripped_line)
+        match_ignored_ddl = _IGNORED_DDL_START_RE.match(stripped_line)
         if match_ignored_ddl:
-            cleaned_lines.append(f"--{line}") # Comment out the starting line
-            
             current_statement_main_type = match_ignored_ddl.group(2).upper() # FUNCTION, TRIGGER, etc.
 
             # Determine if it's single-line or multi-line
             is_single_line_terminated = False
             if current_statement_main_type in ("FUNCTION", "PROCEDURE"):
-                if re.search(r'\$\$\s*;$', stripped_line):
+                if _DOLLAR_BODY_END_RE.search(stripped_line):
                     is_single_line_terminated = True
             elif stripped_line.endswith(';'):
                 is_single_line_terminated = True
-            
+
             if not is_single_line_terminated:
                 in_ignored_multiline_statement = True
                 ignored_statement_type = current_statement_main_type
@@ -249,127 +354,346 @@ def parse_dump(
             continue
 
         # Detect other ignored single-line commands (like \set, SET var =, etc.)
-        if other_ignored_line_regex.match(stripped_line):
-            cleaned_lines.append(f"--{line}")
+        if _OTHER_IGNORED_LINE_RE.match(stripped_line):
             continue
-        
+
         # If none of the above, keep the line as is
-        cleaned_lines.append(line)
-        
-    content = "\n".join(cleaned_lines)
-    with open("cleaned_sql.sql", "w", encoding="utf-8") as f:
-        f.write(content)
-    # Basic validation: Check if any relevant DDL patterns are present after cleaning.
-    if not content or not any(re.search(pattern, content, re.IGNORECASE) for pattern in SQL_PATTERNS):
-        raise InvalidSQLError("Invalid SQL or no relevant DDL statements found after cleaning.")
+        yield line
+
+
+def iter_statements(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yields cleaned DDL statements from the lines of a pg_dump file.
+    Comments, COPY data blocks and ignored statements are dropped as they stream past,
+    so memory is bounded by the largest single statement rather than the file size.
+    """
+    # COPY data is dropped before comment stripping so that "/*" or "--" inside data rows
+    # cannot swallow the DDL that follows.
+    raw_lines = _drop_copy_blocks(line.rstrip("\r\n") for line in lines)
+    cleaned = _clean_lines(_strip_comments_stream(raw_lines))
+    yield from split_statements(line + "\n" for line in cleaned)
 
-    # Optional: Use SQLFluff to lint/fix SQL for better parsability if it's installed.
-    try:
-        import sqlfluff
-        content = sqlfluff.fix(content, dialect='postgres', fix_even_unparsable=True)
-    except ImportError:
-        pass # SQLFluff is optional.
 
-    # Parse the preprocessed SQL content using sqlglot.
+def _process_statement(
+    stmt_expr: exp.Expression,
+    node_types: Dict[str, NodeInfoPG],
+    edges: List[Tuple[str, str]],
+    lineage: Optional[ColumnLineage] = None,
+    fix_policy: str = FIX_FAILED,
+) -> None:
+    """
+    Adds the nodes and edges described by one parsed SQL statement, and column lineage if
+    collected. Definitions are formatted according to fix_policy (see format_sql).
+    """
+    # Handle CREATE TABLE and CREATE VIEW statements.
+    if isinstance(stmt_expr, exp.Create) and isinstance(stmt_expr.this, exp.Table):
+        table_obj = stmt_expr.this
+        name = table_obj.name
+        schema = _extract_schema(table_obj.args.get('db') or table_obj.args.get('catalog'))
+
+        # Determine if it's a TABLE, VIEW, MATERIALIZED VIEW, etc.
+        kind = (stmt_expr.args.get('kind') or 'TABLE').upper()
+        # Simplify node type to 'view' if it contains "VIEW", otherwise 'table'.
+        node_type = 'view' if 'VIEW' in kind else 'table'
+
+        definition_sql = stmt_expr.sql(dialect='postgres') # Get SQL for the CREATE statement.
+        node_key = add_node(name, node_type, schema, definition_sql, node_types, fix_policy)
+
+        # Extract foreign keys defined directly within this CREATE TABLE statement.
+        edges.extend(find_foreign_keys(stmt_expr))
+
+        # For views or CTAS (CREATE TABLE AS SELECT), find dependencies from the SELECT query.
+        query_expression = stmt_expr.args.get('expression') # This holds the SELECT part.
+        if lineage is not None and node_key and isinstance(query_expression, exp.Query):
+            _add_column_lineage(lineage, node_key, query_expression)
+
+        if isinstance(query_expression, exp.With): # Handles CTEs (WITH ... AS ...).
+            # Process Common Table Expressions first.
+            for cte_sub_expr in query_expression.expressions or []: # exp.With.expressions lists exp.CTE.
+                if isinstance(cte_sub_expr, exp.CTE):
+                    cte_name = cte_sub_expr.alias_or_name
+                    cte_definition_sql = cte_sub_expr.sql(dialect='postgres')
+                    # CTEs are like temporary, schemaless views for the query's scope.
+                    # Schema is None for CTEs.
+                    cte_key = add_node(cte_name, 'cte_view', None, cte_definition_sql, node_types, fix_policy)
+
+                    # Find dependencies for this CTE from its own query part (cte_sub_expr.this).
+                    for dep_name, dep_schema in find_dependencies(cte_sub_expr.this):
+                        # Add dependency node (usually a table or another view).
+                        # Definition is None as we only know its name/schema here.
+                        dep_key = add_node(dep_name, 'table', dep_schema, None, node_types)
+                        edges.append((dep_key, cte_key)) # Edge: source_object -> cte_view
+            # The main query part after the WITH clause.
+            query_expression = query_expression.this
+
+        if query_expression: # If there's a main query (view's SELECT, CTAS's SELECT).
+            for dep_name, dep_schema in find_dependencies(query_expression):
+                # These are tables/views the main query selects from.
+                # Default type to 'table'; actual DDL will confirm/correct type later if needed.
+                dep_key = add_node(dep_name, 'table', dep_schema, None, node_types)
+                if node_key: # Ensure the main node was successfully added
+                    edges.append((dep_key, node_key)) # Edge: source_object -> created_table/view
+
+    # Handle ALTER TABLE statements.
+    elif isinstance(stmt_expr, exp.Alter) and isinstance(stmt_expr.this, exp.Table):
+        table_obj = stmt_expr.this
+        name = table_obj.name
+        schema = _extract_schema(table_obj.args.get('db') or table_obj.args.get('catalog'))
+
+        definition_sql = stmt_expr.sql(dialect='postgres') # Get SQL for the ALTER statement.
+        # Add this ALTER statement's definition to the existing table's node.
+        # Node type is 'table' for ALTER TABLE.
+        _ = add_node(name, 'table', schema, definition_sql, node_types, fix_policy)
+
+        # Extract foreign keys defined or modified by this ALTER TABLE statement.
+        edges.extend(find_foreign_keys(stmt_expr))
+
+
+def _parse_statement(statement: str, fix_policy: str) -> List[exp.Expression]:
+    """
+    Parses one statement with sqlglot, running the sqlfluff fix pass according to fix_policy.
+    Empty statements, which sqlglot returns as None, are left out.
+    """
+    if fix_policy == FIX_ALWAYS:
+        statement = cached_sqlfluff_fix(statement, dialect='postgres', fix_even_unparsable=True)
     try:
-        # `read='postgres'` tells sqlglot to use PostgreSQL dialect.
-        parsed_statements = parse(content, read='postgres') 
-        if not parsed_statements:  # parse can return None or empty list if content is effectively empty.
-            return [], {}, {}
+        expressions = parse(statement, read='postgres')
     except Exception as e:
-        # Catch parsing errors from sqlglot.
-        raise InvalidSQLError(f"SQL parsing failed with sqlglot: {e}")
-
-    node_types: Dict[str, NodeInfoPG] = {} # Stores info about each node (table, view, CTE).
-    edges: List[Tuple[str, str]] = []    # Stores relationships (dependencies, FKs) as (source, target) tuples.
-
-    # Process each parsed SQL statement from the dump.
-    for stmt_expr in parsed_statements:
-        # Handle CREATE TABLE and CREATE VIEW statements.
-        if isinstance(stmt_expr, exp.Create) and isinstance(stmt_expr.this, exp.Table):
-            table_obj = stmt_expr.this
-            name = table_obj.name
-            schema = _extract_schema(table_obj.args.get('db') or table_obj.args.get('catalog'))
-            
-            # Determine if it's a TABLE, VIEW, MATERIALIZED VIEW, etc.
-            kind = (stmt_expr.args.get('kind') or 'TABLE').upper()
-            # Simplify node type to 'view' if it contains "VIEW", otherwise 'table'.
-            node_type = 'view' if 'VIEW' in kind else 'table'
-            
-            definition_sql = stmt_expr.sql(dialect='postgres') # Get SQL for the CREATE statement.
-            node_key = add_node(name, node_type, schema, definition_sql, node_types)
+        if fix_policy != FIX_FAILED:
+            raise InvalidSQLError(f"SQL parsing failed with sqlglot: {e}")
+        try:
+            fixed = cached_sqlfluff_fix(statement, dialect='postgres', fix_even_unparsable=True)
+            expressions = parse(fixed, read='postgres')
+        except Exception as e:
+            raise InvalidSQLError(f"SQL parsing failed with sqlglot, even after sqlfluff fix: {e}")
+    return [stmt_expr for stmt_expr in expressions if isinstance(stmt_expr, exp.Expression)]
+
+
+def _parse_statements(
+    statements: Iterable[str],
+    fix_policy: str = FIX_FAILED,
+    column_lineage: bool = False,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfoPG], bool, Optional[ColumnLineage]]:
+    """
+    Parses cleaned statements one at a time into a partial (edges, node_types) result.
+    Every statement is parsed; SQL_PATTERNS only decide whether relevant DDL was seen, which
+    is also reported. Returns the column lineage if column_lineage is set (else None).
+    Module-level so process pools can pickle it.
+    """
+    node_types: Dict[str, NodeInfoPG] = {}
+    edges: List[Tuple[str, str]] = []
+    lineage = ColumnLineage() if column_lineage else None
+    found_ddl = False
+    for statement in statements:
+        found_ddl = found_ddl or _SQL_PATTERNS_RE.search(statement) is not None
+        for stmt_expr in _parse_statement(statement, fix_policy):
+            _process_statement(stmt_expr, node_types, edges, lineage, fix_policy)
+    return edges, node_types, found_ddl, lineage
+
+
+def _merge_partial(
+    node_types: Dict[str, NodeInfoPG],
+    edges: List[Tuple[str, str]],
+    part_node_types: Dict[str, NodeInfoPG],
+    part_edges: List[Tuple[str, str]],
+) -> None:
+    """
+    Merges a partial result from a later batch into the accumulated one.
+    add_node keeps the type of the first occurrence and appends definitions in order,
+    so merging batches in input order gives exactly the sequential result.
+    """
+    edges.extend(part_edges)
+    for full_name, part_info in part_node_types.items():
+        info = node_types.get(full_name)
+        if info is None:
+            node_types[full_name] = part_info
+        elif part_info["definition_parts"]:
+            info["definition_parts"].extend(part_info["definition_parts"])
+            info["definition"] = "\n\n-- Additional DDL --\n".join(info["definition_parts"])
+
+
+def _batched(statements: Iterable[str], batch_size: int) -> Iterator[List[str]]:
+    """Groups statements into lists of at most batch_size items."""
+    batch: List[str] = []
+    for statement in statements:
+        batch.append(statement)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_parallel(
+    statements: Iterable[str],
+    jobs: int,
+    batch_size: int,
+    fix_policy: str = FIX_FAILED,
+    column_lineage: bool = False,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfoPG], bool, Optional[ColumnLineage]]:
+    """
+    Parses statement batches in a ProcessPoolExecutor and merges the results in submission order.
+    At most two batches per worker are in flight, so memory stays bounded for large dumps.
+    """
+    node_types: Dict[str, NodeInfoPG] = {}
+    edges: List[Tuple[str, str]] = []
+    lineage = ColumnLineage() if column_lineage else None
+    found_ddl = False
+    pending: Deque[Future] = deque()
+
+    def _collect(future: Future) -> None:
+        nonlocal found_ddl
+        part_edges, part_node_types, part_found, part_lineage = future.result()
+        _merge_partial(node_types, edges, part_node_types, part_edges)
+        if lineage is not None and part_lineage is not None:
+            lineage.merge(part_lineage)
+        found_ddl = found_ddl or part_found
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for batch in _batched(statements, batch_size):
+            pending.append(executor.submit(_parse_statements, batch, fix_policy, column_lineage))
+            if len(pending) >= jobs * 2:
+                _collect(pending.popleft())
+        while pending:
+            _collect(pending.popleft())
+    return edges, node_types, found_ddl, lineage
+
+
+def _mapped_lines(source: MappedInput) -> Iterator[str]:
+    """
+    Yields the decoded lines of a mapped input. COPY ... FROM stdin statements are recognised in
+    the mapped bytes and skipped together with their data rows, which are never sliced or decoded.
+    """
+    pos, size = 0, len(source)
+    while pos < size:
+        for start, end in source.line_spans(pos):
+            if not source.match(_COPY_START_BYTES_RE, start, end):
+                yield source.text(start, end)
+                continue
+            if source.line_endswith(b"\\.", start, end):
+                continue  # COPY with its data on the same line
+            # Jump past the "\." line that ends the data rows.
+            terminator = source.find(b"\n\\.", end - 1)
+            newline = source.find(b"\n", terminator + 1) if terminator != -1 else -1
+            pos = size if newline == -1 else newline + 1
+            break
+        else:
+            return
 
-            # Extract foreign keys defined directly within this CREATE TABLE statement.
-            edges.extend(find_foreign_keys(stmt_expr))
-            
-            # For views or CTAS (CREATE TABLE AS SELECT), find dependencies from the SELECT query.
-            query_expression = stmt_expr.args.get('expression') # This holds the SELECT part.
-            
-            if isinstance(query_expression, exp.With): # Handles CTEs (WITH ... AS ...).
-                # Process Common Table Expressions first.
-                for cte_sub_expr in query_expression.expressions or []: # exp.With.expressions lists exp.CTE.
-                    if isinstance(cte_sub_expr, exp.CTE):
-                        cte_name = cte_sub_expr.alias_or_name
-                        cte_definition_sql = cte_sub_expr.sql(dialect='postgres')
-                        # CTEs are like temporary, schemaless views for the query's scope.
-                        # Schema is None for CTEs.
-                        cte_key = add_node(cte_name, 'cte_view', None, cte_definition_sql, node_types)
-                        
-                        # Find dependencies for this CTE from its own query part (cte_sub_expr.this).
-                        for dep_name, dep_schema in find_dependencies(cte_sub_expr.this):
-                            # Add dependency node (usually a table or another view).
-                            # Definition is None as we only know its name/schema here.
-                            dep_key = add_node(dep_name, 'table', dep_schema, None, node_types)
-                            edges.append((dep_key, cte_key)) # Edge: source_object -> cte_view
-                # The main query part after the WITH clause.
-                query_expression = query_expression.this 
-            
-            if query_expression: # If there's a main query (view's SELECT, CTAS's SELECT).
-                for dep_name, dep_schema in find_dependencies(query_expression):
-                    # These are tables/views the main query selects from.
-                    # Default type to 'table'; actual DDL will confirm/correct type later if needed.
-                    dep_key = add_node(dep_name, 'table', dep_schema, None, node_types)
-                    if node_key: # Ensure the main node was successfully added
-                        edges.append((dep_key, node_key)) # Edge: source_object -> created_table/view
-
-        # Handle ALTER TABLE statements.
-        elif isinstance(stmt_expr, exp.Alter) and isinstance(stmt_expr.this, exp.Table):
-            table_obj = stmt_expr.this
-            name = table_obj.name
-            schema = _extract_schema(table_obj.args.get('db') or table_obj.args.get('catalog'))
-            
-            definition_sql = stmt_expr.sql(dialect='postgres') # Get SQL for the ALTER statement.
-            # Add this ALTER statement's definition to the existing table's node.
-            # Node type is 'table' for ALTER TABLE.
-            _ = add_node(name, 'table', schema, definition_sql, node_types)
-            
-            # Extract foreign keys defined or modified by this ALTER TABLE statement.
-            edges.extend(find_foreign_keys(stmt_expr))
-
-    # Calculate statistics: count of nodes per schema (excluding CTEs from this stat).
-    stats: Dict[str, int] = {}
-    for info_dict in node_types.values():
-        # info_dict is an instance of NodeInfoPG (a TypedDict), which is a dict at runtime.
-        if info_dict.get('type') == 'cte_view': # Check type directly
-            continue # Exclude CTEs from schema object counts.
-        
-        # No need for isinstance(info_dict, dict) here as it's guaranteed by type hints
-        schema_name = info_dict.get('database') or 'public' # Default to 'public' if schema is empty/None.
-        stats[schema_name] = stats.get(schema_name, 0) + 1
 
-    # Create directory for JSON output if it doesn't exist.
-    output_dir = 'json_structure'
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Save edges and node_types to JSON files.
-    try:
-        with open(os.path.join(output_dir, 'edges.json'), 'w', encoding='utf-8') as f_edges:
-            json.dump(edges, f_edges, indent=2)
-        with open(os.path.join(output_dir, 'node_types.json'), 'w', encoding='utf-8') as f_nodes:
-            json.dump(node_types, f_nodes, indent=2)
-    except IOError as e:
-        # Handle potential errors during file writing.
-        print(f"Warning: Could not write JSON output files: {e}")
+def cleaned_sql_debug_path(file_path_or_sql_string: Union[str, os.PathLike]) -> Path:
+    """Returns where the cleaned-SQL debug artifact for the given input is written."""
+    if isinstance(file_path_or_sql_string, (str, os.PathLike)) and os.path.exists(file_path_or_sql_string):
+        stem = Path(file_path_or_sql_string).stem
+    else:
+        stem = "sql_string"
+    return path_utils.DATA_FLOW_BASE_DIR / "debug" / f"{stem}.cleaned.sql"
+
+
+def _tee_statements(statements: Iterable[str], handle: IO[str]) -> Iterator[str]:
+    """Passes statements through unchanged while writing each one to handle as it goes by."""
+    for statement in statements:
+        handle.write(statement)
+        handle.write(";\n\n")
+        yield statement
 
 
-    return edges, node_types, stats
+def _parse_input(
+    file_path_or_sql_string: Union[str, os.PathLike],
+    jobs: int = 1,
+    fix_policy: str = FIX_FAILED,
+    debug_cleaned_sql: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    lineage: Optional[ColumnLineage] = None,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfoPG], Dict[str, int]]:
+    """
+    Reads, cleans and parses the input one statement at a time (see parse_dump).
+    If a ColumnLineage is given, the column lineage of views and CTAS queries is added to it.
+    """
+    collect_lineage = lineage is not None
+    with open_input(file_path_or_sql_string) as source, ExitStack() as stack:
+        # Comments, COPY data and ignored statements are dropped while splitting into statements.
+        statements: Iterable[str] = iter_statements(_mapped_lines(source))
+        if debug_cleaned_sql:
+            debug_path = cleaned_sql_debug_path(file_path_or_sql_string)
+            debug_path.parent.mkdir(parents=True, exist_ok=True)
+            print(f"Writing cleaned SQL to {debug_path}")
+            statements = _tee_statements(statements, stack.enter_context(open(debug_path, "w", encoding="utf-8")))
+
+        if jobs > 1:
+            edges, node_types, found_ddl, part_lineage = _parse_parallel(
+                statements, jobs, batch_size, fix_policy, collect_lineage
+            )
+        else:
+            edges, node_types, found_ddl, part_lineage = _parse_statements(statements, fix_policy, collect_lineage)
+    if lineage is not None and part_lineage is not None:
+        lineage.merge(part_lineage)
+
+    # Basic validation: Check if any relevant DDL patterns are present after cleaning.
+    if not found_ddl:
+        raise InvalidSQLError("Invalid SQL or no relevant DDL statements found after cleaning.")
+
+    return edges, node_types, compute_stats(node_types, 'public')  # Objects without a schema are in public
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+    jobs: int = 1,
+    fix_policy: str = FIX_FAILED,
+    debug_cleaned_sql: bool = False,
+    lineage: Optional[ColumnLineage] = None,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfoPG], Dict[str, int]]:
+    """
+    Parses a SQL dump file (or a string containing SQL) to extract schema information,
+    dependencies (e.g., for views), and foreign keys.
+
+    Files are memory-mapped (see MappedInput) and read line by line: COPY data is skipped in
+    the mapped bytes without being decoded and each complete DDL statement is handed to sqlglot
+    on its own, so peak memory is bounded by the largest statement instead of the dump size.
+
+    With jobs > 1 (or jobs <= 0 for one worker per CPU core) the statements are parsed in
+    batches by a process pool; the merged result is identical to a single-process run.
+
+    fix_policy controls the sqlfluff fix pre-pass: FIX_NEVER, FIX_FAILED (default; only
+    statements sqlglot cannot parse are fixed and re-parsed) or FIX_ALWAYS. Fixed
+    statements are cached on disk by content hash, so re-runs do not pay for sqlfluff again.
+
+    With debug_cleaned_sql=True the cleaned statements are streamed to
+    cleaned_sql_debug_path(...) under the application data directory as they are parsed.
+
+    If a ColumnLineage is given, the column lineage of views and CTAS queries (see
+    parse_column_lineage) is added to it from the same parse.
+    """
+    if fix_policy not in FIX_POLICIES:
+        raise ValueError(f"Invalid fix_policy {fix_policy!r}; expected one of {FIX_POLICIES}.")
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return _parse_input(
+        file_path_or_sql_string,
+        jobs=jobs,
+        fix_policy=fix_policy,
+        debug_cleaned_sql=debug_cleaned_sql,
+        lineage=lineage,
+    )
+
+
+def parse_column_lineage(
+    file_path_or_sql_string: Union[str, os.PathLike],
+    jobs: int = 1,
+    fix_policy: str = FIX_FAILED,
+) -> ColumnLineage:
+    """
+    Opt-in column-level lineage: parses the dump like parse_dump and additionally resolves, for
+    every view, materialized view and CREATE TABLE ... AS SELECT, which source columns each
+    output column derives from (see query_columns). Columns are named "schema.relation.column".
+
+    The result is a ColumnLineage, whose column names are interned to integer IDs and whose edges
+    are two integer arrays, so it stays compact on schemas with hundreds of thousands of columns.
+    It is also written to json_structure/column_lineage.json next to the table-level structure.
+    jobs and fix_policy behave as in parse_dump; to get both results from one parse, pass a
+    ColumnLineage to parse_dump, or column_lineage=True to generate_data_flow.parse_dump.
+    """
+    lineage = ColumnLineage()
+    parse_dump(file_path_or_sql_string, jobs=jobs, fix_policy=fix_policy, lineage=lineage)
+    write_column_lineage(lineage)
+    return lineage
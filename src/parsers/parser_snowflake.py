@@ -0,0 +1,328 @@
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlglot import exp
+
+from ..dataflow_structs import NodeInfo, InvalidSQLError
+from .parser_utils import GraphContext, compute_stats, open_input, parse_quietly, scan_references, split_statements
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+DEFAULT_BATCH_SIZE = 200  # Statements of one schema per work item in parallel mode
+
+_IDENT = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+_NAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT}){{0,2}}"
+_IDENT_RE = re.compile(_IDENT)
+
+_CREATE_RE = re.compile(
+    r"CREATE\s+(?:OR\s+REPLACE\s+)?"
+    r"(?P<modifiers>(?:(?:SECURE|RECURSIVE|MATERIALIZED|DYNAMIC|TRANSIENT|TEMPORARY|TEMP|VOLATILE|LOCAL|GLOBAL"
+    r"|EXTERNAL|ICEBERG|HYBRID|EVENT)\s+)*)"
+    rf"(?P<kind>TABLE|VIEW|STREAM|TASK|STAGE|SCHEMA|DATABASE)\s+(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>{_NAME})",
+    re.IGNORECASE,
+)
+_USE_RE = re.compile(rf"USE\s+(?:(?P<kind>SCHEMA|DATABASE)\s+)?(?P<name>{_NAME})\s*\Z", re.IGNORECASE)
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+
+_STRING = r"'(?:[^'\\]|\\.|'')*'|\$\$.*?\$\$"
+_COMMENT = r"--[^\n]*|//[^\n]*|/\*.*?\*/"
+_CTAS_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bAS\s*\(?\s*(?P<query>SELECT|WITH)\b", re.IGNORECASE | re.DOTALL)
+_TABLE_SOURCE_RE = re.compile(rf"\s+(?:CLONE|LIKE)\s+(?P<source>{_NAME})", re.IGNORECASE)
+_REFERENCES_RE = re.compile(rf"{_STRING}|{_COMMENT}|\bREFERENCES\s+(?P<ref>{_NAME})", re.IGNORECASE | re.DOTALL)
+_STREAM_SOURCE_RE = re.compile(
+    rf"\bON\s+(?:(?:EXTERNAL|DYNAMIC)\s+)?(?:TABLE|VIEW|STAGE)\s+(?P<source>{_NAME})", re.IGNORECASE
+)
+# Task clauses up to the AS that starts the task body: predecessors and streams tested in WHEN.
+_TASK_CLAUSE_RE = re.compile(
+    rf"""
+      (?P<string>{_STRING})
+    | {_COMMENT}
+    | \bAFTER\s+(?P<after>{_NAME}(?:\s*,\s*{_NAME})*)
+    | SYSTEM\$STREAM_HAS_DATA\s*\(\s*'(?P<stream>[^']+)'
+    | \bAS\b
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+# Fallback for statements sqlglot cannot parse: reads, writes and stage references in one pass.
+_BODY_SCAN_RE = re.compile(
+    rf"""
+      {_STRING}
+    | {_COMMENT}
+    | \b(?:INSERT\s+(?:OVERWRITE\s+)?INTO|MERGE\s+INTO|COPY\s+INTO|DELETE\s+FROM)\s+(?P<write>{_NAME})
+    | \bUPDATE\s+(?P<update>{_NAME})(?=\s+(?:(?!SET\b)\w+\s+)?SET\b)
+    | \b(?:FROM|JOIN|USING)\s+(?P<read>{_NAME})
+    | @(?P<stage>{_NAME})
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_STAGE_RE = re.compile(rf"{_STRING}|{_COMMENT}|@(?P<stage>{_NAME})", re.IGNORECASE | re.DOTALL)
+
+# Snowflake object kinds (with their CREATE modifiers) and the node types they map to.
+_NODE_TYPES = {
+    "VIEW": "view",
+    "MATERIALIZED VIEW": "materialized_view",
+    "TABLE": "table",
+    "DYNAMIC TABLE": "dynamic_table",
+    "STREAM": "stream",
+    "TASK": "task",
+    "STAGE": "stage",
+}
+
+
+def _name_parts(name: str) -> List[str]:
+    """Splits a dotted name; unquoted identifiers are upper-cased, as Snowflake resolves them."""
+    return [
+        part[1:-1].replace('""', '"') if part.startswith('"') else part.upper() for part in _IDENT_RE.findall(name)
+    ]
+
+
+def _table_parts(table: exp.Table) -> Optional[List[str]]:
+    """The normalized [catalog, db, name] parts of a sqlglot table, or None for table functions."""
+    parts = []
+    for arg in ("catalog", "db", "this"):
+        identifier = table.args.get(arg)
+        if identifier is None:
+            continue
+        if not isinstance(identifier, exp.Identifier):
+            return None
+        parts.append(identifier.this if identifier.quoted else identifier.this.upper())
+    return parts or None
+
+
+class ParseContext(GraphContext[NodeInfo]):
+    """
+    Graph under construction for one schema batch. Node keys are "SCHEMA.NAME" for objects of the
+    exported database and "DATABASE.SCHEMA.NAME" for objects of other databases.
+    """
+
+    def __init__(self, database: Optional[str] = None, schema: Optional[str] = None) -> None:
+        super().__init__()
+        self.database = database
+        self.schema = schema
+
+    def add_node(self, parts: List[str], node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node for a resolved name and returns its key. A defining statement (node_type given)
+        sets the type and definition; a bare reference only creates a table node if none exists yet.
+        """
+        database, schema = self.database, self.schema
+        if len(parts) == 2:
+            schema = parts[0]
+        elif len(parts) >= 3:
+            database, schema = parts[-3], parts[-2]
+        namespace = schema if database is None or database == self.database else f"{database}.{schema}"
+        key = f"{namespace}.{parts[-1]}" if namespace else parts[-1]
+        return self.upsert_node(key, namespace or "", node_type, definition)
+
+    def merge(self, node_types: Dict[str, NodeInfo], edges: List[Tuple[str, str]]) -> None:
+        """
+        Merges the result of a later batch. Defined objects win over bare references, so a view
+        referenced in one schema and created in another ends up a view whatever the batch order.
+        """
+        for key, info in node_types.items():
+            existing = self.node_types.get(key)
+            if existing is None or (info["definition"] and not existing["definition"]):
+                self.node_types[key] = info
+        for source, target in edges:
+            self.add_edge(source, target)
+
+
+def _add_stage_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    for _, stage in scan_references(_STAGE_RE, sql):
+        ctx.add_edge(ctx.add_node(_name_parts(stage)), key)
+
+
+def _scan_body_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    """Regex fallback: read tables and stages -> key -> written tables."""
+    for group, name in scan_references(_BODY_SCAN_RE, sql):
+        if group in ("write", "update"):
+            ctx.add_edge(key, ctx.add_node(_name_parts(name)))
+        else:
+            ctx.add_edge(ctx.add_node(_name_parts(name)), key)
+
+
+def _add_query_edges(ctx: ParseContext, key: str, query: exp.Expression) -> None:
+    """Adds source -> key edges for the tables a query reads, with its CTEs as cte_view nodes."""
+    cte_keys = {
+        cte.alias_or_name.upper(): ctx.add_cte(cte.alias_or_name.upper(), cte.sql(dialect="snowflake"))
+        for cte in query.find_all(exp.CTE)
+    }
+    for table in query.find_all(exp.Table):
+        parts = _table_parts(table)
+        if not parts:
+            continue
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        cte = table.find_ancestor(exp.CTE)
+        target = cte_keys[cte.alias_or_name.upper()] if cte else key
+        source = cte_keys.get(parts[0]) if len(parts) == 1 else None
+        ctx.add_edge(source or ctx.add_node(parts), target)
+
+
+def _add_dml_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    """Adds read -> key -> written edges for the DML body of a task."""
+    expressions = parse_quietly(sql, "snowflake")
+    if not expressions or any(isinstance(e, exp.Command) for e in expressions):
+        _scan_body_edges(ctx, key, sql)
+        return
+    for expression in expressions:
+        target = expression.this if isinstance(expression, (exp.Insert, exp.Merge, exp.Update, exp.Delete, exp.Copy)) else None
+        written = target if isinstance(target, exp.Table) else (target.find(exp.Table) if target else None)
+        written_parts = _table_parts(written) if written is not None else None
+        if written_parts:
+            ctx.add_edge(key, ctx.add_node(written_parts))
+        for table in expression.find_all(exp.Table):
+            if table is not written:
+                parts = _table_parts(table)
+                if parts:
+                    ctx.add_edge(ctx.add_node(parts), key)
+    _add_stage_edges(ctx, key, sql)
+
+
+def _process_object(ctx: ParseContext, statement: str, create: "re.Match[str]") -> None:
+    modifiers = {word.upper() for word in create.group("modifiers").split()}
+    kind = create.group("kind").upper()
+    qualifier = "MATERIALIZED " if "MATERIALIZED" in modifiers else "DYNAMIC " if "DYNAMIC" in modifiers else ""
+    node_type = _NODE_TYPES[qualifier + kind]
+    key = ctx.add_node(_name_parts(create.group("name")), node_type, statement)
+    rest = statement[create.end():]
+
+    if kind == "STREAM":
+        source = _STREAM_SOURCE_RE.search(rest)
+        if source:
+            ctx.add_edge(ctx.add_node(_name_parts(source.group("source"))), key)
+    elif kind == "TASK":
+        for match in _TASK_CLAUSE_RE.finditer(rest):
+            if match.group("after"):
+                for predecessor in re.split(r"\s*,\s*", match.group("after").strip()):
+                    ctx.add_edge(ctx.add_node(_name_parts(predecessor), "task"), key)
+            elif match.group("stream"):
+                ctx.add_edge(ctx.add_node(_name_parts(match.group("stream"))), key)
+            elif match.group("string") is None and match.group().upper() == "AS":
+                _add_dml_edges(ctx, key, rest[match.end():])
+                break
+    elif kind == "TABLE":
+        for ref in _REFERENCES_RE.finditer(rest):
+            if ref.group("ref"):
+                ctx.add_edge(key, ctx.add_node(_name_parts(ref.group("ref"))))
+        source = _TABLE_SOURCE_RE.match(rest)
+        if source:
+            ctx.add_edge(ctx.add_node(_name_parts(source.group("source"))), key)
+
+    is_query = kind == "VIEW" or node_type == "dynamic_table" or (
+        kind == "TABLE" and any(match.group("query") for match in _CTAS_RE.finditer(rest))
+    )
+    if is_query:
+        expressions = parse_quietly(statement, "snowflake")
+        query = expressions[0].expression if expressions and isinstance(expressions[0], exp.Create) else None
+        if isinstance(query, exp.Expression):
+            _add_query_edges(ctx, key, query)
+        else:
+            _scan_body_edges(ctx, key, rest)
+
+
+def _parse_schema_batch(
+    database: Optional[str], schema: Optional[str], statements: List[str]
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo]]:
+    """Parses statements of one schema into a partial result. Module-level so process pools can pickle it."""
+    ctx = ParseContext(database, schema)
+    for statement in statements:
+        create = _CREATE_RE.match(statement)
+        if create:
+            _process_object(ctx, statement, create)
+    return ctx.edges, ctx.node_types
+
+
+def _iter_schema_batches(
+    statements: Iterable[str], batch_size: int
+) -> Iterator[Tuple[Optional[str], Optional[str], List[str]]]:
+    """
+    Groups the object statements of a GET_DDL export by the database and schema they belong to,
+    following CREATE DATABASE/SCHEMA and USE. Each batch holds at most batch_size statements.
+    """
+    database: Optional[str] = None
+    schema: Optional[str] = None
+    batch: List[str] = []
+    for statement in statements:
+        statement = statement[_LEADING_COMMENTS_RE.match(statement).end():]  # type: ignore[union-attr]
+        create = _CREATE_RE.match(statement)
+        use = _USE_RE.match(statement) if not create else None
+        scope = (create.group("kind").upper(), create.group("name")) if create else None
+        if use:
+            scope = ((use.group("kind") or "DATABASE").upper(), use.group("name"))
+        if scope and scope[0] in ("DATABASE", "SCHEMA"):
+            if batch:
+                yield database, schema, batch
+                batch = []
+            parts = _name_parts(scope[1])
+            if scope[0] == "DATABASE":
+                database, schema = parts[-1], None
+            else:
+                database = parts[-2] if len(parts) > 1 else database
+                schema = parts[-1]
+        elif create:
+            batch.append(statement)
+            if len(batch) >= batch_size:
+                yield database, schema, batch
+                batch = []
+    if batch:
+        yield database, schema, batch
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses a Snowflake GET_DDL('DATABASE', ...) export (or a string of Snowflake DDL) into
+    (edges, node_types, stats).
+
+    Lineage nodes and their types:
+      - views and secure views ("view"), materialized views ("materialized_view") and dynamic
+        tables ("dynamic_table"): source -> object, parsed with sqlglot, CTEs as "cte_view";
+      - tables ("table"): foreign keys (local -> referenced), CTAS sources, CLONE/LIKE sources;
+      - streams ("stream"): source table/view/stage -> stream;
+      - tasks ("task"): predecessor task (AFTER) and streams tested in WHEN -> task, tables and
+        stages read by the body -> task -> written tables;
+      - stages ("stage").
+    Unqualified names resolve against the current schema, set by CREATE SCHEMA and USE as in the
+    export; node keys are "SCHEMA.NAME", prefixed with the database for other databases.
+
+    The input is read and split one line at a time. Statements are grouped per schema into
+    batches of at most batch_size; with jobs > 1 (or jobs <= 0 for one worker per CPU core) the
+    batches are parsed by a process pool and merged in export order into one graph.
+
+    Raises:
+        InvalidSQLError: if no supported CREATE statement was found.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    ctx = ParseContext()
+
+    with open_input(file_path_or_sql_string) as source:
+        batches = _iter_schema_batches(split_statements(source, backslash_escapes=True), batch_size)
+        if jobs > 1:
+            pending: Deque[Future] = deque()
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for batch in batches:
+                    pending.append(executor.submit(_parse_schema_batch, *batch))
+                    if len(pending) >= jobs * 2:
+                        edges, node_types = pending.popleft().result()
+                        ctx.merge(node_types, edges)
+                while pending:
+                    edges, node_types = pending.popleft().result()
+                    ctx.merge(node_types, edges)
+        else:
+            for batch in batches:
+                edges, node_types = _parse_schema_batch(*batch)
+                ctx.merge(node_types, edges)
+
+    if not ctx.node_types:
+        raise InvalidSQLError("Invalid SQL or no supported CREATE statements found in the Snowflake export.")
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
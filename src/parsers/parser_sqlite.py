@@ -0,0 +1,222 @@
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import SqlglotError
+
+from ..dataflow_structs import NodeInfo, InvalidSQLError
+from .parser_utils import GraphContext, MappedInput, compute_stats, open_input, scan_references
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+SQLITE_HEADER = b"SQLite format 3\x00"  # First 16 bytes of every SQLite database file
+SCHEMA = "main"  # SQLite's name for the schema of the opened database
+
+# Every object of the database in one query; internal sqlite_* tables and indexes are left out.
+_SCHEMA_QUERY = """
+    SELECT type, name, tbl_name, sql FROM sqlite_master
+    WHERE type IN ('table', 'view', 'trigger') AND sql IS NOT NULL AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+    ORDER BY rowid
+"""
+# Foreign keys as SQLite itself resolved them, so table DDL never needs to be parsed.
+_FOREIGN_KEY_QUERY = """
+    SELECT DISTINCT m.name, fk."table" FROM sqlite_master AS m, pragma_foreign_key_list(m.name) AS fk
+    WHERE m.type = 'table'
+"""
+
+# Lines of a `sqlite3 .dump` that carry data or transaction control; skipped without being buffered.
+_DATA_LINE_PREFIXES = (b"INSERT INTO ", b"BEGIN TRANSACTION;", b"COMMIT;", b"PRAGMA ", b"DELETE FROM ", b"ANALYZE ")
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+
+_IDENT = r'(?:"(?:[^"]|"")+"|\[[^\]]+\]|`(?:[^`]|``)+`|[A-Za-z0-9_$]+)'
+_NAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT})?"
+_IDENT_RE = re.compile(_IDENT)
+_TRIGGER_BODY_RE = re.compile(r"\bBEGIN\b", re.IGNORECASE)
+
+_STRING = r"'(?:[^']|'')*'"
+_COMMENT = r"--[^\n]*|/\*.*?\*/"
+# Reads and writes in trigger bodies, in one pass; strings and comments produce no reference.
+_BODY_SCAN_RE = re.compile(
+    rf"""
+      {_STRING}
+    | {_COMMENT}
+    | \b(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|DELETE\s+FROM)\s+(?P<write>{_NAME})
+    | \bUPDATE\s+(?:OR\s+\w+\s+)?(?P<update>{_NAME})(?=\s+(?:(?!SET\b)\w+\s+)?SET\b)
+    | \b(?:FROM|JOIN)\s+(?P<read>{_NAME})
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_NOT_TABLES = {"new", "old"}
+
+
+def _unquote(part: str) -> str:
+    if part[0] in "\"`":
+        return part[1:-1].replace(part[0] * 2, part[0])
+    if part[0] == "[":
+        return part[1:-1]
+    return part
+
+
+class ParseContext(GraphContext[NodeInfo]):
+    """
+    Graph under construction for one parse_dump call. All objects live in the "main" schema, so
+    node keys are bare names. SQLite compares names without regard to case; the spelling stored
+    in sqlite_master is used for every reference.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._keys: Dict[str, str] = {}  # Lower-cased name -> name as first spelled
+
+    def add_node(self, name: str, node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node and returns its key. A defining row (node_type given) sets the type and
+        definition; a bare reference only creates a table node if the object is not known.
+        """
+        return self.upsert_node(self._keys.setdefault(name.lower(), name), SCHEMA, node_type, definition)
+
+    def add_reference(self, name: str) -> str:
+        """Adds a node for a possibly schema-qualified, quoted name from SQL text."""
+        return self.add_node(_unquote(_IDENT_RE.findall(name)[-1]))
+
+
+def _add_body_edges(ctx: ParseContext, key: str, body: str) -> None:
+    for group, name in scan_references(_BODY_SCAN_RE, body):
+        if group in ("write", "update"):
+            ctx.add_edge(key, ctx.add_reference(name))
+        elif _unquote(_IDENT_RE.findall(name)[-1]).lower() not in _NOT_TABLES:
+            ctx.add_edge(ctx.add_reference(name), key)
+
+
+def _process_view(ctx: ParseContext, key: str, sql: str) -> None:
+    """Adds the dependencies of a view, parsing its query with sqlglot and falling back to a scan."""
+    try:
+        expression = sqlglot.parse_one(sql, read="sqlite")
+    except SqlglotError:
+        expression = None
+    query = expression.expression if isinstance(expression, exp.Create) else None
+    if not isinstance(query, exp.Expression):
+        _add_body_edges(ctx, key, sql)
+        return
+
+    cte_keys: Dict[str, str] = {}
+    for cte in query.find_all(exp.CTE):
+        cte_keys[cte.alias_or_name.lower()] = ctx.add_node(cte.alias_or_name, "cte_view", cte.sql(dialect="sqlite"))
+    for table in query.find_all(exp.Table):
+        if not table.name:
+            continue  # Table-valued functions such as json_each(...)
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        enclosing = table.find_ancestor(exp.CTE)
+        target = cte_keys[enclosing.alias_or_name.lower()] if enclosing else key
+        source = None if table.db else cte_keys.get(table.name.lower())
+        ctx.add_edge(source or ctx.add_node(table.name), target)
+
+
+def _process_object(ctx: ParseContext, object_type: str, name: str, table_name: str, sql: str) -> None:
+    if object_type == "table":
+        ctx.add_node(name, "table", sql)
+    elif object_type == "view":
+        _process_view(ctx, ctx.add_node(name, "view", sql), sql)
+    else:
+        key = ctx.add_node(name, "trigger", sql)
+        ctx.add_edge(ctx.add_node(table_name), key)
+        body = _TRIGGER_BODY_RE.search(sql)
+        if body:
+            _add_body_edges(ctx, key, sql[body.end():])
+
+
+def _is_database_file(file_path_or_sql_string: Union[str, os.PathLike]) -> bool:
+    if not os.path.isfile(file_path_or_sql_string):
+        return False
+    with open(file_path_or_sql_string, "rb") as f:
+        return f.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+
+
+def _load_schema(source: MappedInput) -> sqlite3.Connection:
+    """
+    Replays the CREATE statements of a SQL text (e.g. `sqlite3 .dump` output) into an in-memory
+    database, so text input is read back from sqlite_master like a database file. Statements
+    end where sqlite3.complete_statement says so, which keeps ";" inside trigger bodies intact.
+    Data lines are recognised in the mapped bytes and skipped without being decoded. Statements
+    SQLite rejects are skipped.
+    """
+    connection = sqlite3.connect(":memory:")
+    buffer: List[str] = []
+    for start, end in source.line_spans():
+        if not buffer and source.startswith(_DATA_LINE_PREFIXES, start) and source.line_endswith(b";", start, end):
+            continue
+        line = source.text(start, end)
+        if not buffer and not line.strip():
+            continue
+        buffer.append(line)
+        # A complete statement ends with ";", so the buffer is only checked at such lines.
+        if not line.rstrip().endswith(";"):
+            continue
+        statement = "".join(buffer)
+        if not sqlite3.complete_statement(statement):
+            continue
+        buffer = []
+        statement = statement[_LEADING_COMMENTS_RE.match(statement).end():]  # type: ignore[union-attr]
+        if statement[:6].upper() == "CREATE":
+            try:
+                connection.executescript(statement)
+            except sqlite3.Error:
+                pass
+    return connection
+
+
+def _connect(file_path_or_sql_string: Union[str, os.PathLike]) -> sqlite3.Connection:
+    if _is_database_file(file_path_or_sql_string):
+        uri = Path(file_path_or_sql_string).resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+    with open_input(file_path_or_sql_string) as source:
+        return _load_schema(source)
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses a SQLite database file (or a `sqlite3 .dump` file or SQL string) into (edges, node_types, stats).
+
+    A database file is opened read-only and its schema is read from sqlite_master in one query;
+    no dump is produced and table data is never touched. Text input is first replayed, CREATE
+    statements only, into an in-memory database and then read the same way.
+
+    Extracted:
+      - tables (type "table"), with foreign key edges (local -> referenced) taken from
+        pragma_foreign_key_list, so table DDL is not parsed at all;
+      - views (type "view"), parsed with sqlglot: source -> view, CTEs as "cte_view" nodes;
+      - triggers (type "trigger"): table -> trigger, read tables -> trigger, trigger -> written tables.
+    All objects belong to the "main" schema; node keys are the object names.
+
+    Raises:
+        InvalidSQLError: if the input is not a SQLite database or holds no table, view or trigger.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    ctx = ParseContext()
+    connection = _connect(file_path_or_sql_string)
+    try:
+        rows = connection.execute(_SCHEMA_QUERY).fetchall()
+        foreign_keys = connection.execute(_FOREIGN_KEY_QUERY).fetchall()
+    except sqlite3.DatabaseError as e:
+        raise InvalidSQLError(f"Could not read the SQLite schema: {e}") from e
+    finally:
+        connection.close()
+
+    if not rows:
+        raise InvalidSQLError("Invalid SQL or no tables, views or triggers found in the SQLite database.")
+    # Defining rows first, so references use the spelling stored in sqlite_master.
+    for _, name, _, _ in rows:
+        ctx.add_node(name)
+    for object_type, name, table_name, sql in rows:
+        _process_object(ctx, object_type, name, table_name, sql)
+    for table, referenced in foreign_keys:
+        ctx.add_edge(ctx.add_node(table), ctx.add_node(referenced))
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
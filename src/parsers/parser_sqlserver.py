@@ -0,0 +1,428 @@
+import codecs
+import os
+import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from sqlglot import exp
+
+from ..dataflow_structs import NodeInfo, InvalidSQLError
+from .parser_utils import GraphContext, MappedInput, StatementSplitter, compute_stats, open_input, parse_quietly
+
+PARSER_VERSION = "1"  # Bump when parse results change, to invalidate the parse cache
+
+DEFAULT_BATCH_SIZE = 100  # GO batches per work item in parallel mode
+DEFAULT_SCHEMA = "dbo"  # Schema of unqualified names, as for a login without a default schema
+
+# A batch separator: GO alone on its line, optionally with a repeat count and a trailing comment.
+_GO_RE = re.compile(r"[ \t]*GO(?:[ \t]+\d+)?[ \t]*(?:--[^\n]*)?\r?\n?\Z", re.IGNORECASE)
+
+_QUOTED_IDENT = r'\[(?:[^\]]|\]\])+\]|"(?:[^"]|"")+"'
+_IDENT = rf"(?:{_QUOTED_IDENT}|[#@]{{0,2}}[A-Za-z_][A-Za-z0-9_@$#]*)"
+_NAME = rf"{_IDENT}(?:\s*\.\s*{_IDENT}){{0,3}}"
+_IDENT_RE = re.compile(_IDENT)
+
+_STRING = r"N?'(?:[^']|'')*'"
+_COMMENT = r"--[^\n]*|/\*.*?\*/"
+# Alternatives that consume text which can contain keywords without being code.
+_SKIP = rf"{_STRING}|{_COMMENT}|{_QUOTED_IDENT}"
+
+_LEADING_COMMENTS_RE = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+_USE_RE = re.compile(rf"USE\s+(?P<db>{_IDENT})\s*;?\s*\Z", re.IGNORECASE)
+# Modules must be the first statement of their batch, so the whole batch is their definition.
+_MODULE_RE = re.compile(
+    r"(?:CREATE(?:\s+OR\s+ALTER)?|ALTER)\s+"
+    rf"(?P<kind>VIEW|PROCEDURE|PROC|FUNCTION|TRIGGER)\s+(?P<name>{_NAME})",
+    re.IGNORECASE,
+)
+_TABLE_RE = re.compile(rf"(?P<verb>CREATE|ALTER)\s+TABLE\s+(?P<name>{_NAME})", re.IGNORECASE)
+_SYNONYM_RE = re.compile(
+    rf"CREATE\s+SYNONYM\s+(?P<name>{_NAME})\s+FOR\s+(?P<target>{_NAME})", re.IGNORECASE
+)
+# Statement starts within a batch that holds no module; T-SQL does not need semicolons between them.
+_STATEMENT_START_RE = re.compile(
+    rf"""
+      {_SKIP}
+    | ^[ \t]*(?P<start>(?:CREATE|ALTER|DROP|SET|EXEC|EXECUTE|GRANT|DENY|REVOKE|PRINT|IF|DECLARE
+                         |INSERT|UPDATE|DELETE|USE)\b)
+    | (?P<semicolon>;)
+    """,
+    re.IGNORECASE | re.DOTALL | re.MULTILINE | re.VERBOSE,
+)
+_REFERENCES_RE = re.compile(rf"{_SKIP}|\bREFERENCES\s+(?P<ref>{_NAME})", re.IGNORECASE | re.DOTALL)
+_TRIGGER_TABLE_RE = re.compile(rf"\s+ON\s+(?P<table>{_NAME})", re.IGNORECASE)
+_TRIGGER_BODY_RE = re.compile(rf"{_SKIP}|\bEXEC(?:UTE)?\s+AS\b|\bAS\b", re.IGNORECASE | re.DOTALL)
+
+_KEYWORDS = (
+    "WHERE|ON|JOIN|INNER|LEFT|RIGHT|FULL|CROSS|OUTER|APPLY|GROUP|ORDER|HAVING|UNION|EXCEPT|INTERSECT"
+    "|WITH|SET|SELECT|INSERT|UPDATE|DELETE|MERGE|TRUNCATE|IF|ELSE|BEGIN|END|RETURN|WHEN|THEN|OPTION"
+    "|FOR|DECLARE|EXEC|EXECUTE|PRINT|WHILE|COMMIT|ROLLBACK|OUTPUT|USING|PIVOT|UNPIVOT|WINDOW"
+)
+_TOP = r"(?:TOP\s*\([^)]*\)\s*(?:PERCENT\s+)?)?"
+# Fallback for bodies sqlglot cannot parse: reads, writes and the aliases of read tables, in one pass.
+# INSERT/MERGE/DELETE consume their INTO/FROM, so a remaining INTO is a SELECT ... INTO.
+_BODY_SCAN_RE = re.compile(
+    rf"""
+      {_SKIP}
+    | \b(?:INSERT|MERGE)\s+{_TOP}(?:INTO\s+)?(?P<write>{_NAME})
+    | \bDELETE\s+{_TOP}(?:FROM\s+)?(?P<delete>{_NAME})
+    | \bUPDATE\s+{_TOP}(?P<update>{_NAME})(?=\s+(?:WITH\s*\([^)]*\)\s*)?SET\b)
+    | \bTRUNCATE\s+TABLE\s+(?P<truncate>{_NAME})
+    | \bINTO\s+(?P<into>{_NAME})
+    | \b(?:FROM|JOIN|USING)\s+(?P<read>{_NAME})(?:\s+(?:AS\s+)?(?!(?:{_KEYWORDS})\b)(?P<alias>{_IDENT}))?
+    """,
+    re.IGNORECASE | re.DOTALL | re.VERBOSE,
+)
+_NOT_TABLES = {"inserted", "deleted"}  # Trigger pseudo-tables
+
+_NODE_TYPES = {"VIEW": "view", "PROCEDURE": "procedure", "PROC": "procedure", "FUNCTION": "function", "TRIGGER": "trigger"}
+
+
+def _name_parts(name: str) -> List[str]:
+    """Splits a dotted name, unquoting [bracketed] and "quoted" identifiers."""
+    parts = []
+    for part in _IDENT_RE.findall(name):
+        if part.startswith("["):
+            part = part[1:-1].replace("]]", "]")
+        elif part.startswith('"'):
+            part = part[1:-1].replace('""', '"')
+        parts.append(part)
+    return parts
+
+
+def _is_local(parts: List[str]) -> bool:
+    """Temporary tables and table variables are not lineage nodes."""
+    return parts[-1].startswith(("#", "@")) or (len(parts) == 1 and parts[0].lower() in _NOT_TABLES)
+
+
+def _table_parts(table: exp.Table) -> Optional[List[str]]:
+    """The [catalog, db, name] parts of a sqlglot table; None for table variables, temp tables and functions."""
+    parts = []
+    for arg in ("catalog", "db", "this"):
+        identifier = table.args.get(arg)
+        if identifier is None:
+            continue
+        if not isinstance(identifier, exp.Identifier) or identifier.args.get("temporary") or identifier.args.get("global_"):
+            return None
+        parts.append(identifier.this)
+    return parts if parts and not _is_local(parts) else None
+
+
+class ParseContext(GraphContext[NodeInfo]):
+    """
+    Graph under construction for one work item. Node keys are "schema.name" for objects of the
+    current database and "database.schema.name" for others. SQL Server compares names without
+    regard to case, so the first spelling seen of a name is used for all later ones.
+    """
+
+    def __init__(self, database: Optional[str] = None) -> None:
+        super().__init__()
+        self.database = database
+        self._keys: Dict[str, str] = {}  # Lower-cased key -> key as first spelled
+
+    def _canonical(self, key: str) -> str:
+        return self._keys.setdefault(key.lower(), key)
+
+    def add_node(self, parts: List[str], node_type: Optional[str] = None, definition: Optional[str] = None) -> str:
+        """
+        Adds a node for a resolved name and returns its key. A defining statement (node_type given)
+        sets the type and definition; a bare reference only creates a table node if none exists yet.
+        """
+        database, schema = self.database, DEFAULT_SCHEMA
+        if len(parts) == 2:
+            schema = parts[0]
+        elif len(parts) >= 3:
+            database, schema = parts[-3], parts[-2]
+        same_database = database is None or (self.database is not None and database.lower() == self.database.lower())
+        namespace = schema if same_database else f"{database}.{schema}"
+        key = self._canonical(f"{namespace}.{parts[-1]}")
+        return self.upsert_node(key, key.rsplit(".", 1)[0], node_type, definition)
+
+    def merge(self, node_types: Dict[str, NodeInfo], edges: List[Tuple[str, str]]) -> None:
+        """
+        Merges the result of a later work item. A definition replaces a bare reference and is
+        appended to an earlier definition (e.g. ALTER TABLE after CREATE TABLE), so merging work
+        items in script order gives the sequential result.
+        """
+        for key, info in node_types.items():
+            canonical = self._canonical(key)
+            existing = self.node_types.get(canonical)
+            if existing is None:
+                info["full_name"] = canonical
+                self.node_types[canonical] = info
+            elif info["definition"]:
+                if not existing["definition"]:
+                    existing["type"] = info["type"]
+                self.append_definition(canonical, info["definition"])
+        for source, target in edges:
+            self.add_edge(self._canonical(source), self._canonical(target))
+
+
+def _scan_body_edges(ctx: ParseContext, key: str, sql: str) -> None:
+    """Regex fallback: read tables -> key -> written tables. Written aliases resolve to their table."""
+    reads: List[List[str]] = []
+    writes: List[List[str]] = []
+    aliases: Dict[str, List[str]] = {}
+    for match in _BODY_SCAN_RE.finditer(sql):
+        written = match.group("write") or match.group("delete") or match.group("update") or match.group("truncate")
+        written = written or match.group("into")
+        if written:
+            writes.append(_name_parts(written))
+        elif match.group("read"):
+            reads.append(_name_parts(match.group("read")))
+            if match.group("alias"):
+                aliases[_name_parts(match.group("alias"))[0].lower()] = reads[-1]
+    written_tables = [aliases.get(parts[0].lower(), parts) if len(parts) == 1 else parts for parts in writes]
+    for parts in reads:
+        if not _is_local(parts) and parts not in written_tables:
+            ctx.add_edge(ctx.add_node(parts), key)
+    for parts in written_tables:
+        if not _is_local(parts):
+            ctx.add_edge(key, ctx.add_node(parts))
+
+
+def _add_query_edges(ctx: ParseContext, key: str, query: exp.Expression) -> None:
+    """Adds source -> key edges for the tables a view reads, with its CTEs as cte_view nodes."""
+    cte_keys: Dict[str, str] = {}
+    for cte in query.find_all(exp.CTE):
+        name = ctx.add_cte(cte.alias_or_name, cte.sql(dialect="tsql"))
+        cte_keys[name.lower()] = name
+    for table in query.find_all(exp.Table):
+        parts = _table_parts(table)
+        if not parts:
+            continue
+        # A table inside a CTE feeds that CTE; an unqualified name matching a CTE is the CTE itself.
+        enclosing = table.find_ancestor(exp.CTE)
+        target = cte_keys[enclosing.alias_or_name.lower()] if enclosing else key
+        source = cte_keys.get(parts[0].lower()) if len(parts) == 1 else None
+        ctx.add_edge(source or ctx.add_node(parts), target)
+
+
+def _add_body_edges(ctx: ParseContext, key: str, body: exp.Expression) -> None:
+    """Adds read -> key -> written edges for the INSERT, MERGE, UPDATE, DELETE and SELECT INTO of a module."""
+    aliases = {table.alias.lower(): table for table in body.find_all(exp.Table) if table.alias}
+    ctes = {cte.alias_or_name.lower() for cte in body.find_all(exp.CTE)}
+    skipped: Set[int] = set()  # Targets and the tables their aliases stand for
+    for node in body.find_all(exp.Insert, exp.Merge, exp.Update, exp.Delete, exp.Into):
+        target = node.this.this if isinstance(node.this, exp.Schema) else node.this
+        if not isinstance(target, exp.Table):
+            continue
+        skipped.add(id(target))
+        if not target.db and target.name.lower() in aliases:
+            target = aliases[target.name.lower()]
+            skipped.add(id(target))
+        parts = _table_parts(target)
+        if parts and not (len(parts) == 1 and parts[0].lower() in ctes):
+            ctx.add_edge(key, ctx.add_node(parts))
+    for table in body.find_all(exp.Table):
+        parts = _table_parts(table)
+        if parts and id(table) not in skipped and not (len(parts) == 1 and parts[0].lower() in ctes):
+            ctx.add_edge(ctx.add_node(parts), key)
+
+
+def _process_module(ctx: ParseContext, batch: str, module: "re.Match[str]") -> None:
+    """Adds a view, procedure, function or trigger, whose definition is the whole batch."""
+    kind = module.group("kind").upper()
+    key = ctx.add_node(_name_parts(module.group("name")), _NODE_TYPES[kind], batch)
+    rest = batch[module.end():]
+
+    if kind == "TRIGGER":
+        on = _TRIGGER_TABLE_RE.match(rest)
+        if on and on.group("table").upper() not in ("DATABASE", "ALL"):
+            ctx.add_edge(ctx.add_node(_name_parts(on.group("table"))), key)
+        for match in _TRIGGER_BODY_RE.finditer(rest):
+            if match.group().upper() == "AS":
+                _scan_body_edges(ctx, key, rest[match.end():])
+                break
+        return
+
+    expressions = parse_quietly(batch, "tsql")
+    create = expressions[0] if len(expressions) == 1 and isinstance(expressions[0], exp.Create) else None
+    body = create.expression if create is not None else None
+    # sqlglot falls back to opaque commands for T-SQL it does not know, silently dropping what follows.
+    if not isinstance(body, exp.Expression) or any(isinstance(node, exp.Command) for node in body.walk()):
+        _scan_body_edges(ctx, key, rest)
+    elif kind == "VIEW":
+        _add_query_edges(ctx, key, body)
+    else:
+        _add_body_edges(ctx, key, body)
+
+
+def _split_batch(batch: str) -> Iterator[str]:
+    """Yields the statements of a batch that holds no module."""
+    start = 0
+    for match in _STATEMENT_START_RE.finditer(batch):
+        if match.group("start") or match.group("semicolon"):
+            statement = batch[start:match.start()].strip()
+            if statement:
+                yield statement
+            start = match.end() if match.group("semicolon") else match.start()
+    statement = batch[start:].strip()
+    if statement:
+        yield statement
+
+
+def _process_batch(ctx: ParseContext, batch: str) -> bool:
+    """Adds the nodes and edges of one GO batch. Returns True when it held DDL of interest."""
+    module = _MODULE_RE.match(batch)
+    if module:
+        _process_module(ctx, batch, module)
+        return True
+
+    found_ddl = False
+    for statement in _split_batch(batch):
+        table = _TABLE_RE.match(statement)
+        synonym = _SYNONYM_RE.match(statement)
+        if table:
+            if table.group("verb").upper() == "CREATE":
+                key = ctx.add_node(_name_parts(table.group("name")), "table", statement)
+            else:
+                key = ctx.add_node(_name_parts(table.group("name")))
+                ctx.append_definition(key, statement)
+            # Foreign keys point from the referencing table to the referenced one, like the Postgres parser.
+            for ref in _REFERENCES_RE.finditer(statement, table.end()):
+                if ref.group("ref"):
+                    ctx.add_edge(key, ctx.add_node(_name_parts(ref.group("ref"))))
+        elif synonym:
+            key = ctx.add_node(_name_parts(synonym.group("name")), "synonym", statement)
+            ctx.add_edge(ctx.add_node(_name_parts(synonym.group("target"))), key)
+        else:
+            continue
+        found_ddl = True
+    return found_ddl
+
+
+def _parse_batches(
+    database: Optional[str], batches: List[str]
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], bool]:
+    """
+    Parses GO batches of one database into a partial result, also reporting whether any
+    relevant DDL was seen. Module-level so process pools can pickle it.
+    """
+    ctx = ParseContext(database)
+    found_ddl = False
+    for batch in batches:
+        found_ddl = _process_batch(ctx, batch) or found_ddl
+    return ctx.edges, ctx.node_types, found_ddl
+
+
+def _strip_leading_comments(batch: Optional[str]) -> str:
+    return batch[_LEADING_COMMENTS_RE.match(batch).end():] if batch else ""  # type: ignore[union-attr]
+
+
+def iter_batches(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yields the GO-separated batches of a T-SQL script, with leading comments removed.
+    A GO line inside a string, bracketed identifier or block comment does not end a batch.
+    Only the batch currently being read is held in memory.
+    """
+    splitter = StatementSplitter(dollar_quotes=False, bracket_quotes=True, delimiter=None)
+    for line in lines:
+        if splitter.in_quote_or_comment or not _GO_RE.match(line):
+            splitter.feed(line)
+            continue
+        batch = _strip_leading_comments(splitter.flush())
+        if batch:
+            yield batch
+    batch = _strip_leading_comments(splitter.flush())
+    if batch:
+        yield batch
+
+
+def _iter_work_items(batches: Iterable[str], batch_size: int) -> Iterator[Tuple[Optional[str], List[str]]]:
+    """Groups batches into work items of at most batch_size, each tagged with the database set by USE."""
+    database: Optional[str] = None
+    item: List[str] = []
+    for batch in batches:
+        use = _USE_RE.match(batch)
+        if use:
+            if item:
+                yield database, item
+                item = []
+            database = _name_parts(use.group("db"))[0]
+            continue
+        item.append(batch)
+        if len(item) >= batch_size:
+            yield database, item
+            item = []
+    if item:
+        yield database, item
+
+
+def _open_input(file_path_or_sql_string: Union[str, os.PathLike]) -> Union[MappedInput, IO[str]]:
+    """
+    Opens the input for line-by-line reading; any string that is not an existing file is treated as
+    SQL content. Files are memory-mapped (see MappedInput), except UTF-16 ones, which SSMS writes by
+    default: a byte order mark selects the encoding, and UTF-16 lines cannot be found byte-wise.
+    """
+    if isinstance(file_path_or_sql_string, (str, os.PathLike)) and os.path.exists(file_path_or_sql_string):
+        with open(file_path_or_sql_string, "rb") as f:
+            bom = f.read(3)
+        if bom.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return open(file_path_or_sql_string, "r", encoding="utf-16", errors="replace")
+        return MappedInput.open(file_path_or_sql_string, "utf-8-sig" if bom == codecs.BOM_UTF8 else "utf-8")
+    return open_input(file_path_or_sql_string)
+
+
+def parse_dump(
+    file_path_or_sql_string: Union[str, os.PathLike],
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], Dict[str, int]]:
+    """
+    Parses a SQL Server script, such as SSMS "Generate Scripts" output (or a string of T-SQL),
+    into (edges, node_types, stats).
+
+    Lineage nodes and their types:
+      - views ("view"): source -> view, parsed with sqlglot's tsql dialect, CTEs as "cte_view";
+      - procedures and functions ("procedure"/"function"): tables read -> module -> tables
+        written by INSERT ... SELECT, MERGE, UPDATE, DELETE and SELECT ... INTO;
+      - triggers ("trigger"): table -> trigger, with the same read/write edges from the body;
+      - tables ("table"): FOREIGN KEY ... REFERENCES edges (local -> referenced), also from
+        ALTER TABLE;
+      - synonyms ("synonym"): base object -> synonym.
+    Module bodies sqlglot cannot fully parse are scanned with regular expressions instead.
+    Unqualified names resolve to the dbo schema; node keys are "schema.name", prefixed with the
+    database for objects outside the one selected by USE. Temp tables and table variables are
+    not nodes.
+
+    The input is read one line at a time and split into GO batches. Batches are grouped into
+    work items of at most batch_size; with jobs > 1 (or jobs <= 0 for one worker per CPU core)
+    the work items are parsed by a process pool and merged in script order into one graph.
+
+    Raises:
+        InvalidSQLError: if no supported DDL statement was found.
+        ValueError: if the input is neither an existing file nor a string.
+    """
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    ctx = ParseContext()
+    found_ddl = False
+
+    def _collect(result: Tuple[List[Tuple[str, str]], Dict[str, NodeInfo], bool]) -> None:
+        nonlocal found_ddl
+        edges, node_types, part_found = result
+        ctx.merge(node_types, edges)
+        found_ddl = found_ddl or part_found
+
+    with _open_input(file_path_or_sql_string) as source:
+        work_items = _iter_work_items(iter_batches(source), batch_size)
+        if jobs > 1:
+            pending: Deque[Future] = deque()
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                for item in work_items:
+                    pending.append(executor.submit(_parse_batches, *item))
+                    if len(pending) >= jobs * 2:
+                        _collect(pending.popleft().result())
+                while pending:
+                    _collect(pending.popleft().result())
+        else:
+            for item in work_items:
+                _collect(_parse_batches(*item))
+
+    if not found_ddl:
+        raise InvalidSQLError("Invalid SQL or no supported DDL statements found in the SQL Server script.")
+
+    node_types = dict(sorted(ctx.node_types.items()))
+    return ctx.edges, node_types, compute_stats(node_types)
@@ -0,0 +1,429 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Generic, Iterable, Iterator, List, Mapping, Optional, Pattern, Set, Tuple, TypeVar, Union, cast
+
+from .. import path_utils
+from ..dataflow_structs import ColumnLineage, NodeInfo
+
+if TYPE_CHECKING:
+    from sqlglot import exp
+
+# Directory holding sqlfluff-fixed SQL, one file per (dialect, options, statement) hash.
+SQLFLUFF_CACHE_DIR = path_utils.DATA_FLOW_BASE_DIR / "cache" / "sqlfluff_fix"
+
+
+def _sqlfluff_version() -> Optional[str]:
+    """Returns the installed sqlfluff version, or None if sqlfluff is not installed."""
+    try:
+        import sqlfluff
+    except ImportError:
+        return None
+    return getattr(sqlfluff, "__version__", "unknown")
+
+
+def _cache_path(sql: str, dialect: str, fix_even_unparsable: bool, version: str) -> Path:
+    key = "\0".join((version, dialect, str(fix_even_unparsable), sql))
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return SQLFLUFF_CACHE_DIR / digest[:2] / f"{digest}.sql"
+
+
+def cached_sqlfluff_fix(sql: str, dialect: str, fix_even_unparsable: bool = False) -> str:
+    """
+    Runs sqlfluff.fix on a piece of SQL, caching the result on disk by content hash.
+    sqlfluff is imported lazily; if it is not installed the SQL is returned unchanged.
+    The sqlfluff version is part of the key, so upgrading sqlfluff invalidates old entries.
+    """
+    version = _sqlfluff_version()
+    if version is None:
+        return sql
+
+    cache_file = _cache_path(sql, dialect, fix_even_unparsable, version)
+    try:
+        return cache_file.read_text(encoding="utf-8")
+    except OSError:
+        pass
+
+    import sqlfluff
+
+    if fix_even_unparsable:
+        fixed = sqlfluff.fix(sql, dialect=dialect, fix_even_unparsable=True)
+    else:
+        fixed = sqlfluff.fix(sql, dialect=dialect)
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and rename so concurrent workers never read partial entries.
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(fixed, encoding="utf-8")
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # The cache is an optimization; a read-only data dir must not break parsing.
+    return fixed
+
+
+class StatementSplitter:
+    """
+    Incrementally splits SQL text on top-level statement delimiters in a single linear pass.
+    Single-quoted strings, double-quoted identifiers, comments and, depending on the dialect
+    options, dollar-quoted bodies, backtick or bracketed identifiers and backslash escapes are
+    tracked across calls to feed(), so a delimiter or quote inside them never ends or starts
+    anything. Comments are kept in the statement text. Only the statement currently being
+    accumulated is held in memory. The delimiter can be changed between feeds, as MySQL's
+    DELIMITER command does; with delimiter=None nothing is split and flush() returns all text
+    fed so far, for callers that only need the quoting state (see in_quote_or_comment).
+    """
+
+    _DOLLAR_TAG_RE = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+    _PARTIAL_DOLLAR_TAG_RE = re.compile(r"\$[A-Za-z0-9_]*\Z")
+
+    def __init__(
+        self,
+        dollar_quotes: bool = True,
+        hash_comments: bool = False,
+        backtick_quotes: bool = False,
+        backslash_escapes: bool = False,
+        bracket_quotes: bool = False,
+        delimiter: Optional[str] = ";",
+    ) -> None:
+        self._dollar_quotes = dollar_quotes
+        self._hash_comments = hash_comments
+        self._backslash_escapes = backslash_escapes
+        self._quote_chars = "'\"" + ("`" if backtick_quotes else "") + ("[" if bracket_quotes else "")
+        self._specials = "-/" + self._quote_chars + ("$" if dollar_quotes else "") + ("#" if hash_comments else "")
+        self._parts: List[str] = []
+        self._close: Optional[str] = None  # Closing delimiter of the open quote or comment, if any
+        self._carry = ""  # Unprocessed tail that may be the start of a delimiter cut by the chunk end
+        self.delimiter = delimiter
+
+    @property
+    def delimiter(self) -> Optional[str]:
+        return self._delimiter
+
+    @delimiter.setter
+    def delimiter(self, delimiter: Optional[str]) -> None:
+        if delimiter is not None and not delimiter:
+            raise ValueError("The statement delimiter cannot be empty.")
+        self._delimiter = delimiter
+        self._special_re = re.compile(
+            "[" + "".join(re.escape(c) for c in set(self._specials + (delimiter or "")[:1])) + "]"
+        )
+
+    @property
+    def at_statement_start(self) -> bool:
+        """True when no statement text is pending, i.e. the next line starts a new statement."""
+        return self._close is None and not self._carry and not any(p.strip() for p in self._parts)
+
+    @property
+    def in_quote_or_comment(self) -> bool:
+        """True when the text fed so far ends inside a string, quoted identifier or comment."""
+        return self._close is not None
+
+    def _is_escaped(self, text: str, pos: int) -> bool:
+        """Whether the quote at text[pos] is preceded by an odd number of backslashes."""
+        i = pos
+        while i > 0 and text[i - 1] == "\\":
+            i -= 1
+        return (pos - i) % 2 == 1
+
+    def feed(self, text: str) -> List[str]:
+        """Consumes a chunk of text and returns the statements it completed."""
+        if self._carry:
+            text = self._carry + text
+            self._carry = ""
+        statements: List[str] = []
+        delimiter = self._delimiter
+        pos = start = 0
+        length = len(text)
+        while pos < length:
+            if self._close is not None:
+                end = text.find(self._close, pos)
+                if end != -1 and self._backslash_escapes and self._close in self._quote_chars:
+                    while end != -1 and self._is_escaped(text, end):
+                        end = text.find(self._close, end + 1)
+                if end == -1:
+                    # The closing delimiter may be split across chunks; look at its start again next time.
+                    keep = len(self._close) - 1
+                    if self._backslash_escapes:
+                        keep = max(keep, length - len(text.rstrip("\\")))  # An escape may precede the quote
+                    keep = min(keep, length - pos)
+                    self._parts.append(text[start:length - keep])
+                    self._carry = text[length - keep:]
+                    return statements
+                pos = end + len(self._close)
+                self._close = None
+                continue
+            match = self._special_re.search(text, pos)
+            if not match:
+                pos = length
+                break
+            char, pos = match.group(), match.start()
+            if delimiter is not None and text.startswith(delimiter, pos):
+                self._parts.append(text[start:pos])
+                statement = "".join(self._parts).strip()
+                self._parts = []
+                if statement:
+                    statements.append(statement)
+                pos = start = pos + len(delimiter)
+            elif delimiter is not None and char == delimiter[0] and delimiter.startswith(text[pos:]):
+                break  # Possibly a delimiter cut by the chunk end.
+            elif char in "-/":
+                if pos + 1 == length:
+                    break  # Cannot tell "-" from "--" yet; decided with the next chunk.
+                follower = "-" if char == "-" else "*"
+                if text[pos + 1] == follower:
+                    self._close = "\n" if char == "-" else "*/"
+                    pos += 2
+                else:
+                    pos += 1
+            elif char == "#" and self._hash_comments:
+                self._close = "\n"
+                pos += 1
+            elif char == "$" and self._dollar_quotes:
+                tag = self._DOLLAR_TAG_RE.match(text, pos)
+                if tag:
+                    self._close = tag.group()
+                    pos = tag.end()
+                elif self._PARTIAL_DOLLAR_TAG_RE.match(text, pos):
+                    break  # Possibly a tag cut by the chunk end.
+                else:
+                    pos += 1
+            elif char in self._quote_chars:
+                self._close = "]" if char == "[" else char
+                pos += 1
+            else:
+                pos += 1  # First character of a multi-character delimiter, on its own
+        self._parts.append(text[start:pos])
+        self._carry = text[pos:]
+        return statements
+
+    def flush(self) -> Optional[str]:
+        """Returns the trailing statement that was not terminated by a delimiter, if any."""
+        statement = ("".join(self._parts) + self._carry).strip()
+        self._parts = []
+        self._close = None
+        self._carry = ""
+        return statement or None
+
+
+def split_statements(chunks: Union[str, Iterable[str]], **splitter_options: Any) -> Iterator[str]:
+    """
+    Lazily yields the statements of a SQL text, given whole or as an iterable of chunks (e.g. lines).
+    Keyword arguments configure the StatementSplitter (dollar_quotes, hash_comments, ...).
+    """
+    splitter = StatementSplitter(**splitter_options)
+    for chunk in [chunks] if isinstance(chunks, str) else chunks:
+        yield from splitter.feed(chunk)
+    trailing = splitter.flush()
+    if trailing:
+        yield trailing
+
+
+class MappedInput:
+    """
+    Read-only memory map of an input file, for parsers that scan it line by line. Lines are
+    located with mmap.find and only the lines (or byte ranges) a parser keeps are sliced and
+    decoded, so a skipped region such as a block of data rows never becomes a Python object and
+    the decoded text of the whole file is never held at once. The operating system pages the
+    file in and out as needed. Iterating yields decoded lines, like a text file object.
+    """
+
+    _TRAILING_WHITESPACE = b" \t\r\n"
+
+    def __init__(self, data: Union[mmap.mmap, bytes], path: Optional[str] = None, encoding: str = "utf-8") -> None:
+        self.data = data
+        self.path = path  # Absolute path of the mapped file, None for in-memory input
+        self.encoding = encoding
+
+    @classmethod
+    def open(cls, file_path: Union[str, os.PathLike], encoding: str = "utf-8") -> "MappedInput":
+        with open(file_path, "rb") as f:
+            # Empty files cannot be mapped.
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+        return cls(data, os.path.abspath(file_path), encoding)
+
+    @classmethod
+    def from_string(cls, sql: str) -> "MappedInput":
+        """Wraps SQL given as a string, so string and file input take the same code path."""
+        return cls(sql.encode("utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __enter__(self) -> "MappedInput":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def line_spans(self, start: int = 0) -> Iterator[Tuple[int, int]]:
+        """Yields (start, end) byte offsets of the lines from start on; end is past the newline."""
+        data, size = self.data, len(self.data)
+        while start < size:
+            end = data.find(b"\n", start)
+            end = size if end == -1 else end + 1
+            yield start, end
+            start = end
+
+    def startswith(self, prefix: Union[bytes, Tuple[bytes, ...]], start: int) -> bool:
+        """Whether the bytes at start begin with prefix (or one of several), without slicing the line."""
+        prefixes = (prefix,) if isinstance(prefix, bytes) else prefix
+        return any(self.data[start:start + len(p)] == p for p in prefixes)
+
+    def line_endswith(self, suffix: bytes, start: int, end: int) -> bool:
+        """Whether the line data[start:end], ignoring trailing whitespace, ends with suffix."""
+        while end > start and self.data[end - 1] in self._TRAILING_WHITESPACE:
+            end -= 1
+        return end - start >= len(suffix) and self.data[end - len(suffix):end] == suffix
+
+    def find(self, sub: bytes, start: int = 0) -> int:
+        return self.data.find(sub, start)
+
+    def search(self, pattern: Pattern[bytes], start: int = 0, end: Optional[int] = None) -> Optional["re.Match[bytes]"]:
+        """Searches a bytes pattern directly in the mapped data."""
+        return pattern.search(self.data, start, len(self.data) if end is None else end)
+
+    def match(self, pattern: Pattern[bytes], start: int, end: int) -> Optional["re.Match[bytes]"]:
+        return pattern.match(self.data, start, end)
+
+    def text(self, start: int, end: int) -> str:
+        return self.data[start:end].decode(self.encoding, errors="replace")
+
+    def __iter__(self) -> Iterator[str]:
+        for start, end in self.line_spans():
+            yield self.text(start, end)
+
+
+def open_input(file_path_or_sql_string: Union[str, os.PathLike], encoding: str = "utf-8") -> MappedInput:
+    """Maps an existing file; any other string is treated as SQL content."""
+    if isinstance(file_path_or_sql_string, (str, os.PathLike)) and os.path.exists(file_path_or_sql_string):
+        return MappedInput.open(file_path_or_sql_string, encoding)
+    if isinstance(file_path_or_sql_string, str):
+        return MappedInput.from_string(file_path_or_sql_string)
+    raise ValueError("Invalid input: an existing file path or an SQL string is required.")
+
+
+NodeT = TypeVar("NodeT", bound=NodeInfo)
+
+
+class GraphContext(Generic[NodeT]):
+    """
+    Graph under construction for one parse: node info by key, and edges in the order they were
+    first added, each once and without self references. Dialect parsers subclass it with their
+    rules for resolving names to node keys.
+    """
+
+    def __init__(self) -> None:
+        self.node_types: Dict[str, NodeT] = {}
+        self.edges: List[Tuple[str, str]] = []
+        self._edge_set: Set[Tuple[str, str]] = set()
+
+    def add_edge(self, source: str, target: str) -> None:
+        if source != target and (source, target) not in self._edge_set:
+            self._edge_set.add((source, target))
+            self.edges.append((source, target))
+
+    def upsert_node(
+        self, key: str, database: str, node_type: Optional[str] = None, definition: Optional[str] = None
+    ) -> str:
+        """
+        Adds the node key if it is new, as a table unless node_type is given, and returns key. A
+        defining statement (node_type given) sets the type of a known node; a definition replaces
+        the stored one.
+        """
+        info = self.node_types.get(key)
+        if info is None:
+            info = cast(NodeT, {"type": node_type or "table", "database": database, "full_name": key, "definition": None})
+            self.node_types[key] = info
+        elif node_type:
+            info["type"] = node_type
+        if definition:
+            info["definition"] = definition
+        return key
+
+    def append_definition(self, key: str, definition: str) -> None:
+        info = self.node_types[key]
+        info["definition"] = "\n\n-- Additional DDL --\n".join(filter(None, (info["definition"], definition)))
+
+    def add_cte(self, name: str, definition: str) -> str:
+        """CTEs are schemaless nodes keyed by their name, like in the Postgres parser."""
+        self.node_types[name] = cast(NodeT, {"type": "cte_view", "database": "", "full_name": name, "definition": definition})
+        return name
+
+
+def parse_quietly(sql: str, dialect: str) -> List["exp.Expression"]:
+    """
+    sqlglot.parse without the warnings it logs for syntax it falls back on. Returns the parsed
+    statements (empty ones left out), or [] if sqlglot cannot parse the SQL.
+    """
+    import sqlglot  # Imported here so that loading the registry does not pull in sqlglot
+    from sqlglot import exp
+    from sqlglot.errors import SqlglotError
+
+    sqlglot_logger = logging.getLogger("sqlglot")
+    previous_level = sqlglot_logger.level
+    sqlglot_logger.setLevel(logging.ERROR)
+    try:
+        expressions = sqlglot.parse(sql, read=dialect)
+    except SqlglotError:
+        return []
+    finally:
+        sqlglot_logger.setLevel(previous_level)
+    return [expression for expression in expressions if isinstance(expression, exp.Expression)]
+
+
+def scan_references(pattern: Pattern[str], sql: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (group name, text) for each match of pattern in sql that sets a named group, in order.
+    Scan patterns list text to skip, such as strings and comments, as alternatives without a
+    named group, so keywords inside it never produce a reference; every other alternative sets
+    exactly one named group (e.g. "read" or "write").
+    """
+    for match in pattern.finditer(sql):
+        if match.lastgroup is not None:
+            yield match.lastgroup, match.group(match.lastgroup)
+
+
+def compute_stats(node_types: Mapping[str, Mapping[str, Any]], default_database: str = "") -> Dict[str, int]:
+    """
+    Counts the non-CTE nodes per database (or schema). Nodes without one are counted under
+    default_database, or not at all if it is empty.
+    """
+    stats: Dict[str, int] = {}
+    for info in node_types.values():
+        database = info["database"] or default_database
+        if database and info["type"] != "cte_view":
+            stats[database] = stats.get(database, 0) + 1
+    return stats
+
+
+def write_json_structure(edges: List[Tuple[str, str]], node_types: Mapping[str, Mapping[str, Any]]) -> None:
+    """Saves edges and node_types to JSON files in the json_structure directory."""
+    output_dir = "json_structure"
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        with open(os.path.join(output_dir, "edges.json"), "w", encoding="utf-8") as f_edges:
+            json.dump(edges, f_edges, indent=2)
+        with open(os.path.join(output_dir, "node_types.json"), "w", encoding="utf-8") as f_nodes:
+            json.dump(node_types, f_nodes, indent=2)
+    except IOError as e:
+        print(f"Warning: Could not write JSON output files: {e}")
+
+
+def write_column_lineage(lineage: ColumnLineage) -> None:
+    """Saves column lineage to json_structure/column_lineage.json as interned names plus ID pairs."""
+    output_dir = "json_structure"
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        with open(os.path.join(output_dir, "column_lineage.json"), "w", encoding="utf-8") as f_lineage:
+            json.dump({"columns": lineage.columns, "edges": list(zip(lineage.sources, lineage.targets))}, f_lineage)
+    except IOError as e:
+        print(f"Warning: Could not write column lineage file: {e}")
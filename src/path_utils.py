@@ -17,6 +17,24 @@ METADATA_DIR = DATA_FLOW_BASE_DIR / "metadata"
 JSON_STRUCTURE_DIR = DATA_FLOW_BASE_DIR / "json_structure"
 GENERATED_IMAGE_DIR = DATA_FLOW_BASE_DIR / "generated-image"
 
+# File extensions treated as SQL metadata when searching for files or ingesting directories
+SQL_EXTENSIONS = [
+    ".sql",  # Standard SQL files
+    ".vql",  # Denodo VQL files
+    ".ddl",  # Data Definition Language
+    ".dml",  # Data Manipulation Language
+    ".hql",  # Hive Query Language
+    ".pls",  # PL/SQL files
+    ".plsql",  # PL/SQL files
+    ".proc",  # Stored Procedures
+    ".psql",  # PostgreSQL files
+    ".tsql",  # T-SQL files
+    ".view",  # View definitions
+    ".sqlite",  # SQLite database files
+    ".sqlite3",  # SQLite database files
+    ".db3",  # SQLite database files
+]
+
 # List of all directories managed by this utility
 MANAGED_DIRS = [
     DATA_FLOW_BASE_DIR,
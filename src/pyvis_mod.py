@@ -2,7 +2,7 @@ import os
 from pathlib import Path
 import re
 import networkx as nx
-from typing import List, Tuple, Dict, Optional, Union
+from typing import Any, List, Tuple, Dict, Optional, Union
 from pyvis.network import Network
 import json
 import textwrap
@@ -10,11 +10,19 @@ import math
 import webbrowser
 import html # Ensure this is imported
 
+from .dataflow_structs import load_definition
+from .graph_layout import layered_layout
+from .lineage_graph import LineageGraph
+
+# Above this many nodes the layout is precomputed in Python by default (see draw_pyvis_html).
+PRECOMPUTED_LAYOUT_MIN_NODES = 5000
+
 def create_pyvis_figure(
-    graph: Union[nx.DiGraph, nx.Graph],
+    graph: Union[LineageGraph, nx.DiGraph, nx.Graph],
     node_types: Dict[str, Dict[str, str]],
     focus_nodes: List[str] = [],
     shake_towards_roots: bool = False,
+    precomputed_layout: bool = False,
 ) -> Tuple[Network, Dict]:
     nt = Network(
         height="100vh",
@@ -26,13 +34,15 @@ def create_pyvis_figure(
         cdn_resources="in_line",
     )
 
-    in_degrees = dict(graph.in_degree()) # type: ignore
-    out_degrees = dict(graph.out_degree()) # type: ignore
-    degrees = {
-        node: in_degrees.get(node, 0) + out_degrees.get(node, 0)
-        for node in graph.nodes()
-    }
+    if not isinstance(graph, LineageGraph):
+        graph = LineageGraph(graph.edges(), graph.nodes())
+    degrees = dict(zip(graph.names, graph.degree().tolist()))
     max_degree = max(degrees.values()) if degrees else 1
+    # Coordinates baked into the nodes; the browser then draws them without running physics.
+    positions = {}
+    if precomputed_layout:
+        x, y = layered_layout(graph)
+        positions = {name: {"x": px, "y": py} for name, px, py in zip(graph.names, x.tolist(), y.tolist())}
     min_size, max_size = 15, 45
     epsilon = 1e-6
 
@@ -49,6 +59,10 @@ def create_pyvis_figure(
         color_map = {
             "view": "#4e79a7", "table": "#59a14f", "cte_view": "#f9c846",
             "unknown": "#e15759", "datamarket": "#ed7be7", "other": "#f28e2c",
+            "procedure": "#76b7b2", "function": "#b07aa1", "trigger": "#ff9da7",
+            "materialized_view": "#a0cbe8", "dynamic_table": "#86bcb6", "stream": "#8cd17d",
+            "task": "#d37295", "stage": "#9c755f", "synonym": "#d4a6c8",
+            "package": "#499894", "db_link": "#79706e",
         }
         color = color_map.get(node_type, "#bab0ab")
         border_color = "#2b2b2b"
@@ -63,7 +77,7 @@ def create_pyvis_figure(
         )
 
         # Part 2: Definition (for persistent tooltip)
-        node_definition = node_info.get("definition")
+        node_definition = load_definition(node_info)
         definition_html_part = ""
         if node_definition:
             escaped_node_definition = html.escape(node_definition)
@@ -88,19 +102,19 @@ def create_pyvis_figure(
             title=full_node_title,
             mass=1 + node_degree / (max_degree + epsilon) * 2,
             fixed=False,
+            **positions.get(node_id_str, {}),
         )
 
     for u, v in graph.edges():
-        if u in graph.nodes() and v in graph.nodes():
-            nt.add_edge(
-                u, v,
-                color={"color": "#cccccc", "opacity": 0.7, "highlight": "#e60049", "hover": "#e60049"},
-                width=1.5, hoverWidth=2.5, selectionWidth=2.5,
-                smooth={"enabled": True, "type": "cubicBezier", "forceDirection": "vertical", "roundness": 0.4},
-                arrows={"to": {"enabled": True, "scaleFactor": 0.6}},
-            )
+        nt.add_edge(
+            u, v,
+            color={"color": "#cccccc", "opacity": 0.7, "highlight": "#e60049", "hover": "#e60049"},
+            width=1.5, hoverWidth=2.5, selectionWidth=2.5,
+            smooth={"enabled": True, "type": "cubicBezier", "forceDirection": "vertical", "roundness": 0.4},
+            arrows={"to": {"enabled": True, "scaleFactor": 0.6}},
+        )
 
-    initial_options = {
+    initial_options: Dict[str, Any] = {
         "layout": {
             "hierarchical": {
                 "enabled": True,
@@ -188,6 +202,10 @@ def create_pyvis_figure(
             "shadow": {"enabled": False, "size": 10, "x": 5, "y": 5},
         },
     }
+    if precomputed_layout:
+        initial_options["layout"]["hierarchical"]["enabled"] = False
+        initial_options["physics"]["enabled"] = False
+        initial_options["physics"]["stabilization"]["enabled"] = False
     nt.set_options(json.dumps(initial_options))
     return nt, initial_options
 
@@ -462,6 +480,17 @@ def inject_controls_and_styles(
         <div class="legend-item"><div class="legend-color" style="background-color: #f9c846;"></div><div class="legend-label">CTE View</div></div>
         <div class="legend-item"><div class="legend-color" style="background-color: #ed7be7;"></div><div class="legend-label">Data Market</div></div>
         <div class="legend-item"><div class="legend-color" style="background-color: #f28e2c;"></div><div class="legend-label">Other DB</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #76b7b2;"></div><div class="legend-label">Procedure</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #b07aa1;"></div><div class="legend-label">Function</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #ff9da7;"></div><div class="legend-label">Trigger</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #a0cbe8;"></div><div class="legend-label">Materialized View</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #86bcb6;"></div><div class="legend-label">Dynamic Table</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #8cd17d;"></div><div class="legend-label">Stream</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #d37295;"></div><div class="legend-label">Task</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #9c755f;"></div><div class="legend-label">Stage</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #d4a6c8;"></div><div class="legend-label">Synonym</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #499894;"></div><div class="legend-label">Package</div></div>
+        <div class="legend-item"><div class="legend-color" style="background-color: #79706e;"></div><div class="legend-label">DB Link</div></div>
         <div class="legend-item"><div class="legend-color" style="background-color: #e15759;"></div><div class="legend-label">Unknown</div></div>
     </div>
     <button id="addNodeFab" title="Add Node">+</button>
@@ -559,6 +588,12 @@ def inject_html_doctype(html_content: str) -> str:
 
 # Removed inject_sql_code_highlighting as its parts are now integrated into inject_controls_and_styles
 
+def html_output_path(save_path: str = "", file_name: str = "", is_focused_view: bool = False) -> str:
+    """Where draw_pyvis_html writes the diagram for the given save_path and file_name."""
+    html_file_name_part = "focused_data_flow_pyvis" if is_focused_view else "data_flow_pyvis"
+    return os.path.join(save_path, f"{html_file_name_part}{('_' + file_name) if file_name else ''}.html")
+
+
 def draw_pyvis_html(
     edges: List[Tuple[str, str]],
     node_types: Dict[str, Dict[str, str]],
@@ -568,48 +603,42 @@ def draw_pyvis_html(
     draw_edgeless: bool = False,
     focus_nodes: List[str] = [],
     is_focused_view: bool = False,
+    graph: Optional[LineageGraph] = None,
+    precomputed_layout: Optional[bool] = None,
 ) -> Union[str, None]:
-    print(f"Generating Pyvis HTML{' (focused view)' if is_focused_view else ' (complete view)'}...")
-    G: Union[nx.DiGraph, nx.Graph] = nx.DiGraph()
-    G.add_edges_from(edges)
-    valid_nodes = list(node_types.keys())
-    if draw_edgeless:
-        G.add_nodes_from(valid_nodes)
-    else:
-        nodes_in_edges = set(u for u, v in edges) | set(v for u, v in edges)
-        # nodes_to_draw = nodes_in_edges.union(set(valid_nodes)) # This might be too broad if valid_nodes includes nodes not in edges
-
-        if nodes_in_edges:
-            nodes_to_draw = nodes_in_edges if not draw_edgeless else nodes_in_edges.union(set(valid_nodes))
-        else:
-            nodes_to_draw = set(valid_nodes) if draw_edgeless else set()
+    """
+    Renders the graph to an HTML file and returns the HTML (None if the file could not be
+    written). A prebuilt LineageGraph (e.g. the
+    focused subgraph) can be passed as graph to avoid rebuilding it from edges; otherwise the
+    graph holds the nodes in edges, plus every node of node_types with draw_edgeless.
 
-        if not nodes_to_draw:
-            print("Warning: No nodes to draw for Pyvis HTML.")
-            # Create an empty graph but still generate HTML for UI consistency
-            G = nx.DiGraph()
-            # return None
-        else:
-            G = G.subgraph(list(nodes_to_draw)).copy() # Ensure it's a list for subgraph
+    With precomputed_layout the node coordinates are computed in Python (see
+    graph_layout.layered_layout) and physics is disabled, so the page opens without the
+    browser's stabilization run. None (default) precomputes for graphs of
+    PRECOMPUTED_LAYOUT_MIN_NODES nodes or more.
+    """
+    print(f"Generating Pyvis HTML{' (focused view)' if is_focused_view else ' (complete view)'}...")
+    if graph is None:
+        graph = LineageGraph(edges, node_types.keys() if draw_edgeless else ())
+    if not len(graph):
+        # An empty graph still generates HTML for UI consistency
+        print("Warning: No nodes to draw for Pyvis HTML.")
 
     final_node_types = {
         node: node_types.get(
             node, {"type": "unknown", "database": "", "full_name": node}
         )
-        for node in G.nodes()
+        for node in graph.names
     }
-    # Allow empty graph generation for UI consistency
-    # if not G.nodes():
-    #     print("Warning: Graph is empty for Pyvis HTML.")
-    #     return None
 
     shake_dir = is_focused_view
     html_file_name_part = "focused_data_flow_pyvis" if is_focused_view else "data_flow_pyvis"
-    html_file_name = f"{html_file_name_part}{('_' + file_name) if file_name else ''}.html"
-    html_file_path = os.path.join(save_path, html_file_name)
+    html_file_path = html_output_path(save_path, file_name, is_focused_view)
 
+    if precomputed_layout is None:
+        precomputed_layout = len(graph) >= PRECOMPUTED_LAYOUT_MIN_NODES
     fig, initial_options_dict = create_pyvis_figure(
-        G, final_node_types, focus_nodes, shake_towards_roots=shake_dir
+        graph, final_node_types, focus_nodes, shake_towards_roots=shake_dir, precomputed_layout=precomputed_layout
     )
     
     # Generate base HTML from Pyvis
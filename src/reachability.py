@@ -0,0 +1,147 @@
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+import numpy as np
+
+from . import parse_cache, path_utils
+from .lineage_graph import LineageGraph, neighbours
+
+INDEX_VERSION = "1"  # Bump when the stored arrays change, to invalidate persisted indexes
+# Budget for the closure bitsets (components^2 / 8 bytes); larger graphs are answered by graph walks.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ReachabilityIndex:
+    """
+    Precomputed transitive closure of a LineageGraph. Strongly connected components are
+    condensed into a DAG, and each component gets a bitset of the components it reaches
+    (row c, bit d set when d is downstream of c). Descendants are one row OR, ancestors one
+    column test, and the reached components are expanded to their member nodes; no graph walk.
+    """
+
+    def __init__(self, graph: LineageGraph, component: np.ndarray, cyclic: np.ndarray, closure: np.ndarray) -> None:
+        self.graph = graph
+        self.component = component  # Node ID -> component number
+        self.cyclic = cyclic  # Component reaches itself (more than one node, or a self-loop)
+        self.closure = closure  # Packed bitsets, one row per component
+        self.component_count = len(cyclic)
+        order = np.argsort(component, kind="stable")
+        self._members = order
+        self._members_indptr = np.zeros(self.component_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(component, minlength=self.component_count), out=self._members_indptr[1:])
+
+    @classmethod
+    def build(cls, graph: LineageGraph, max_bytes: int = DEFAULT_MAX_BYTES) -> Optional["ReachabilityIndex"]:
+        """Builds the index, or returns None if its bitsets would exceed max_bytes."""
+        component, count = graph.components()
+        width = (count + 7) // 8
+        if count * width > max_bytes:
+            return None
+        cyclic = np.bincount(component, minlength=count) > 1
+        cyclic[component[graph.sources[graph.sources == graph.targets]]] = True
+
+        # Condensed edges, grouped by source component; children always have lower numbers, so
+        # processing components in increasing order sees every child's row complete.
+        source_components, target_components = component[graph.sources], component[graph.targets]
+        between = source_components != target_components
+        pairs = np.unique(np.stack([source_components[between], target_components[between]], axis=1), axis=0)
+        children_indptr = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(pairs[:, 0], minlength=count), out=children_indptr[1:])
+        children_all = pairs[:, 1]
+
+        closure = np.zeros((count, width), dtype=np.uint8)
+        for c in np.flatnonzero(np.diff(children_indptr)).tolist():
+            children = children_all[children_indptr[c]:children_indptr[c + 1]]
+            row = np.bitwise_or.reduce(closure[children], axis=0)
+            np.bitwise_or.at(row, children >> 3, (0x80 >> (children & 7)).astype(np.uint8))
+            closure[c] = row
+        return cls(graph, component, cyclic, closure)
+
+    def _source_components(self, nodes: Iterable[str]) -> np.ndarray:
+        return np.unique(self.component[self.graph.ids(nodes)])
+
+    def _names(self, reached: np.ndarray, sources: np.ndarray) -> Set[str]:
+        """Member names of the reached components, plus the source components on a cycle."""
+        reached[sources[self.cyclic[sources]]] = True
+        members = neighbours(self._members_indptr, self._members, np.flatnonzero(reached))
+        names = self.graph.names
+        return {names[i] for i in members.tolist()}
+
+    def descendants_of(self, nodes: Iterable[str]) -> Set[str]:
+        """Union of the descendants of the given nodes (see LineageGraph.descendants_of)."""
+        sources = self._source_components(nodes)
+        bits = np.bitwise_or.reduce(self.closure[sources], axis=0)
+        return self._names(np.unpackbits(bits, count=self.component_count).astype(bool), sources)
+
+    def ancestors_of(self, nodes: Iterable[str]) -> Set[str]:
+        """Union of the ancestors of the given nodes (see LineageGraph.ancestors_of)."""
+        sources = self._source_components(nodes)
+        columns = self.closure[:, sources >> 3] & (0x80 >> (sources & 7)).astype(np.uint8)
+        return self._names(np.asarray(columns.any(axis=1)), sources)
+
+    def descendants(self, node: str) -> Set[str]:
+        """Descendants of one node, like LineageGraph.descendants. Raises KeyError for an unknown node."""
+        if node not in self.graph.index:
+            raise KeyError(node)
+        return self.descendants_of([node]) - {node}
+
+    def ancestors(self, node: str) -> Set[str]:
+        """Ancestors of one node, like LineageGraph.ancestors. Raises KeyError for an unknown node."""
+        if node not in self.graph.index:
+            raise KeyError(node)
+        return self.ancestors_of([node]) - {node}
+
+
+def graph_digest(graph: LineageGraph) -> str:
+    """Content hash of a graph: node names in ID order and the edge arrays."""
+    digest = hashlib.sha256(INDEX_VERSION.encode("utf-8"))
+    digest.update("\0".join(graph.names).encode("utf-8"))
+    digest.update(graph.sources.astype(np.int64).tobytes())
+    digest.update(graph.targets.astype(np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _index_path(digest: str) -> Path:
+    return parse_cache.CACHE_DIR / f"{digest}.reach.npz"
+
+
+def max_index_bytes() -> int:
+    """Bitset budget, overridable with the 'reachability_index_max_bytes' setting."""
+    return int(path_utils.read_settings().get("reachability_index_max_bytes", DEFAULT_MAX_BYTES))
+
+
+def load_or_build(graph: LineageGraph, use_cache: bool = True) -> Optional[ReachabilityIndex]:
+    """
+    Returns the reachability index of graph, loading it from the parse cache directory when an
+    index for the same graph content was stored before, else building and storing it. Stored
+    indexes share the parse cache's size limit and LRU eviction. Returns None when the graph is
+    too large for the bitset budget (see max_index_bytes).
+    """
+    path = _index_path(graph_digest(graph))
+    if use_cache:
+        try:
+            with np.load(path) as stored:
+                if len(stored["component"]) != len(graph):
+                    raise ValueError("Stored index does not match the graph")
+                loaded = ReachabilityIndex(graph, stored["component"], stored["cyclic"], stored["closure"])
+            os.utime(path)  # Mark as recently used for LRU eviction.
+            return loaded
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+
+    index = ReachabilityIndex.build(graph, max_index_bytes())
+    if index is not None and use_cache:
+        try:
+            parse_cache.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_path = parse_cache.CACHE_DIR / f"{os.path.basename(path)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, component=index.component, cyclic=index.cyclic, closure=index.closure)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write reachability index: {e}")
+            return index
+        parse_cache.evict(parse_cache.max_cache_bytes())
+    return index
@@ -7,7 +7,9 @@ from src.dataflow import (
     handle_file_drop,
     select_metadata,
     handle_back_key,
+    attach_reachability_index,
 )
+from src.lineage_graph import LineageGraph
 
 
 class TestCLICore(unittest.TestCase):
@@ -143,5 +145,22 @@ class TestCLICore(unittest.TestCase):
         self.assertIsNone(result)
 
 
+    @patch("src.dataflow.reachability.load_or_build")
+    def test_reachability_index_is_opt_in(self, mock_load_or_build):
+        """The closure index is only built for unlimited-depth focused views when the setting is on"""
+        graph = LineageGraph([("a", "b")])
+        with patch("src.dataflow.path_utils.read_settings", return_value={}):
+            attach_reachability_index(graph)
+        mock_load_or_build.assert_not_called()
+
+        with patch("src.dataflow.path_utils.read_settings", return_value={"reachability_index": True}):
+            attach_reachability_index(graph, max_depth=2)
+            mock_load_or_build.assert_not_called()
+            attach_reachability_index(graph)
+            attach_reachability_index(graph)
+        mock_load_or_build.assert_called_once_with(graph)
+        self.assertIs(graph.reachability, mock_load_or_build.return_value)
+
+
 if __name__ == "__main__":
     unittest.main()
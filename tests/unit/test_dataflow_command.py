@@ -1,4 +1,5 @@
 import os
+import re
 import sys
 import tempfile
 import shutil
@@ -36,6 +37,86 @@ def test_complete_diagram(monkeypatch):
     os.remove(vql_path)
 
 
+def test_focus_manifest_renders_one_diagram_per_line(monkeypatch, tmp_path):
+    vql_path = create_temp_vql()
+    manifest = tmp_path / "products.txt"
+    manifest.write_text("# data products\nviews: v_test\nbase: t1  # upstream only\nghost: nope\n")
+    out_dir = tmp_path / "out"
+    sys_argv = ["prog", "--metadata", vql_path, "--focus-manifest", str(manifest), "--jobs", "2", "--output", str(out_dir)]
+    monkeypatch.setattr(sys, "argv", sys_argv)
+    dataflow_command.main()
+    name = Path(vql_path).stem
+    assert sorted(os.listdir(out_dir)) == [
+        f"focused_data_flow_pyvis_{name}_base.html",
+        f"focused_data_flow_pyvis_{name}_views.html",
+    ]
+    os.remove(vql_path)
+
+
+def test_read_focus_manifest_json(tmp_path):
+    from src.generate_data_flow import read_focus_manifest
+
+    manifest = tmp_path / "products.json"
+    manifest.write_text('[{"name": "a", "focus_nodes": ["x", "y"], "depth": 1, "descendants": false}]')
+    assert read_focus_manifest(manifest) == [
+        {"name": "a", "focus_nodes": ["x", "y"], "see_ancestors": True, "see_descendants": False, "max_depth": 1}
+    ]
+    manifest.write_text('{"b": []}')
+    with pytest.raises(ValueError):
+        read_focus_manifest(manifest)
+
+
+@pytest.mark.parametrize("entry", [
+    '{"name": "a", "focus_nodes": ["x"], "ancestors": "false"}',
+    '{"name": "a", "focus_nodes": ["x"], "descendants": 0}',
+    '{"name": "a", "focus_nodes": ["x"], "depth": -1}',
+    '{"name": "a", "focus_nodes": ["x"], "depth": true}',
+    '{"name": "a", "focus_nodes": ["x"], "depth": "2"}',
+])
+def test_read_focus_manifest_json_rejects_invalid_span(tmp_path, entry):
+    from src.generate_data_flow import read_focus_manifest
+
+    manifest = tmp_path / "products.json"
+    manifest.write_text(f"[{entry}]")
+    with pytest.raises(ValueError, match="focus set 'a'"):
+        read_focus_manifest(manifest)
+
+
+@pytest.mark.parametrize("file_name, content, message", [
+    ("products.txt", "a: x\nb: y\na: z\n", "focus set 'a': duplicate name"),
+    ("products.json", '[{"name": "a", "focus_nodes": ["x"]}, {"name": "a", "focus_nodes": ["y"]}]',
+     "focus set 'a': duplicate name"),
+    ("products.json", '{"a": ["x"], "a": ["y"]}', "duplicate key 'a'"),
+    ("products.txt", "a/b: x\n", "focus set 'a/b': the name cannot contain path separators"),
+    ("products.txt", "../x: x\n", "focus set '../x': the name cannot contain path separators"),
+    ("products.json", '{"a\\\\b": ["x"]}', "focus set 'a\\\\b': the name cannot contain path separators"),
+    ("products.txt", "..: x\n", "focus set '..': the name cannot contain path separators"),
+])
+def test_read_focus_manifest_rejects_duplicate_and_path_names(tmp_path, file_name, content, message):
+    from src.generate_data_flow import read_focus_manifest
+
+    manifest = tmp_path / file_name
+    manifest.write_text(content)
+    with pytest.raises(ValueError, match=re.escape(f"{manifest}: {message}")):
+        read_focus_manifest(manifest)
+
+
+def test_draw_focused_data_flows_rejects_duplicate_names():
+    from src.generate_data_flow import draw_focused_data_flows
+
+    focus_set = {"name": "a", "focus_nodes": ["x"], "see_ancestors": True, "see_descendants": True, "max_depth": None}
+    with pytest.raises(ValueError, match="focus set 'a': duplicate name"):
+        draw_focused_data_flows([], {}, [focus_set, dict(focus_set)])
+
+
+def test_read_focus_manifest_lines_keep_quoted_hashes(tmp_path):
+    from src.generate_data_flow import read_focus_manifest
+
+    manifest = tmp_path / "products.txt"
+    manifest.write_text('# data products\nsales: "v # 1" t#2 \'my view\'  # trailing comment\n')
+    assert [focus_set["focus_nodes"] for focus_set in read_focus_manifest(manifest)] == [["v # 1", "t#2", "my view"]]
+
+
 def test_focused_diagram(monkeypatch):
     vql_path = create_temp_vql()
     out_dir = tempfile.mkdtemp()
@@ -67,6 +148,14 @@ def test_missing_focus_nodes(monkeypatch):
     os.remove(vql_path)
 
 
+def test_negative_depth_is_rejected(monkeypatch, capsys):
+    sys_argv = ["prog", "--metadata", "dump.vql", "--type", "focused", "--focus-nodes", "v", "--depth", "-1"]
+    monkeypatch.setattr(sys, "argv", sys_argv)
+    with pytest.raises(SystemExit):
+        dataflow_command.main()
+    assert "--depth: must be 0 or more, got -1" in capsys.readouterr().err
+
+
 def test_main_db(monkeypatch):
     vql_path = create_temp_vql("""CREATE OR REPLACE VIEW db1.v_test AS SELECT 1;""")
     out_dir = tempfile.mkdtemp()
@@ -110,12 +199,23 @@ class TestDataflowCommand(unittest.TestCase):
 
         mock_args = argparse.Namespace(
             metadata=self.test_file,
+            dialect=None,
             type="complete",
             output=self.temp_dir,
             auto_open=True,  # Set auto_open to True (default)
             focus_nodes=None,
             main_db=None,
             draw_edgeless=False,
+            jobs=1,
+            sqlfluff_fix="failed",
+            debug_cleaned_sql=False,
+            use_cache=False,
+            incremental=False,
+            column_lineage=False,
+            depth=None,
+            reachability_index=False,
+            focus_manifest=None,
+            layout="auto",
         )
         mock_parse_args.return_value = mock_args
 
@@ -147,12 +247,23 @@ class TestDataflowCommand(unittest.TestCase):
 
         mock_args = argparse.Namespace(
             metadata=self.test_file,
+            dialect=None,
             type="complete",
             output=self.temp_dir,
             auto_open=False,  # Set auto_open to False
             focus_nodes=None,
             main_db=None,
             draw_edgeless=False,
+            jobs=1,
+            sqlfluff_fix="failed",
+            debug_cleaned_sql=False,
+            use_cache=False,
+            incremental=False,
+            column_lineage=False,
+            depth=None,
+            reachability_index=False,
+            focus_manifest=None,
+            layout="auto",
         )
         mock_parse_args.return_value = mock_args
 
@@ -184,12 +295,23 @@ class TestDataflowCommand(unittest.TestCase):
 
         mock_args = argparse.Namespace(
             metadata=self.test_file,
+            dialect=None,
             type="focused",
             output=self.temp_dir,
             auto_open=True,  # Set auto_open to True (default)
             focus_nodes=["test_view"],
             main_db=None,
             draw_edgeless=False,
+            jobs=1,
+            sqlfluff_fix="failed",
+            debug_cleaned_sql=False,
+            use_cache=False,
+            incremental=False,
+            column_lineage=False,
+            depth=2,
+            reachability_index=False,
+            focus_manifest=None,
+            layout="auto",
             see_ancestors=True,  # Add the missing attributes
             see_descendants=True,
         )
@@ -210,6 +332,7 @@ class TestDataflowCommand(unittest.TestCase):
         self.assertEqual(
             kwargs.get("auto_open"), True
         )  # Use assertEqual instead of assertTrue
+        self.assertEqual(kwargs.get("max_depth"), 2)
 
     @patch("sys.argv")
     @patch("src.dataflow_command.draw_focused_data_flow")
@@ -223,12 +346,23 @@ class TestDataflowCommand(unittest.TestCase):
 
         mock_args = argparse.Namespace(
             metadata=self.test_file,
+            dialect=None,
             type="focused",
             output=self.temp_dir,
             auto_open=False,  # Set auto_open to False
             focus_nodes=["test_view"],
             main_db=None,
             draw_edgeless=False,
+            jobs=1,
+            sqlfluff_fix="failed",
+            debug_cleaned_sql=False,
+            use_cache=False,
+            incremental=False,
+            column_lineage=False,
+            depth=None,
+            reachability_index=False,
+            focus_manifest=None,
+            layout="auto",
             see_ancestors=True,  # Add the missing attributes
             see_descendants=True,
         )
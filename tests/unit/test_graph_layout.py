@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.graph_layout import layered_layout
+from src.lineage_graph import LineageGraph
+
+
+def test_layers_follow_longest_paths_and_cycles_share_a_layer():
+    graph = LineageGraph([("a", "b"), ("b", "c"), ("c", "b"), ("a", "d"), ("c", "d"), ("d", "e")], ["lonely"])
+    x, y = layered_layout(graph, level_separation=1, node_spacing=1)
+    layer = dict(zip(graph.names, x.tolist()))
+
+    assert layer == {"a": 0, "b": 1, "c": 1, "d": 2, "e": 3, "lonely": 0}
+    # Within a layer every node gets its own slot, centred around 0.
+    for value in set(layer.values()):
+        slots = sorted(y[x == value].tolist())
+        assert len(set(slots)) == len(slots)
+        assert np.isclose(sum(slots), 0)
+
+
+def test_barycenter_ordering_untangles_crossing_edges():
+    graph = LineageGraph([("a", "y"), ("b", "x")], ["x", "y"])
+    _, y = layered_layout(graph)
+    position = dict(zip(graph.names, y.tolist()))
+
+    assert (position["a"] < position["b"]) == (position["y"] < position["x"])
+
+
+def test_empty_graph():
+    x, y = layered_layout(LineageGraph([]))
+    assert x.size == y.size == 0
@@ -0,0 +1,46 @@
+import networkx as nx
+import pytest
+
+from src.lineage_graph import LineageGraph
+
+
+EDGES = [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d"), ("x", "d"), ("a", "b")]
+
+
+def test_matches_networkx_on_cycles_and_duplicates():
+    graph = LineageGraph(EDGES, ["lonely"])
+    reference = nx.DiGraph(EDGES)
+    reference.add_node("lonely")
+
+    assert graph.nodes() == ["a", "b", "c", "d", "x", "lonely"]
+    assert graph.number_of_edges() == reference.number_of_edges()
+    for node in reference:
+        assert graph.ancestors(node) == nx.ancestors(reference, node)
+        assert graph.descendants(node) == nx.descendants(reference, node)
+    assert dict(zip(graph.names, graph.degree().tolist())) == dict(reference.degree())
+    assert nx.utils.graphs_equal(graph.to_networkx(), reference)
+
+
+def test_subgraph_keeps_induced_edges_in_order():
+    sub = LineageGraph(EDGES).subgraph(["d", "c", "x", "missing"])
+
+    assert sub.nodes() == ["c", "d", "x"]
+    assert sub.edges() == [("c", "d"), ("x", "d")]
+    assert sub.in_degree().tolist() == [0, 2, 0]
+    assert sub.ancestors("d") == {"c", "x"}
+
+
+def test_unknown_node_raises_key_error():
+    with pytest.raises(KeyError):
+        LineageGraph([]).ancestors("nope")
+
+
+def test_multi_source_closure_matches_union_and_respects_depth():
+    chain = [(f"n{i}", f"n{i + 1}") for i in range(6)] + [("side", "n3")]
+    graph = LineageGraph(chain)
+
+    assert graph.ancestors_of(["n2", "n5", "missing"]) == graph.ancestors("n2") | graph.ancestors("n5")
+    assert graph.descendants_of(["n0", "n4"]) == {f"n{i}" for i in range(1, 7)}
+    assert graph.ancestors_of(["n5"], max_depth=2) == {"n4", "n3"}
+    assert graph.ancestors_of(["n4"], max_depth=2) == {"n3", "n2", "side"}
+    assert graph.descendants_of(["n0"], max_depth=0) == set()
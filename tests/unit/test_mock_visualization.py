@@ -3,8 +3,8 @@ import shutil
 import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
-import networkx as nx
 from src.generate_data_flow import draw_complete_data_flow, draw_focused_data_flow
+from src.lineage_graph import LineageGraph
 
 
 class TestMockGraphVisualization(unittest.TestCase):
@@ -58,72 +58,37 @@ class TestMockGraphVisualization(unittest.TestCase):
 
     @patch("src.pyvis_mod.draw_pyvis_html")
     def test_focused_data_flow_generation(self, mock_draw_pyvis):
-        """Test focused data flow visualization generation by checking that NetworkX is used to find ancestors and descendants"""
-        # Set up the return value for draw_pyvis_html
+        """Test that the focused view holds the focus node with its ancestors and descendants"""
         mock_draw_pyvis.return_value = None
+        edges = self.edges + [("unrelated", "other")]
+        node_types = dict(self.node_types, lonely={"type": "table", "database": "db1", "full_name": "lonely"})
+
+        draw_focused_data_flow(
+            edges,
+            node_types,
+            focus_nodes=["view1"],
+            save_path=self.test_dir,
+            file_name="test_focused",
+            auto_open=False,
+        )
+
+        mock_draw_pyvis.assert_called_once()
+        edges_arg, node_types_arg = mock_draw_pyvis.call_args[0]
+        self.assertEqual(set(edges_arg), set(self.edges))
+        self.assertEqual(set(node_types_arg), {"table1", "table2", "view1", "view2"})
+        self.assertEqual(mock_draw_pyvis.call_args[1]["graph"].edges(), edges_arg)
+
+    @patch("src.pyvis_mod.draw_pyvis_html")
+    def test_focused_data_flow_reuses_prebuilt_graph(self, mock_draw_pyvis):
+        """Test that a prebuilt LineageGraph is used instead of the edge list"""
+        graph = LineageGraph(self.edges, self.node_types)
 
-        # Create actual edges and focus nodes to match the implementation
-        edges = self.edges
-        node_types = self.node_types
-        focus_nodes = ["view1"]
-        save_path = self.test_dir
-        file_name = "test_focused"
-        auto_open = False
-
-        # Create a real directed graph for mocked functions to operate on
-        mock_graph = MagicMock()
-
-        # Create a patched version of nx.DiGraph that returns our mock_graph
-        with patch("networkx.DiGraph", return_value=mock_graph) as mock_digraph:
-            # Mock the check for 'node in G' to return True for our focus node
-            mock_graph.__contains__.return_value = True
-
-            # Create patches for nx.ancestors and nx.descendants
-            with patch("networkx.ancestors") as mock_ancestors:
-                with patch("networkx.descendants") as mock_descendants:
-                    # Set return values for our mocked functions
-                    mock_ancestors.return_value = {"table1", "table2"}
-                    mock_descendants.return_value = {"view2"}
-
-                    # Mock the subgraph and copy methods
-                    mock_subgraph = MagicMock()
-                    mock_graph.subgraph.return_value = mock_subgraph
-                    mock_copy = MagicMock()
-                    mock_subgraph.copy.return_value = mock_copy
-                    mock_copy.nodes.return_value = [
-                        "table1",
-                        "table2",
-                        "view1",
-                        "view2",
-                    ]
-                    mock_copy.edges.return_value = self.edges
-
-                    # Call function under test
-                    draw_focused_data_flow(
-                        edges,
-                        node_types,
-                        focus_nodes=focus_nodes,
-                        save_path=save_path,
-                        file_name=file_name,
-                        auto_open=auto_open,
-                    )
-
-                    # Verify DiGraph was created
-                    mock_digraph.assert_called_once()
-
-                    # Verify edges were added to the graph
-                    mock_graph.add_edges_from.assert_called_once_with(edges)
-
-                    # Verify ancestors and descendants were called with the focus node
-                    mock_ancestors.assert_called_once_with(mock_graph, "view1")
-                    mock_descendants.assert_called_once_with(mock_graph, "view1")
-
-                    # Verify the subgraph was created and copied
-                    mock_graph.subgraph.assert_called_once()
-                    mock_subgraph.copy.assert_called_once()
-
-                    # Verify draw_pyvis_html was called with the focused subgraph
-                    mock_draw_pyvis.assert_called_once()
+        draw_focused_data_flow(
+            [], self.node_types, focus_nodes=["view2"], see_descendants=False, graph=graph
+        )
+
+        edges_arg = mock_draw_pyvis.call_args[0][0]
+        self.assertEqual(set(edges_arg), set(self.edges))
 
     @patch("src.pyvis_mod.draw_pyvis_html")
     def test_node_styling(self, mock_draw_pyvis):
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from src import generate_data_flow
+from src.dataflow_structs import InvalidSQLError
+from src.generate_data_flow import expand_metadata_paths, parse_dumps
+
+
+FILES = {
+    "sales/customers.sql": "CREATE TABLE sales.customers (id INT PRIMARY KEY);\n",
+    "sales/orders.sql": "CREATE TABLE sales.orders (id INT, customer_id INT REFERENCES sales.customers (id));\n",
+    "sales/orders_fk.ddl": "ALTER TABLE sales.orders ADD CONSTRAINT fk_p FOREIGN KEY (id) REFERENCES dw.products (id);\n",
+    "rpt/v_orders.sql": "CREATE VIEW rpt.v_orders AS SELECT o.id FROM orders o JOIN sales.customers c ON c.id = o.customer_id;\n",
+    "rpt/scratch.sql": "SELECT 1;\n",
+    "README.md": "CREATE TABLE not_sql (id INT);\n",
+}
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    # The JSON structure is written relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    root = tmp_path / "models"
+    for name, content in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return root
+
+
+def test_expand_metadata_paths_walks_directories_and_globs(models):
+    assert [p[len(str(models)) + 1:] for p in expand_metadata_paths(models)] == [
+        "rpt/scratch.sql", "rpt/v_orders.sql", "sales/customers.sql", "sales/orders.sql", "sales/orders_fk.ddl",
+    ]
+    assert expand_metadata_paths([str(models / "**" / "orders*.*"), models / "rpt" / "v_orders.sql"]) == [
+        str(models / "rpt" / "v_orders.sql"), str(models / "sales" / "orders.sql"), str(models / "sales" / "orders_fk.ddl"),
+    ]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_parse_dumps_merges_files_and_resolves_cross_file_references(models, jobs):
+    edges, node_types, stats = parse_dumps(models, "ansi", use_cache=False, jobs=jobs)
+
+    assert set(node_types) == {"dw.products", "rpt.v_orders", "sales.customers", "sales.orders"}
+    # The unqualified "orders" of the view resolves to the table another file defines.
+    assert set(edges) == {
+        ("sales.orders", "sales.customers"),
+        ("sales.orders", "dw.products"),
+        ("sales.orders", "rpt.v_orders"),
+        ("sales.customers", "rpt.v_orders"),
+    }
+    assert node_types["sales.orders"]["definition"].startswith("CREATE TABLE sales.orders")
+    assert "-- Additional DDL --\nALTER TABLE sales.orders" in node_types["sales.orders"]["definition"]
+    assert stats == {"dw": 1, "rpt": 1, "sales": 2}
+    # The merged graph is written once, not the graph of whichever file was parsed last.
+    written = json.loads((models.parent / "json_structure" / "edges.json").read_text())
+    assert [tuple(edge) for edge in written] == edges
+
+
+def test_parse_dumps_merges_column_lineage(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "a.sql").write_text("CREATE TABLE s.a (id int);\n")
+    (tmp_path / "v.sql").write_text("CREATE VIEW s.v AS SELECT id FROM s.a;\n")
+
+    parse_dumps(tmp_path, "postgresql", use_cache=False, column_lineage=True)
+
+    written = json.loads((tmp_path / "json_structure" / "column_lineage.json").read_text())
+    assert written == {"columns": ["s.a.id", "s.v.id"], "edges": [[0, 1]]}
+
+
+def test_parse_dumps_hands_a_single_file_to_parse_dump(models, monkeypatch):
+    calls = []
+    monkeypatch.setattr(generate_data_flow, "parse_dump", lambda *args, **kwargs: calls.append(args) or ([], {}, {}))
+
+    parse_dumps(models / "sales" / "orders.sql", "ansi")
+
+    assert calls == [(str(models / "sales" / "orders.sql"), "ansi")]
+
+
+def test_parse_dumps_only_skips_files_without_ddl(models, monkeypatch):
+    def parser_bug(*args, **kwargs):
+        raise ValueError("parser bug")
+
+    monkeypatch.setattr(generate_data_flow, "_parse_dump", parser_bug)
+    with pytest.raises(ValueError, match="parser bug"):
+        parse_dumps(models / "sales", "ansi", use_cache=False)
+
+
+def test_parse_dumps_raises_when_no_file_has_ddl(models):
+    (models / "rpt" / "scratch_2.sql").write_text("-- nothing here\n")
+
+    with pytest.raises(InvalidSQLError):
+        parse_dumps(models / "rpt" / "scratch*.sql", "ansi", use_cache=False)
@@ -0,0 +1,154 @@
+import json
+import os
+import shutil
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src import generate_data_flow, parse_cache
+from src.dataflow_structs import load_definition
+from src.parser_register import DatabaseType
+from src.parsers import parser_postgres
+
+
+SAMPLE_VQL = """
+CREATE OR REPLACE VIEW db1.v_orders AS SELECT * FROM db1.t_orders;
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "parse_cache"
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", directory)
+    monkeypatch.setattr(parse_cache, "_digest_memo", {})
+    return directory
+
+
+@pytest.fixture
+def vql_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "export.vql"
+    path.write_text(SAMPLE_VQL, encoding="utf-8")
+    return path
+
+
+def test_cache_key_depends_on_content_type_and_version(vql_file):
+    key = parse_cache.cache_key(vql_file, "DENODO", "1")
+    assert key == parse_cache.cache_key(vql_file, "DENODO", "1")
+    assert key != parse_cache.cache_key(vql_file, "POSTGRESQL", "1")
+    assert key != parse_cache.cache_key(vql_file, "DENODO", "2")
+    # Options that only change how the dump is read do not change the key.
+    assert key == parse_cache.cache_key(vql_file, "DENODO", "1", {"jobs": 4, "incremental": True})
+
+    vql_file.write_text(SAMPLE_VQL + "\n-- changed\n", encoding="utf-8")
+    os.utime(vql_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert key != parse_cache.cache_key(vql_file, "DENODO", "1")
+
+
+def test_file_digest_keeps_one_stat_entry_per_file(vql_file, tmp_path, cache_dir, monkeypatch):
+    other = tmp_path / "other.vql"
+    other.write_text(SAMPLE_VQL, encoding="utf-8")
+    digest = parse_cache.file_digest(vql_file)
+    assert parse_cache.file_digest(other) == digest
+    assert len(list((cache_dir / parse_cache.STAT_DIR_NAME).glob("*.json"))) == 2
+
+    # A fresh run reads the digest from the file's own entry instead of hashing the file again.
+    monkeypatch.setattr(parse_cache, "_digest_memo", {})
+    with patch.object(parse_cache.hashlib, "file_digest", side_effect=AssertionError("re-hashed")):
+        assert parse_cache.file_digest(vql_file) == digest
+
+    vql_file.write_text(SAMPLE_VQL + "\n-- changed\n", encoding="utf-8")
+    os.utime(vql_file, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert parse_cache.file_digest(vql_file) != digest
+    assert len(list((cache_dir / parse_cache.STAT_DIR_NAME).glob("*.json"))) == 2
+
+
+def test_store_and_load_round_trip(cache_dir):
+    result = ([("a", "b")], {"b": {"type": "view", "database": "", "full_name": "b", "definition": None}}, {})
+    assert parse_cache.load("k") is None
+    parse_cache.store("k", result)
+    assert parse_cache.load("k") == result
+
+
+def test_evict_removes_least_recently_used_entries(cache_dir):
+    payload = ([], {"x": {"definition": "x" * 1000}}, {})
+    for index, key in enumerate(["old", "mid", "new"]):
+        parse_cache.store(key, payload, max_bytes=10**9)
+        os.utime(cache_dir / f"{key}.pkl", (index, index))
+    entry_size = (cache_dir / "new.pkl").stat().st_size
+
+    parse_cache.evict(2 * entry_size)
+
+    assert not (cache_dir / "old.pkl").exists()
+    assert (cache_dir / "mid.pkl").exists()
+    assert (cache_dir / "new.pkl").exists()
+
+
+def test_parse_dump_uses_cache_unless_disabled(vql_file):
+    first = generate_data_flow.parse_dump(vql_file, DatabaseType.DENODO)
+
+    with patch("src.parsers.parser_denodo.parse_dump") as mock_parse:
+        assert generate_data_flow.parse_dump(vql_file, DatabaseType.DENODO) == first
+        mock_parse.assert_not_called()
+
+        mock_parse.return_value = first
+        generate_data_flow.parse_dump(vql_file, DatabaseType.DENODO, use_cache=False)
+        mock_parse.assert_called_once()
+
+
+def test_parse_dump_parses_sql_strings_with_the_cache_on(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sql = "CREATE TABLE a(id int); CREATE VIEW v AS SELECT * FROM a;"
+    edges, node_types, _ = generate_data_flow.parse_dump(sql, "postgresql")
+    assert edges == [("a", "v")]
+    assert not list(cache_dir.glob("*.pkl"))
+
+
+def test_parse_dump_writes_json_structure_on_cache_hits(vql_file, tmp_path):
+    edges, _, _ = generate_data_flow.parse_dump(vql_file, DatabaseType.DENODO)
+    edges_file = tmp_path / "json_structure" / "edges.json"
+    edges_file.write_text("[]", encoding="utf-8")  # Left behind by a run on another dump
+
+    generate_data_flow.parse_dump(vql_file, DatabaseType.DENODO)
+    assert [tuple(edge) for edge in json.loads(edges_file.read_text(encoding="utf-8"))] == edges
+
+
+def test_parse_dump_skips_cache_for_debug_output(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(parser_postgres.path_utils, "DATA_FLOW_BASE_DIR", tmp_path / "data")
+    dump = tmp_path / "dump.sql"
+    dump.write_text("CREATE TABLE a(id int);\n", encoding="utf-8")
+    generate_data_flow.parse_dump(dump, "postgresql")
+
+    generate_data_flow.parse_dump(dump, "postgresql", debug_cleaned_sql=True)
+    assert parser_postgres.cleaned_sql_debug_path(dump).exists()
+
+
+def test_parse_dump_collects_column_lineage_past_the_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dump = tmp_path / "dump.sql"
+    dump.write_text("CREATE TABLE a(id int);\nCREATE VIEW v AS SELECT id FROM a;\n", encoding="utf-8")
+    generate_data_flow.parse_dump(dump, "postgresql")
+
+    generate_data_flow.parse_dump(dump, "postgresql", column_lineage=True)
+    written = json.loads((tmp_path / "json_structure" / "column_lineage.json").read_text(encoding="utf-8"))
+    assert written["columns"] == ["a.id", "v.id"]
+
+
+def test_parse_dump_caches_definition_refs_per_input_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    original = tmp_path / "export.sql"
+    original.write_text(
+        "CREATE OR REPLACE PROCEDURE hr.touch AS\nBEGIN\n  UPDATE hr.emp SET x = 1;\nEND;\n/\n", encoding="utf-8"
+    )
+    _, node_types, _ = generate_data_flow.parse_dump(original, "oracle")
+    definition = load_definition(node_types["HR.TOUCH"])
+    assert definition.startswith("CREATE OR REPLACE PROCEDURE hr.touch")
+
+    moved = tmp_path / "moved.sql"
+    shutil.copyfile(original, moved)
+    original.unlink()
+    _, node_types, _ = generate_data_flow.parse_dump(moved, "oracle")
+    assert [ref["path"] for ref in node_types["HR.TOUCH"]["definition_refs"]] == [str(moved)]
+    assert load_definition(node_types["HR.TOUCH"]) == definition
@@ -0,0 +1,61 @@
+import pytest
+
+from src.dataflow_structs import InvalidSQLError
+from src.parser_register import _PARSER_REGISTRY, DatabaseType
+from src.parsers import parser_ansi
+
+
+SAMPLE_DDL = """-- Plain DDL; no dialect extensions
+CREATE TABLE sales.customers (id INT PRIMARY KEY, name VARCHAR(100) DEFAULT 'a;b');
+CREATE TABLE sales.orders (id INT, customer_id INT REFERENCES sales.customers (id));
+CREATE TABLE items (id INT, order_id INT, FOREIGN KEY (order_id) REFERENCES sales.orders (id));
+ALTER TABLE items ADD CONSTRAINT fk_product FOREIGN KEY (id) REFERENCES dw.products (id);
+INSERT INTO items VALUES (1, 2);
+/* reporting */ CREATE VIEW rpt.v_orders AS
+  WITH recent AS (SELECT * FROM sales.orders)
+  SELECT r.id, c.name FROM recent r JOIN sales.customers c ON c.id = r.customer_id;
+CREATE MATERIALIZED VIEW rpt.mv_orders AS SELECT * FROM rpt.v_orders;
+CREATE TABLE rpt.item_ids AS SELECT id FROM items
+"""
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def test_parse_dump_extracts_tables_views_and_foreign_keys():
+    edges, node_types, stats = parser_ansi.parse_dump(SAMPLE_DDL)
+
+    assert {key: info["type"] for key, info in node_types.items()} == {
+        "dw.products": "table",
+        "items": "table",
+        "recent": "cte_view",
+        "rpt.item_ids": "table",
+        "rpt.mv_orders": "materialized_view",
+        "rpt.v_orders": "view",
+        "sales.customers": "table",
+        "sales.orders": "table",
+    }
+    assert set(edges) == {
+        ("sales.orders", "sales.customers"),
+        ("items", "sales.orders"),
+        ("items", "dw.products"),
+        ("sales.orders", "recent"),
+        ("recent", "rpt.v_orders"),
+        ("sales.customers", "rpt.v_orders"),
+        ("rpt.v_orders", "rpt.mv_orders"),
+        ("items", "rpt.item_ids"),
+    }
+    assert "-- Additional DDL --\nALTER TABLE items" in node_types["items"]["definition"]
+    assert stats == {"dw": 1, "rpt": 3, "sales": 2}
+
+
+def test_ansi_is_no_longer_routed_through_the_postgres_parser():
+    assert _PARSER_REGISTRY[DatabaseType.ANSI] is parser_ansi
+
+
+def test_parse_dump_raises_without_ddl():
+    with pytest.raises(InvalidSQLError):
+        parser_ansi.parse_dump("SELECT 1; INSERT INTO t VALUES (1);")
@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.parsers import parser_denodo
+
+
+SAMPLE_VQL = """
+CREATE OR REPLACE TABLE db2.base1 DATA_LOAD_QUERY = 'SELECT * FROM db9.src';
+CREATE OR REPLACE VIEW db1.v1 AS SELECT * FROM base1 JOIN db2.base2 ON a = b;
+CREATE OR REPLACE VIEW db1.v2 AS
+    WITH c1 AS (SELECT * FROM v1), c2 AS (SELECT * FROM c1 JOIN base2 ON x = y)
+    SELECT * FROM c2 JOIN db3.t3 ON 1 = 1
+    DESCRIPTION = 'uses source>>db4.ext<<source';
+CREATE OR REPLACE INTERFACE VIEW db1.iv SET IMPLEMENTATION db1.v2;
+CREATE OR REPLACE VIEW db1.v3 AS SQL SELECT a FROM v2 UNION ALL SQL SELECT b FROM iv;
+"""
+
+
+@pytest.fixture
+def vql_file(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(parser_denodo, "INCREMENTAL_STATE_DIR", tmp_path / "state")
+    path = tmp_path / "export.vql"
+    path.write_text(SAMPLE_VQL, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def scan_counter(monkeypatch):
+    scanned = []
+    original = parser_denodo.scan_statement
+
+    def counting_scan(raw_stmt):
+        scanned.append(raw_stmt)
+        return original(raw_stmt)
+
+    monkeypatch.setattr(parser_denodo, "scan_statement", counting_scan)
+    return scanned
+
+
+def test_scan_script_references_keeps_order_of_appearance():
+    refs = parser_denodo.scan_script_references(
+        "SELECT * FROM b JOIN db.a ON 1 = 1 JOIN b ON 2 = 2 DESCRIPTION = 'source>>x.y<<source'"
+    )
+    assert refs.tables == ["b", "db.a"]
+    assert refs.description_sources == ["x.y"]
+
+
+def test_scan_script_references_ignores_strings_and_comments():
+    refs = parser_denodo.scan_script_references(
+        "SELECT * FROM /* FROM c1 */ db.a -- JOIN c2\n"
+        "JOIN 'b' ON a.x = 'FROM c3' "
+        "DESCRIPTION = 'it''s -- not a comment source>>db.src<<source'"
+    )
+    assert refs.tables == ["db.a", "b"]
+    assert refs.description_sources == ["db.src"]
+
+
+def test_scan_script_references_skips_subqueries_and_reads_implementations():
+    refs = parser_denodo.scan_script_references(
+        "SELECT * FROM (SELECT 1 FROM inner_t) JOIN TABLE(f()) ON 1 = 1 "
+        "UNION SELECT * FROM FLATTEN nested SET IMPLEMENTATION db.impl"
+    )
+    assert refs.tables == ["inner_t", "nested", "db.impl"]
+    assert refs.implementations == ["db.impl"]
+
+
+def test_strip_vql_comments_keeps_comment_markers_inside_strings():
+    stripped = parser_denodo.strip_vql_comments("a -- x\nb = '--y /*z*/' # w\n/* v */c")
+    assert stripped == "a \nb = '--y /*z*/' \nc"
+
+
+def test_incremental_parse_matches_full_parse(vql_file):
+    full = parser_denodo.parse_dump(str(vql_file))
+    first = parser_denodo.parse_dump(str(vql_file), incremental=True)
+    second = parser_denodo.parse_dump(str(vql_file), incremental=True)
+
+    assert first == full
+    assert second == full
+    assert ("c2", "v2") in full[0]
+    assert ("ext", "v2") in full[0]
+
+
+def test_incremental_parse_only_rescans_changed_statements(vql_file, scan_counter):
+    parser_denodo.parse_dump(str(vql_file), incremental=True)
+    assert len(scan_counter) == 5
+
+    scan_counter.clear()
+    vql_file.write_text(
+        SAMPLE_VQL.replace("SELECT b FROM iv", "SELECT b FROM db3.t4"), encoding="utf-8"
+    )
+    edges, node_types, _ = parser_denodo.parse_dump(str(vql_file), incremental=True)
+
+    assert len(scan_counter) == 1
+    assert "db3.t4" in scan_counter[0]
+    assert ("t4", "v3") in edges
+    assert ("iv", "v3") not in edges
+    assert (edges, node_types) == parser_denodo.parse_dump(str(vql_file))[:2]
+
+
+def test_incremental_parse_drops_deleted_statements(vql_file):
+    parser_denodo.parse_dump(str(vql_file), incremental=True)
+    vql_file.write_text(SAMPLE_VQL.split("CREATE OR REPLACE INTERFACE")[0], encoding="utf-8")
+
+    edges, node_types, _ = parser_denodo.parse_dump(str(vql_file), incremental=True)
+
+    assert "iv" not in node_types
+    assert "v3" not in node_types
+    assert not any("iv" in edge for edge in edges)
+
+
+def test_parses_do_not_share_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    other_vql = "CREATE OR REPLACE VIEW db5.w1 AS SELECT * FROM db5.u1;"
+    expected = {
+        vql: parser_denodo.parse_dump(vql)[:2] for vql in (SAMPLE_VQL, other_vql)
+    }
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        inputs = [SAMPLE_VQL, other_vql] * 4
+        results = list(pool.map(parser_denodo.parse_dump, inputs))
+
+    for vql, (edges, node_types, _) in zip(inputs, results):
+        assert (edges, node_types) == expected[vql]
+    assert "w1" not in expected[SAMPLE_VQL][1]
@@ -0,0 +1,122 @@
+import pytest
+
+from src.dataflow_structs import InvalidSQLError
+from src.parsers import parser_mysql
+
+
+SAMPLE_DUMP = r"""-- MySQL dump 10.13  Distrib 8.0.36, for Linux (x86_64)
+--
+-- Host: localhost    Database: shop
+-- ------------------------------------------------------
+/*!40101 SET NAMES utf8mb4 */;
+
+CREATE TABLE `customers` (
+  `id` int NOT NULL AUTO_INCREMENT,
+  `name` varchar(100) DEFAULT NULL COMMENT 'REFERENCES nothing; really',
+  PRIMARY KEY (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+LOCK TABLES `customers` WRITE;
+/*!40000 ALTER TABLE `customers` DISABLE KEYS */;
+INSERT INTO `customers` VALUES (1,'O\'Brien; CREATE TABLE fake (id int)'),(2,'a\\');
+/*!40000 ALTER TABLE `customers` ENABLE KEYS */;
+UNLOCK TABLES;
+
+CREATE TABLE `orders` (
+  `id` int NOT NULL,
+  `customer_id` int,
+  CONSTRAINT `fk_c` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`id`)
+) ENGINE=InnoDB;
+CREATE TABLE `audit` (`id` int, `msg` text);
+
+/*!50001 CREATE VIEW `v_orders` AS SELECT 1 AS `id`*/;
+
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `trg_orders_ai` AFTER INSERT ON `orders` FOR EACH ROW BEGIN
+  INSERT INTO audit (msg) SELECT name FROM customers WHERE id = NEW.customer_id;
+END */;;
+CREATE DEFINER=`root`@`localhost` PROCEDURE `archive_orders`(IN p_year INT)
+BEGIN
+  DECLARE y INT DEFAULT EXTRACT(YEAR FROM NOW());
+  INSERT INTO archive.orders_old SELECT * FROM orders o JOIN customers c ON c.id = o.customer_id;
+  UPDATE audit SET msg = 'done; FROM fake';
+END ;;
+DELIMITER ;
+
+/*!50001 CREATE ALGORITHM=UNDEFINED */
+/*!50013 DEFINER=`root`@`localhost` SQL SECURITY DEFINER */
+/*!50001 VIEW `v_orders` AS with `recent` as (select `o`.`id` AS `id`,`o`.`customer_id` AS `cid` from `orders` `o`) select `r`.`id` AS `id` from (`recent` `r` join `shop`.`customers` `c` on((`c`.`id` = `r`.`cid`))) */;
+"""
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def test_parse_dump_extracts_tables_views_triggers_and_routines():
+    edges, node_types, stats = parser_mysql.parse_dump(SAMPLE_DUMP)
+
+    assert {key: info["type"] for key, info in node_types.items()} == {
+        "archive.orders_old": "table",
+        "recent": "cte_view",
+        "shop.archive_orders": "procedure",
+        "shop.audit": "table",
+        "shop.customers": "table",
+        "shop.orders": "table",
+        "shop.trg_orders_ai": "trigger",
+        "shop.v_orders": "view",
+    }
+    assert set(edges) == {
+        ("shop.orders", "shop.customers"),
+        ("shop.orders", "shop.trg_orders_ai"),
+        ("shop.customers", "shop.trg_orders_ai"),
+        ("shop.trg_orders_ai", "shop.audit"),
+        ("shop.orders", "shop.archive_orders"),
+        ("shop.customers", "shop.archive_orders"),
+        ("shop.archive_orders", "archive.orders_old"),
+        ("shop.archive_orders", "shop.audit"),
+        ("shop.orders", "recent"),
+        ("recent", "shop.v_orders"),
+        ("shop.customers", "shop.v_orders"),
+    }
+    assert stats == {"archive": 1, "shop": 6}
+    assert "with `recent`" in node_types["shop.v_orders"]["definition"]
+
+
+def test_parse_dump_skips_insert_payloads_without_splitting_them(tmp_path, monkeypatch):
+    fed = []
+    original_feed = parser_mysql.StatementSplitter.feed
+
+    def recording_feed(self, text):
+        fed.append(text)
+        return original_feed(self, text)
+
+    monkeypatch.setattr(parser_mysql.StatementSplitter, "feed", recording_feed)
+    dump = tmp_path / "dump.sql"
+    dump.write_text(SAMPLE_DUMP, encoding="utf-8")
+
+    _, node_types, _ = parser_mysql.parse_dump(str(dump))
+
+    assert not any(text.startswith(("INSERT INTO `customers`", "LOCK TABLES")) for text in fed)
+    assert "shop.fake" not in node_types
+
+
+def test_parse_dump_handles_multiline_inserts_and_use():
+    edges, node_types, _ = parser_mysql.parse_dump(
+        "USE `crm`;\n"
+        "INSERT INTO t VALUES ('a;b',\n"
+        "'CREATE TABLE fake (id int);');\n"
+        "CREATE TABLE `crm`.`leads` (`id` int, FOREIGN KEY (`id`) REFERENCES `sales`.`accounts` (`id`));\n"
+        "ALTER TABLE leads ADD CONSTRAINT fk2 FOREIGN KEY (id) REFERENCES owners (id);\n"
+    )
+
+    assert set(node_types) == {"crm.leads", "sales.accounts", "crm.owners"}
+    assert edges == [("crm.leads", "sales.accounts"), ("crm.leads", "crm.owners")]
+    assert "-- Additional DDL --" in node_types["crm.leads"]["definition"]
+
+
+def test_parse_dump_without_ddl_raises():
+    with pytest.raises(InvalidSQLError):
+        parser_mysql.parse_dump("INSERT INTO t VALUES (1);\nSET NAMES utf8mb4;\n")
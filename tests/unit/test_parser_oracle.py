@@ -0,0 +1,156 @@
+import pytest
+
+from src.dataflow_structs import InvalidSQLError, load_definition
+from src.parsers import parser_oracle
+
+
+SAMPLE_EXPORT = """SET ECHO OFF
+SPOOL hr_ddl.log
+PROMPT Creating objects; please wait
+ALTER SESSION SET CURRENT_SCHEMA = hr;
+
+  CREATE TABLE "HR"."DEPARTMENTS"
+   (	"ID" NUMBER NOT NULL ENABLE,
+	"NAME" VARCHAR2(30) DEFAULT 'it''s; fine'
+   ) SEGMENT CREATION IMMEDIATE ;
+
+  CREATE TABLE "HR"."EMPLOYEES"
+   (	"ID" NUMBER,
+	"DEPT_ID" NUMBER
+   )
+/
+  ALTER TABLE "HR"."EMPLOYEES" ADD CONSTRAINT "EMP_DEPT_FK" FOREIGN KEY ("DEPT_ID")
+	  REFERENCES "HR"."DEPARTMENTS" ("ID") ENABLE;
+
+  CREATE DATABASE LINK "SALES.EXAMPLE.COM"
+   CONNECT TO "APP" IDENTIFIED BY VALUES ':1'
+   USING 'salesdb';
+
+  CREATE OR REPLACE FORCE EDITIONABLE VIEW "HR"."EMP_DEPT_V" ("ID", "NAME") AS
+  WITH d AS (SELECT id, name FROM departments)
+  SELECT e.id, d.name FROM employees e JOIN d ON d.id = e.dept_id;
+
+  CREATE OR REPLACE VIEW hr.remote_orders_v AS SELECT o.id FROM orders@sales o, hr.employees e WHERE o.emp = e.id;
+
+  CREATE MATERIALIZED VIEW "HR"."DEPT_COUNTS_MV" ("DEPT_ID", "N")
+  BUILD IMMEDIATE REFRESH COMPLETE ON DEMAND
+  AS SELECT dept_id, count(*) n FROM hr.employees GROUP BY dept_id;
+
+  CREATE OR REPLACE PUBLIC SYNONYM "EMPS" FOR "HR"."EMPLOYEES";
+  CREATE OR REPLACE SYNONYM hr.cust FOR sales_owner.customers@sales.example.com;
+
+  CREATE OR REPLACE EDITIONABLE PACKAGE "HR"."PAYROLL" AS
+  PROCEDURE run(p_month IN DATE);
+END payroll;
+/
+  CREATE OR REPLACE EDITIONABLE PACKAGE BODY "HR"."PAYROLL" AS
+  PROCEDURE run(p_month IN DATE) IS
+    v_cnt NUMBER;
+  BEGIN
+    SELECT count(*) INTO v_cnt FROM hr.employees WHERE EXTRACT(MONTH FROM p_month) > 0;
+    INSERT INTO hr.payslips (id) SELECT id FROM employees;
+    /* a comment with a slash
+/
+    */
+    UPDATE hr.departments SET name = '/
+' WHERE id = 1;
+    MERGE INTO hr.totals t USING hr.payslips p ON (t.id = p.id) WHEN MATCHED THEN UPDATE SET t.n = 1;
+  END run;
+END payroll;
+/
+CREATE OR REPLACE TRIGGER hr.emp_audit
+  AFTER INSERT OR DELETE ON hr.employees FOR EACH ROW
+BEGIN
+  INSERT INTO hr.audit_log VALUES (:new.id);
+END;
+/
+BEGIN
+  DBMS_STATS.GATHER_SCHEMA_STATS('HR');
+END;
+/
+EXIT
+"""
+
+EXPECTED_TYPES = {
+    "D": "cte_view",
+    "HR.AUDIT_LOG": "table",
+    "HR.CUST": "synonym",
+    "HR.DEPARTMENTS": "table",
+    "HR.DEPT_COUNTS_MV": "materialized_view",
+    "HR.EMPLOYEES": "table",
+    "HR.EMP_AUDIT": "trigger",
+    "HR.EMP_DEPT_V": "view",
+    "HR.PAYROLL": "package",
+    "HR.PAYSLIPS": "table",
+    "HR.REMOTE_ORDERS_V": "view",
+    "HR.TOTALS": "table",
+    "ORDERS@SALES.EXAMPLE.COM": "table",
+    "PUBLIC.EMPS": "synonym",
+    "SALES.EXAMPLE.COM": "db_link",
+    "SALES_OWNER.CUSTOMERS@SALES.EXAMPLE.COM": "table",
+}
+EXPECTED_EDGES = {
+    ("HR.EMPLOYEES", "HR.DEPARTMENTS"),
+    ("HR.DEPARTMENTS", "D"),
+    ("D", "HR.EMP_DEPT_V"),
+    ("HR.EMPLOYEES", "HR.EMP_DEPT_V"),
+    ("SALES.EXAMPLE.COM", "ORDERS@SALES.EXAMPLE.COM"),
+    ("ORDERS@SALES.EXAMPLE.COM", "HR.REMOTE_ORDERS_V"),
+    ("HR.EMPLOYEES", "HR.REMOTE_ORDERS_V"),
+    ("HR.EMPLOYEES", "HR.DEPT_COUNTS_MV"),
+    ("HR.EMPLOYEES", "PUBLIC.EMPS"),
+    ("SALES.EXAMPLE.COM", "SALES_OWNER.CUSTOMERS@SALES.EXAMPLE.COM"),
+    ("SALES_OWNER.CUSTOMERS@SALES.EXAMPLE.COM", "HR.CUST"),
+    ("HR.EMPLOYEES", "HR.PAYROLL"),
+    ("HR.PAYROLL", "HR.PAYSLIPS"),
+    ("HR.PAYROLL", "HR.DEPARTMENTS"),
+    ("HR.PAYSLIPS", "HR.PAYROLL"),
+    ("HR.PAYROLL", "HR.TOTALS"),
+    ("HR.EMPLOYEES", "HR.EMP_AUDIT"),
+    ("HR.EMP_AUDIT", "HR.AUDIT_LOG"),
+}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def test_parse_dump_extracts_views_synonyms_links_and_plsql_units():
+    edges, node_types, stats = parser_oracle.parse_dump(SAMPLE_EXPORT)
+
+    assert {key: info["type"] for key, info in node_types.items()} == EXPECTED_TYPES
+    assert set(edges) == EXPECTED_EDGES
+    assert stats == {"HR": 12, "PUBLIC": 1, "SALES.EXAMPLE.COM": 2}
+    assert node_types["HR.EMPLOYEES"]["definition"].count("-- Additional DDL --") == 1
+    assert "USING 'salesdb'" in node_types["SALES.EXAMPLE.COM"]["definition"]
+    # Package spec and body, both ended by their "/" line; the quoted "/" line is part of the body.
+    definition = node_types["HR.PAYROLL"]["definition"]
+    assert definition.count("-- Additional DDL --") == 1
+    assert definition.endswith("END payroll;")
+
+
+def test_parse_dump_keeps_only_offsets_of_plsql_units_from_files(tmp_path):
+    export = tmp_path / "export.sql"
+    export.write_bytes(SAMPLE_EXPORT.encode("utf-8"))
+
+    edges, node_types, _ = parser_oracle.parse_dump(str(export))
+
+    assert set(edges) == EXPECTED_EDGES
+    payroll = node_types["HR.PAYROLL"]
+    assert payroll["definition"] is None
+    assert [ref["path"] for ref in payroll["definition_refs"]] == [str(export)] * 2
+    assert load_definition(payroll) == parser_oracle.parse_dump(SAMPLE_EXPORT)[1]["HR.PAYROLL"]["definition"]
+    assert load_definition(node_types["HR.EMP_DEPT_V"]) == node_types["HR.EMP_DEPT_V"]["definition"]
+
+
+def test_load_definition_returns_none_when_file_is_gone(tmp_path):
+    info = {"definition": None, "definition_refs": [{"path": str(tmp_path / "gone.sql"), "start": 0, "end": 5}]}
+
+    assert load_definition(info) is None
+
+
+def test_parse_dump_without_ddl_raises():
+    with pytest.raises(InvalidSQLError):
+        parser_oracle.parse_dump("SET ECHO OFF\nBEGIN\n  NULL;\nEND;\n/\nSELECT 1 FROM dual;\n")
@@ -0,0 +1,214 @@
+import pytest
+
+from src.parsers import parser_postgres, parser_utils
+
+
+SAMPLE_DUMP = """--
+-- PostgreSQL database dump
+--
+SET client_encoding = 'UTF8';
+
+/* block comment; spanning
+   two lines */
+CREATE FUNCTION sales.f() RETURNS integer
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+  RETURN 1;
+END;
+$$;
+
+CREATE TABLE sales.orders (
+    id integer NOT NULL,
+    note text DEFAULT 'a;b'
+);
+
+CREATE VIEW sales.v_orders AS
+ WITH recent AS (
+   SELECT o.id FROM sales.orders o
+ )
+ SELECT r.id FROM recent r JOIN sales.customers c ON c.id = r.id;
+
+COPY sales.orders (id, note) FROM stdin;
+1\thello; world
+2\t/* not a comment
+\\.
+
+CREATE VIEW sales.v_latest AS SELECT id FROM sales.v_orders;
+"""
+
+
+@pytest.fixture(autouse=True)
+def sqlfluff_cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "sqlfluff_cache"
+    monkeypatch.setattr(parser_utils, "SQLFLUFF_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def dump_file(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "dump.sql"
+    path.write_text(SAMPLE_DUMP, encoding="utf-8")
+    return path
+
+
+def test_iter_statements_skips_copy_data_and_ignored_ddl(dump_file):
+    with open(dump_file, encoding="utf-8") as f:
+        statements = list(parser_postgres.iter_statements(f))
+
+    assert not any("hello" in s for s in statements)
+    assert not any("FUNCTION" in s for s in statements)
+    assert any(s.startswith("CREATE VIEW sales.v_latest") for s in statements)
+    # Semicolons inside quoted strings do not split statements.
+    assert any("DEFAULT 'a;b'" in s for s in statements)
+
+
+def test_parse_dump_finds_view_and_cte_edges(dump_file):
+    edges, _, _ = parser_postgres.parse_dump(str(dump_file))
+
+    assert ("sales.v_orders", "sales.v_latest") in edges
+    assert ("recent", "sales.v_orders") in edges
+
+
+def test_parse_dump_rejects_content_without_ddl(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(parser_postgres.InvalidSQLError):
+        parser_postgres.parse_dump("SELECT 1;")
+
+
+def test_parallel_parse_matches_sequential(dump_file):
+    edges, node_types, stats = parser_postgres.parse_dump(str(dump_file))
+    p_edges, p_node_types, p_stats = parser_postgres._parse_input(str(dump_file), jobs=2, batch_size=1)
+
+    assert p_edges == edges
+    assert p_node_types == node_types
+    assert list(p_node_types) == list(node_types)
+    assert p_stats == stats
+
+
+def test_column_lineage_resolves_ctes_unions_and_stars(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sql = """
+    CREATE TABLE s.orders (id int, customer_id int, amount numeric);
+    CREATE TABLE s.customers (id int, name text);
+    CREATE VIEW s.v AS
+      WITH r AS (SELECT id, customer_id, amount * 2 AS dbl FROM s.orders)
+      SELECT r.id, c.name AS customer, r.dbl FROM r JOIN s.customers c ON c.id = r.customer_id
+      UNION ALL SELECT o.id, 'n/a', o.amount FROM s.orders o;
+    CREATE VIEW s.w AS SELECT * FROM s.v;
+    """
+    lineage = parser_postgres.parse_column_lineage(sql)
+
+    assert set(lineage.edges()) == {
+        ("s.orders.id", "s.v.id"),
+        ("s.customers.name", "s.v.customer"),
+        ("s.orders.amount", "s.v.dbl"),
+        ("s.v.*", "s.w.*"),
+    }
+    assert lineage.upstream("s.w.customer") == {"s.v.customer", "s.customers.name"}
+    assert lineage.downstream("s.orders.amount") == {"s.v.dbl", "s.w.dbl"}
+    assert (tmp_path / "json_structure" / "column_lineage.json").exists()
+
+
+def test_parse_dump_collects_column_lineage_from_the_same_parse(dump_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    lineage = parser_postgres.ColumnLineage()
+    edges, _, _ = parser_postgres.parse_dump(str(dump_file), lineage=lineage)
+
+    assert ("sales.v_orders", "sales.v_latest") in edges
+    assert set(lineage.edges()) == set(parser_postgres.parse_column_lineage(str(dump_file)).edges())
+
+
+def test_parallel_column_lineage_matches_sequential(dump_file):
+    lineage = parser_postgres.ColumnLineage()
+    parser_postgres._parse_input(str(dump_file), jobs=2, batch_size=1, lineage=lineage)
+
+    assert set(lineage.edges()) == set(parser_postgres.parse_column_lineage(str(dump_file)).edges())
+    assert ("sales.orders.id", "sales.v_orders.id") in set(lineage.edges())
+
+
+def test_cleaned_sql_is_only_written_on_request(dump_file, tmp_path, monkeypatch):
+    monkeypatch.setattr(parser_postgres.path_utils, "DATA_FLOW_BASE_DIR", tmp_path / "data")
+    debug_path = parser_postgres.cleaned_sql_debug_path(str(dump_file))
+
+    parser_postgres.parse_dump(str(dump_file))
+    assert not debug_path.exists()
+    assert not (tmp_path / "cleaned_sql.sql").exists()
+
+    parser_postgres.parse_dump(str(dump_file), debug_cleaned_sql=True)
+    cleaned = debug_path.read_text(encoding="utf-8")
+    assert debug_path.parent == tmp_path / "data" / "debug"
+    assert "CREATE VIEW sales.v_latest" in cleaned
+    assert "hello" not in cleaned
+
+
+def test_fix_policy_never_raises_on_unparsable_statement(monkeypatch):
+    calls = []
+    monkeypatch.setattr(parser_postgres, "cached_sqlfluff_fix", lambda sql, **kw: calls.append(sql) or sql)
+    with pytest.raises(parser_postgres.InvalidSQLError):
+        parser_postgres._parse_statement("CREATE TABLE (", parser_postgres.FIX_NEVER)
+    assert calls == []
+
+
+def test_fix_policy_never_skips_sqlfluff_for_definitions(dump_file, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+    monkeypatch.setattr(parser_postgres, "cached_sqlfluff_fix", lambda sql, **kw: calls.append(sql) or sql)
+    _, node_types, _ = parser_postgres.parse_dump(str(dump_file), fix_policy=parser_postgres.FIX_NEVER)
+
+    assert calls == []
+    assert node_types["sales.v_orders"]["definition"].startswith("CREATE VIEW sales.v_orders AS WITH")
+
+
+def test_fix_policy_failed_only_fixes_statements_that_do_not_parse(monkeypatch):
+    calls = []
+
+    def fake_fix(sql, **kwargs):
+        calls.append(sql)
+        return "CREATE TABLE fixed (id INT)"
+
+    monkeypatch.setattr(parser_postgres, "cached_sqlfluff_fix", fake_fix)
+    parser_postgres._parse_statement("CREATE TABLE ok (id INT)", parser_postgres.FIX_FAILED)
+    assert calls == []
+
+    parsed = parser_postgres._parse_statement("CREATE TABLE (", parser_postgres.FIX_FAILED)
+    assert calls == ["CREATE TABLE ("]
+    assert parsed[0].find(parser_postgres.exp.Table).name == "fixed"
+
+
+def test_invalid_fix_policy_is_rejected(dump_file):
+    with pytest.raises(ValueError):
+        parser_postgres.parse_dump(str(dump_file), fix_policy="sometimes")
+
+
+def test_cached_sqlfluff_fix_reuses_result(sqlfluff_cache_dir, monkeypatch):
+    import sqlfluff
+
+    calls = []
+
+    def fake_fix(sql, **kwargs):
+        calls.append(sql)
+        return sql.upper()
+
+    monkeypatch.setattr(sqlfluff, "fix", fake_fix)
+    first = parser_utils.cached_sqlfluff_fix("select 1\n", dialect="postgres")
+    second = parser_utils.cached_sqlfluff_fix("select 1\n", dialect="postgres")
+
+    assert first == second == "SELECT 1\n"
+    assert len(calls) == 1
+    assert any(sqlfluff_cache_dir.rglob("*.sql"))
+
+
+def test_parse_dump_keeps_create_modifiers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sql = """
+    CREATE UNLOGGED TABLE s.a (id int);
+    CREATE OR REPLACE VIEW s.v AS SELECT id FROM s.a;
+    CREATE TEMPORARY VIEW s.t AS SELECT id FROM s.v;
+    """
+    edges, node_types, _ = parser_postgres.parse_dump(sql)
+
+    assert edges == [("s.a", "s.v"), ("s.v", "s.t")]
+    assert node_types["s.v"]["type"] == "view" and node_types["s.t"]["type"] == "view"
@@ -1,7 +1,13 @@
 import unittest
 import tempfile
 import os
-from src.parser_register import guess_database_type, _guess_by_parsing, DatabaseType
+import subprocess
+import sys
+from importlib import metadata
+from pathlib import Path
+from unittest.mock import patch
+from src import parse_cache, parser_register
+from src.parser_register import guess_database_type, _guess_by_parsing, DatabaseType, ParserRegistry
 
 class TestParserRegister(unittest.TestCase):
     def test_guess_database_type_by_extension(self):
@@ -31,5 +37,63 @@ class TestParserRegister(unittest.TestCase):
         ambiguous_sql = "SELECT * FROM foo"
         self.assertIsNone(_guess_by_parsing(ambiguous_sql))
 
+    def test_guess_by_parsing_uses_sqlglot_before_linting(self):
+        mysql_dump = (
+            "CREATE TABLE `orders` (`id` int NOT NULL AUTO_INCREMENT, PRIMARY KEY (`id`)) ENGINE=InnoDB;\n"
+            "CREATE TABLE `items` (`id` int NOT NULL);\n"
+        )
+        tsql_dump = "CREATE TABLE [sales].[orders] ([id] INT IDENTITY(1,1) NOT NULL);\n"
+        with patch("src.parser_register._linter") as linter:
+            self.assertEqual(_guess_by_parsing(mysql_dump), DatabaseType.MYSQL)
+            self.assertEqual(_guess_by_parsing(tsql_dump), DatabaseType.SQLSERVER)
+            linter.assert_not_called()
+
+    def test_guess_database_type_caches_parse_guess_per_file_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dump.sql")
+            with open(path, "w") as f:
+                f.write("CREATE TABLE [sales].[orders] ([id] INT NOT NULL);\n")
+            with patch.object(parser_register, "GUESS_CACHE_FILE", Path(tmp) / "guesses.json"), \
+                    patch.object(parse_cache, "CACHE_DIR", Path(tmp) / "parse"), \
+                    patch.object(parse_cache, "_digest_memo", {}), \
+                    patch.object(parser_register, "_guess_by_parsing", wraps=_guess_by_parsing) as guess:
+                self.assertEqual(guess_database_type(path), DatabaseType.SQLSERVER)
+                self.assertEqual(guess_database_type(path), DatabaseType.SQLSERVER)
+                self.assertEqual(guess.call_count, 1)
+
+    def test_importing_the_registry_imports_no_parser(self):
+        code = (
+            "import sys, src.generate_data_flow; "
+            "print(sorted(m for m in sys.modules if m.startswith('src.parsers.parser_') or m == 'sqlglot'))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "['src.parsers.parser_utils']")
+
+    def test_registry_imports_builtin_parser_on_lookup(self):
+        registry = ParserRegistry({DatabaseType.ANSI: ".parsers.parser_ansi"})
+        with patch.object(metadata, "entry_points", return_value=[]):
+            self.assertIn("ansi", registry)
+            self.assertEqual(registry["ANSI"].__name__, "src.parsers.parser_ansi")
+            self.assertIs(registry[DatabaseType.ANSI], registry["ansi"])
+
+    def test_registry_adds_plugin_parsers_from_entry_points(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "plugin_teradata.py").write_text("def parse_dump(file_path):\n    return [], {}, {}\n")
+            entry_points = [
+                metadata.EntryPoint("teradata", "plugin_teradata", parser_register.ENTRY_POINT_GROUP),
+                metadata.EntryPoint("mysql", "plugin_teradata", parser_register.ENTRY_POINT_GROUP),
+            ]
+            registry = ParserRegistry({DatabaseType.MYSQL: ".parsers.parser_mysql"})
+            with patch.object(metadata, "entry_points", return_value=entry_points), \
+                    patch.object(sys, "path", [tmp, *sys.path]):
+                self.assertEqual(set(registry), {"teradata", DatabaseType.MYSQL})
+                self.assertEqual(registry["teradata"].parse_dump("x"), ([], {}, {}))
+                # A plugin named after a built-in dialect replaces its parser.
+                self.assertIs(registry[DatabaseType.MYSQL], registry["teradata"])
+                registry.register("mysql", ".parsers.parser_mysql")
+                self.assertEqual(registry[DatabaseType.MYSQL].__name__, "src.parsers.parser_mysql")
+            sys.modules.pop("plugin_teradata", None)
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+import pytest
+
+from src.dataflow_structs import InvalidSQLError
+from src.parsers import parser_snowflake
+
+
+SAMPLE_EXPORT = """create or replace database ANALYTICS;
+
+create or replace schema RAW;
+
+create or replace TABLE CUSTOMERS (
+	ID NUMBER(38,0) NOT NULL,
+	NAME VARCHAR(16777216) COMMENT 'a; CREATE VIEW fake AS SELECT 1'
+);
+create or replace TABLE ORDERS (
+	ID NUMBER(38,0),
+	CUSTOMER_ID NUMBER(38,0),
+	foreign key (CUSTOMER_ID) references ANALYTICS.RAW.CUSTOMERS(ID)
+);
+create or replace stage LANDING url='s3://bucket/path/';
+create or replace stream ORDERS_STREAM on table ORDERS;
+
+create or replace schema MART;
+
+create or replace secure view V_CUSTOMER_ORDERS as
+with recent as (select * from raw.orders where id > 0)
+select c.name, r.id from RAW.CUSTOMERS c join recent r on r.customer_id = c.id;
+create or replace materialized view MV_ORDERS as select id from RAW.ORDERS;
+create or replace dynamic table DT_TOTALS target_lag = '1 hour' warehouse = WH as
+select customer_id, count(*) n from RAW.ORDERS group by 1;
+create or replace TABLE ORDER_FACTS (ID NUMBER);
+create or replace task LOAD_FACTS
+	warehouse=WH
+	schedule='5 MINUTE'
+	when SYSTEM$STREAM_HAS_DATA('RAW.ORDERS_STREAM')
+	as insert into ORDER_FACTS select id from RAW.ORDERS_STREAM;
+create or replace task COPY_RAW
+	warehouse=WH
+	after LOAD_FACTS
+	as copy into RAW.ORDERS from @RAW.LANDING;
+"""
+
+EXPECTED_TYPES = {
+    "MART.COPY_RAW": "task",
+    "MART.DT_TOTALS": "dynamic_table",
+    "MART.LOAD_FACTS": "task",
+    "MART.MV_ORDERS": "materialized_view",
+    "MART.ORDER_FACTS": "table",
+    "MART.V_CUSTOMER_ORDERS": "view",
+    "RAW.CUSTOMERS": "table",
+    "RAW.LANDING": "stage",
+    "RAW.ORDERS": "table",
+    "RAW.ORDERS_STREAM": "stream",
+    "RECENT": "cte_view",
+}
+EXPECTED_EDGES = {
+    ("RAW.ORDERS", "RAW.CUSTOMERS"),
+    ("RAW.ORDERS", "RAW.ORDERS_STREAM"),
+    ("RAW.ORDERS", "RECENT"),
+    ("RECENT", "MART.V_CUSTOMER_ORDERS"),
+    ("RAW.CUSTOMERS", "MART.V_CUSTOMER_ORDERS"),
+    ("RAW.ORDERS", "MART.MV_ORDERS"),
+    ("RAW.ORDERS", "MART.DT_TOTALS"),
+    ("RAW.ORDERS_STREAM", "MART.LOAD_FACTS"),
+    ("MART.LOAD_FACTS", "MART.ORDER_FACTS"),
+    ("MART.LOAD_FACTS", "MART.COPY_RAW"),
+    ("RAW.LANDING", "MART.COPY_RAW"),
+    ("MART.COPY_RAW", "RAW.ORDERS"),
+}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def test_parse_dump_extracts_all_object_kinds():
+    edges, node_types, stats = parser_snowflake.parse_dump(SAMPLE_EXPORT)
+
+    assert {key: info["type"] for key, info in node_types.items()} == EXPECTED_TYPES
+    assert set(edges) == EXPECTED_EDGES
+    assert stats == {"MART": 6, "RAW": 4}
+    assert "fake" not in {key.split(".")[-1].lower() for key in node_types}
+    assert node_types["MART.V_CUSTOMER_ORDERS"]["definition"].startswith("create or replace secure view")
+
+
+def test_parse_dump_in_parallel_matches_serial(tmp_path):
+    export = tmp_path / "export.sql"
+    export.write_text(SAMPLE_EXPORT, encoding="utf-8")
+
+    edges, node_types, stats = parser_snowflake.parse_dump(str(export), jobs=2, batch_size=2)
+
+    assert {key: info["type"] for key, info in node_types.items()} == EXPECTED_TYPES
+    assert set(edges) == EXPECTED_EDGES
+    assert stats == {"MART": 6, "RAW": 4}
+
+
+def test_parse_dump_keeps_definition_when_reference_is_merged_later():
+    # MART.V reads OTHER.T before OTHER.T is created; with batch_size=1 they land in separate batches.
+    _, node_types, _ = parser_snowflake.parse_dump(
+        "use schema MART;\n"
+        "create view V as select * from OTHER.T;\n"
+        "use schema OTHER;\n"
+        "create or replace secure view T as select 1 as x;\n",
+        batch_size=1,
+    )
+
+    assert node_types["OTHER.T"]["type"] == "view"
+    assert node_types["OTHER.T"]["definition"] is not None
+
+
+def test_parse_dump_keys_other_databases_with_database_prefix():
+    edges, node_types, _ = parser_snowflake.parse_dump(
+        "use database SALES;\nuse schema PUBLIC;\ncreate view V as select * from SHARED_DB.REF.COUNTRIES;\n"
+    )
+
+    assert edges == [("SHARED_DB.REF.COUNTRIES", "PUBLIC.V")]
+    assert node_types["SHARED_DB.REF.COUNTRIES"]["database"] == "SHARED_DB.REF"
+
+
+def test_parse_dump_without_ddl_raises():
+    with pytest.raises(InvalidSQLError):
+        parser_snowflake.parse_dump("use schema RAW;\nselect 1;\n")
@@ -0,0 +1,86 @@
+import sqlite3
+
+import pytest
+
+from src.dataflow_structs import InvalidSQLError
+from src.parser_register import DatabaseType, guess_database_type
+from src.parsers import parser_sqlite
+
+
+SCHEMA = """
+CREATE TABLE customers (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT);
+CREATE TABLE "Orders" (
+  id INTEGER PRIMARY KEY,
+  customer_id INTEGER REFERENCES customers(id),
+  note TEXT DEFAULT 'REFERENCES nothing; FROM fake'
+);
+CREATE TABLE audit (id INTEGER, msg TEXT);
+CREATE INDEX idx_orders_customer ON "Orders"(customer_id);
+CREATE VIEW v_orders AS
+  WITH recent AS (SELECT id, customer_id FROM orders)
+  SELECT r.id, c.name FROM recent r JOIN main.Customers c ON c.id = r.customer_id;
+CREATE TRIGGER trg_orders_ai AFTER INSERT ON orders
+BEGIN
+  INSERT INTO audit (msg) SELECT name FROM customers WHERE id = NEW.customer_id;
+  UPDATE OR IGNORE audit SET msg = 'done; FROM fake';
+END;
+"""
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def database_file(tmp_path):
+    path = tmp_path / "shop.sqlite"
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.execute("INSERT INTO customers (name) VALUES ('x')")
+    connection.commit()
+    connection.close()
+    return path
+
+
+def test_parse_dump_reads_schema_from_database_file(database_file):
+    edges, node_types, stats = parser_sqlite.parse_dump(database_file)
+
+    assert {key: info["type"] for key, info in node_types.items()} == {
+        "Orders": "table",
+        "audit": "table",
+        "customers": "table",
+        "recent": "cte_view",
+        "trg_orders_ai": "trigger",
+        "v_orders": "view",
+    }
+    assert set(edges) == {
+        ("Orders", "customers"),
+        ("Orders", "recent"),
+        ("recent", "v_orders"),
+        ("customers", "v_orders"),
+        ("Orders", "trg_orders_ai"),
+        ("customers", "trg_orders_ai"),
+        ("trg_orders_ai", "audit"),
+    }
+    assert node_types["v_orders"]["definition"].startswith("CREATE VIEW v_orders")
+    assert node_types["Orders"]["database"] == "main"
+    assert stats == {"main": 5}
+
+
+def test_parse_dump_replays_text_dump_like_a_database_file(database_file):
+    dump = "\n".join(sqlite3.connect(database_file).iterdump())
+
+    assert parser_sqlite.parse_dump(dump)[:2] == parser_sqlite.parse_dump(database_file)[:2]
+
+
+def test_database_file_is_detected_by_header(database_file):
+    renamed = database_file.rename(database_file.with_suffix(".db"))
+
+    assert guess_database_type(renamed) is DatabaseType.SQLITE
+
+
+def test_parse_dump_raises_without_schema(tmp_path):
+    with pytest.raises(InvalidSQLError):
+        parser_sqlite.parse_dump("SELECT 1;")
@@ -0,0 +1,143 @@
+import pytest
+
+from src.dataflow_structs import InvalidSQLError
+from src.parsers import parser_sqlserver
+
+
+SAMPLE_SCRIPT = """USE [Shop]
+GO
+/****** Object:  Table [dbo].[Customers]    Script Date: 1/1/2026 ******/
+SET ANSI_NULLS ON
+GO
+CREATE TABLE [dbo].[Customers](
+	[Id] [int] NOT NULL,
+	[Name] [nvarchar](100) NULL CONSTRAINT [DF_x] DEFAULT (N'it''s
+GO
+not a batch end'),
+ CONSTRAINT [PK_Customers] PRIMARY KEY CLUSTERED ([Id] ASC)
+) ON [PRIMARY]
+SET ANSI_PADDING OFF
+GO
+CREATE TABLE [dbo].[Orders](
+	[Id] [int] NOT NULL,
+	[CustomerId] [int] NULL
+) ON [PRIMARY]
+GO
+CREATE TABLE [Sales].[Facts]([Id] [int] NULL, [Note] [varchar](10) NULL)
+GO
+ALTER TABLE [dbo].[Orders]  WITH CHECK ADD  CONSTRAINT [FK_Orders_Customers] FOREIGN KEY([CustomerId])
+REFERENCES [dbo].[customers] ([Id])
+GO
+ALTER TABLE [dbo].[Orders] CHECK CONSTRAINT [FK_Orders_Customers]
+GO
+/* a block comment
+GO
+still a comment */
+CREATE VIEW [Sales].[vOrders] AS
+WITH recent AS (SELECT * FROM dbo.Orders WHERE Id > 0)
+SELECT c.Name FROM recent r JOIN [dbo].[Customers] c ON c.Id = r.CustomerId
+JOIN [Archive].[dbo].[OldOrders] o ON o.Id = r.Id
+GO
+CREATE PROCEDURE [Sales].[LoadFacts] @d int AS
+BEGIN
+SET NOCOUNT ON;
+INSERT INTO Sales.Facts (Id) SELECT Id FROM dbo.Orders WHERE Id > @d;
+MERGE dbo.Dim AS t USING (SELECT Id FROM dbo.Stage) AS s ON t.Id = s.Id WHEN MATCHED THEN UPDATE SET t.Id = s.Id;
+SELECT Id INTO #tmp FROM dbo.Orders;
+END
+GO
+CREATE PROCEDURE [Sales].[Cleanup] AS
+BEGIN
+BEGIN TRY
+  UPDATE f SET f.Note = 'x' FROM Sales.Facts f JOIN dbo.Customers c ON c.Id = f.Id;
+  DELETE FROM dbo.Stage;
+  INSERT INTO @log SELECT 1;
+END TRY
+BEGIN CATCH
+  THROW;
+END CATCH
+END
+GO
+CREATE TRIGGER [dbo].[trg_Orders] ON [dbo].[Orders] AFTER INSERT AS
+BEGIN
+  INSERT INTO dbo.Audit (Id) SELECT Id FROM inserted;
+END
+GO
+CREATE SYNONYM [dbo].[Cust] FOR [Shop].[dbo].[Customers]
+GO
+"""
+
+EXPECTED_TYPES = {
+    "Archive.dbo.OldOrders": "table",
+    "Sales.Cleanup": "procedure",
+    "Sales.Facts": "table",
+    "Sales.LoadFacts": "procedure",
+    "Sales.vOrders": "view",
+    "dbo.Audit": "table",
+    "dbo.Cust": "synonym",
+    "dbo.Customers": "table",
+    "dbo.Dim": "table",
+    "dbo.Orders": "table",
+    "dbo.Stage": "table",
+    "dbo.trg_Orders": "trigger",
+    "recent": "cte_view",
+}
+EXPECTED_EDGES = {
+    ("dbo.Orders", "dbo.Customers"),
+    ("dbo.Orders", "recent"),
+    ("recent", "Sales.vOrders"),
+    ("dbo.Customers", "Sales.vOrders"),
+    ("Archive.dbo.OldOrders", "Sales.vOrders"),
+    ("dbo.Orders", "Sales.LoadFacts"),
+    ("dbo.Stage", "Sales.LoadFacts"),
+    ("Sales.LoadFacts", "Sales.Facts"),
+    ("Sales.LoadFacts", "dbo.Dim"),
+    ("dbo.Customers", "Sales.Cleanup"),
+    ("Sales.Cleanup", "Sales.Facts"),
+    ("Sales.Cleanup", "dbo.Stage"),
+    ("dbo.Orders", "dbo.trg_Orders"),
+    ("dbo.trg_Orders", "dbo.Audit"),
+    ("dbo.Customers", "dbo.Cust"),
+}
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The parser writes its JSON structure relative to the working directory.
+    monkeypatch.chdir(tmp_path)
+
+
+def test_parse_dump_extracts_views_modules_synonyms_and_foreign_keys():
+    edges, node_types, stats = parser_sqlserver.parse_dump(SAMPLE_SCRIPT)
+
+    assert {key: info["type"] for key, info in node_types.items()} == EXPECTED_TYPES
+    assert set(edges) == EXPECTED_EDGES
+    assert stats == {"Archive.dbo": 1, "Sales": 4, "dbo": 7}
+    assert "not a batch end" in node_types["dbo.Customers"]["definition"]
+    assert "ANSI_PADDING" not in node_types["dbo.Customers"]["definition"]
+    assert node_types["dbo.Orders"]["definition"].count("-- Additional DDL --") == 2
+
+
+def test_parse_dump_in_parallel_matches_serial(tmp_path):
+    script = tmp_path / "script.sql"
+    # SSMS saves scripts as UTF-16 with a byte order mark by default.
+    script.write_text(SAMPLE_SCRIPT, encoding="utf-16")
+
+    edges, node_types, stats = parser_sqlserver.parse_dump(str(script), jobs=2, batch_size=1)
+
+    assert {key: info["type"] for key, info in node_types.items()} == EXPECTED_TYPES
+    assert set(edges) == EXPECTED_EDGES
+    assert stats == {"Archive.dbo": 1, "Sales": 4, "dbo": 7}
+
+
+def test_iter_batches_ignores_go_inside_strings_and_comments():
+    batches = list(parser_sqlserver.iter_batches([
+        "-- header\n", "SELECT 'a\n", "GO\n", "'\n", "go 2 -- twice\n", "/*\n", "GO\n", "*/ SELECT 1\n",
+    ]))
+
+    assert batches == ["SELECT 'a\nGO\n'", "SELECT 1"]  # Leading comments are not part of a batch
+
+
+def test_parse_dump_without_ddl_raises():
+    with pytest.raises(InvalidSQLError):
+        parser_sqlserver.parse_dump("SET NOCOUNT ON\nGO\nSELECT 1\nGO\n")
@@ -0,0 +1,105 @@
+import random
+
+from src.parsers.parser_utils import MappedInput, StatementSplitter, open_input, split_statements
+
+
+TRICKY_SQL = """CREATE TABLE a (x text DEFAULT 'a;b''c'); -- note; it's fine
+/* block; 'quote */ CREATE VIEW v AS SELECT $tag$ x; $ $tag$ FROM a;
+SELECT "we;ird" FROM b;
+SELECT 1 - 2 / 3; SELECT $1 FROM t; # hash; comment
+SELECT 4"""
+
+
+def test_statement_splitter_handles_dollar_quotes_across_chunks():
+    splitter = StatementSplitter()
+    assert splitter.feed("SELECT $body$ a; ") == []
+    assert splitter.feed("b; $body$; SELECT 2") == ["SELECT $body$ a; b; $body$"]
+    assert splitter.flush() == "SELECT 2"
+
+
+def test_split_statements_ignores_semicolons_in_quotes_and_comments():
+    assert list(split_statements(TRICKY_SQL)) == [
+        "CREATE TABLE a (x text DEFAULT 'a;b''c')",
+        "-- note; it's fine\n/* block; 'quote */ CREATE VIEW v AS SELECT $tag$ x; $ $tag$ FROM a",
+        'SELECT "we;ird" FROM b',
+        "SELECT 1 - 2 / 3",
+        "SELECT $1 FROM t",
+        "# hash",
+        "comment\nSELECT 4",
+    ]
+
+
+def test_split_statements_hash_comments_without_dollar_quotes():
+    statements = list(split_statements("SELECT $a$; # x; y\nSELECT 2", dollar_quotes=False, hash_comments=True))
+    assert statements == ["SELECT $a$", "# x; y\nSELECT 2"]
+
+
+def test_split_statements_is_independent_of_chunk_boundaries():
+    expected = list(split_statements(TRICKY_SQL))
+    rng = random.Random(0)
+    for _ in range(500):
+        cuts = sorted(rng.sample(range(1, len(TRICKY_SQL)), rng.randint(1, 30)))
+        chunks = [TRICKY_SQL[i:j] for i, j in zip([0] + cuts, cuts + [len(TRICKY_SQL)])]
+        assert list(split_statements(chunks)) == expected
+
+
+MYSQL_SQL = r"""INSERT INTO `a;b` VALUES ('it\'s; fine\\'),('x');
+CREATE TRIGGER t AFTER INSERT ON a FOR EACH ROW BEGIN INSERT INTO b VALUES (1); END $$
+SELECT 2 $$"""
+
+
+def test_statement_splitter_mysql_escapes_backticks_and_delimiter():
+    splitter = StatementSplitter(dollar_quotes=False, hash_comments=True, backtick_quotes=True, backslash_escapes=True)
+    lines = MYSQL_SQL.splitlines(keepends=True)
+    assert splitter.feed(lines[0]) == ["INSERT INTO `a;b` VALUES ('it\\'s; fine\\\\'),('x')"]
+    assert splitter.at_statement_start
+    splitter.delimiter = "$$"
+    assert splitter.feed(lines[1]) == [
+        "CREATE TRIGGER t AFTER INSERT ON a FOR EACH ROW BEGIN INSERT INTO b VALUES (1); END"
+    ]
+    assert splitter.feed(lines[2][:-1]) == []
+    assert not splitter.at_statement_start
+    assert splitter.feed("$") == ["SELECT 2"]
+
+
+def test_split_statements_mysql_options_are_independent_of_chunk_boundaries():
+    sql = MYSQL_SQL.replace(" $$", ";")
+    options = dict(dollar_quotes=False, hash_comments=True, backtick_quotes=True, backslash_escapes=True)
+    expected = list(split_statements(sql, **options))
+    assert len(expected) == 4
+    rng = random.Random(1)
+    for _ in range(500):
+        cuts = sorted(rng.sample(range(1, len(sql)), rng.randint(1, 30)))
+        chunks = [sql[i:j] for i, j in zip([0] + cuts, cuts + [len(sql)])]
+        assert list(split_statements(chunks, **options)) == expected
+
+
+def test_statement_splitter_without_delimiter_tracks_brackets_and_comments():
+    splitter = StatementSplitter(dollar_quotes=False, bracket_quotes=True, delimiter=None)
+    assert splitter.feed("SELECT [a;'b] FROM t;\n") == []
+    assert not splitter.in_quote_or_comment
+    splitter.feed("/* open\n")
+    assert splitter.in_quote_or_comment
+    splitter.feed("close */ SELECT 'x\n")
+    assert splitter.in_quote_or_comment
+    splitter.feed("y'\n")
+    assert not splitter.in_quote_or_comment
+    assert splitter.flush() == "SELECT [a;'b] FROM t;\n/* open\nclose */ SELECT 'x\ny'"
+
+
+def test_mapped_input_reads_lines_and_checks_bytes_in_place(tmp_path):
+    path = tmp_path / "dump.sql"
+    path.write_bytes("CREATE TABLE ä (x int);\r\nINSERT INTO ä VALUES (1);  \nSELECT 1".encode("utf-8"))
+
+    with open_input(path) as source:
+        spans = list(source.line_spans())
+        assert list(source) == ["CREATE TABLE ä (x int);\r\n", "INSERT INTO ä VALUES (1);  \n", "SELECT 1"]
+        assert source.path == str(path)
+        assert source.startswith((b"REPLACE ", b"INSERT "), spans[1][0])
+        assert source.line_endswith(b";", *spans[1]) and source.line_endswith(b";", *spans[0])
+        assert not source.line_endswith(b";", *spans[2])
+    assert list(open_input("SELECT 1;\nSELECT 2")) == ["SELECT 1;\n", "SELECT 2"]
+    empty = tmp_path / "empty.sql"
+    empty.write_bytes(b"")
+    with MappedInput.open(empty) as source:
+        assert len(source) == 0 and list(source) == []
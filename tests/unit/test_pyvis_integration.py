@@ -6,6 +6,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from src import pyvis_mod
+from src.lineage_graph import LineageGraph
 
 
 class TestPyvisIntegration(unittest.TestCase):
@@ -80,6 +81,21 @@ class TestPyvisIntegration(unittest.TestCase):
         # Check that browser open was NOT called
         mock_open.assert_not_called()
 
+    def test_precomputed_layout_bakes_positions_and_disables_physics(self):
+        """Test that a precomputed layout places nodes left to right without browser physics"""
+        graph = LineageGraph(self.edges)
+        fig, options = pyvis_mod.create_pyvis_figure(graph, self.node_types, precomputed_layout=True)
+
+        positions = {node["id"]: (node["x"], node["y"]) for node in fig.nodes}
+        self.assertLess(positions["table1"][0], positions["view1"][0])
+        self.assertNotEqual(positions["table1"][1], positions["table2"][1])
+        self.assertFalse(options["physics"]["enabled"])
+        self.assertFalse(options["layout"]["hierarchical"]["enabled"])
+
+        _, default_options = pyvis_mod.create_pyvis_figure(graph, self.node_types)
+        self.assertTrue(default_options["physics"]["enabled"])
+        self.assertNotIn("x", pyvis_mod.create_pyvis_figure(graph, self.node_types)[0].nodes[0])
+
     def test_focused_view_vs_complete_view(self):
         """Test differences between focused and complete view generation"""
         # Generate complete view
@@ -0,0 +1,48 @@
+import networkx as nx
+import pytest
+
+from src import parse_cache, reachability
+from src.lineage_graph import LineageGraph
+from src.reachability import ReachabilityIndex
+
+
+# A cycle (b, c), a self-loop (e) and a node without edges.
+EDGES = [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d"), ("x", "d"), ("d", "e"), ("e", "e")]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(parse_cache, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+def test_index_matches_graph_walks():
+    graph = LineageGraph(EDGES, ["lonely"])
+    index = ReachabilityIndex.build(graph)
+    reference = nx.DiGraph(EDGES)
+    reference.add_node("lonely")
+
+    for node in reference:
+        assert index.ancestors(node) == nx.ancestors(reference, node)
+        assert index.descendants(node) == nx.descendants(reference, node)
+    for sources in (["a", "x"], ["c", "e"], ["lonely", "missing"]):
+        assert index.ancestors_of(sources) == graph.ancestors_of(sources)
+        assert index.descendants_of(sources) == graph.descendants_of(sources)
+
+
+def test_index_is_persisted_and_used_by_the_graph(cache_dir, monkeypatch):
+    graph = LineageGraph(EDGES)
+    graph.reachability = reachability.load_or_build(graph)
+
+    assert len(list(cache_dir.glob("*.reach.npz"))) == 1
+    monkeypatch.setattr(ReachabilityIndex, "build", None)  # A second load must not rebuild
+    reloaded = reachability.load_or_build(LineageGraph(EDGES))
+    assert reloaded.descendants("a") == {"b", "c", "d", "e"}
+
+    monkeypatch.setattr(graph, "_reachable", None)  # Unlimited queries no longer walk the graph
+    assert graph.ancestors_of(["d"]) == {"a", "b", "c", "x"}
+    assert graph.descendants("c") == {"b", "d", "e"}
+
+
+def test_index_is_skipped_beyond_the_budget():
+    assert ReachabilityIndex.build(LineageGraph(EDGES), max_bytes=1) is None